@@ -0,0 +1,46 @@
+from django.db.models import F
+from reviews.models import ArchivedComment, ArchivedReview, Comment, Review
+
+from .pagination import MergedCursorPagination
+from .serializers import ActivitySerializer
+
+
+def activity_sources(user):
+    """
+    Отзывы и комментарии пользователя для MergedCursorPagination,
+    вместе с перенесёнными в архив: id архива совпадают с прежними.
+    """
+    return (
+        ('comment', Comment.objects.filter(
+            author=user, is_hidden=False, review__is_hidden=False,
+            review__deleted_at__isnull=True,
+        ).values(
+            'id', 'pub_date', 'text', 'review_id',
+            title_id=F('review__title_id'),
+        )),
+        ('comment', ArchivedComment.objects.filter(
+            author=user, is_hidden=False, review__is_hidden=False
+        ).values(
+            'id', 'pub_date', 'text', 'review_id',
+            title_id=F('review__title_id'),
+        )),
+        ('review', Review.objects.filter(
+            author=user, is_hidden=False
+        ).values(
+            'id', 'pub_date', 'text', 'score', 'title_id',
+        )),
+        ('review', ArchivedReview.objects.filter(
+            author=user, is_hidden=False
+        ).values(
+            'id', 'pub_date', 'text', 'score', 'title_id',
+        )),
+    )
+
+
+def activity_response(request, user):
+    """Страница ленты активности пользователя, новые записи сверху."""
+    paginator = MergedCursorPagination()
+    page = paginator.paginate(activity_sources(user), request)
+    return paginator.get_paginated_response(
+        ActivitySerializer(page, many=True).data
+    )
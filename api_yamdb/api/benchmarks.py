@@ -0,0 +1,14 @@
+import timeit
+
+
+def measure(func, number=1, repeat=5):
+    """Возвращает лучшее время одного вызова func в секундах."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def report(stdout, name, before, after):
+    """Печатает время двух вариантов и ускорение между ними."""
+    stdout.write(
+        f'{name}: {before * 1000:.2f} мс -> {after * 1000:.2f} мс '
+        f'(x{before / after:.1f})'
+    )
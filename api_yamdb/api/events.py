@@ -0,0 +1,180 @@
+import asyncio
+import select
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+import psycopg2
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+from .renderers import FastJSONRenderer
+
+
+def format_event(event, data):
+    """Событие в формате text/event-stream; данные — одна строка JSON."""
+    return b'event: %s\ndata: %s\n\n' % (
+        event.encode(), FastJSONRenderer().render(data)
+    )
+
+
+class Subscription:
+    """Очередь событий одного клиента в его цикле событий."""
+
+    def __init__(self, broker, channel, loop, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+
+    def put(self, message):
+        """Вызывается в цикле событий подписчика."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Клиент не успевает читать: закрываем поток, пусть
+            # переподключится и перечитает список.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self):
+        """Следующее сообщение; None — поток нужно закрыть."""
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class BaseBroker:
+    """
+    Pub/sub между кодом, который пишет в базу, и открытыми потоками
+    событий. publish вызывается из любого потока, subscribe — из цикла
+    событий ASGI.
+    """
+
+    def publish(self, channel, message):
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class LocalBroker(BaseBroker):
+    """
+    Брокер в памяти процесса: события видят только клиенты, подключённые
+    к тому же процессу. Для нескольких воркеров нужен общий бэкенд.
+    """
+
+    def __init__(self, queue_size=None):
+        self.queue_size = queue_size or settings.EVENTS_QUEUE_SIZE
+        self.subscriptions = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def publish(self, channel, message):
+        self.deliver(channel, message)
+
+    def deliver(self, channel, message):
+        """Раздаёт сообщение подписчикам этого процесса."""
+        with self.lock:
+            subscriptions = tuple(self.subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(
+                subscription.put, message
+            )
+
+    def subscribe(self, channel):
+        subscription = Subscription(
+            self, channel, asyncio.get_event_loop(), self.queue_size
+        )
+        with self.lock:
+            self.subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.channel)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscriptions[subscription.channel]
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Брокер для нескольких воркеров через LISTEN/NOTIFY PostgreSQL.
+
+    publish отправляет NOTIFY через соединение Django. Процесс, у которого
+    есть подписчики, держит отдельное соединение с LISTEN в фоновом
+    потоке и раздаёт пришедшие события своим подписчикам. Пока это
+    соединение переподключается, события теряются: клиенты потока
+    и так не получают пропущенное.
+    """
+    pg_channel = 'yamdb_events'
+    poll_timeout = 5
+    reconnect_delay = 1
+
+    def __init__(self, queue_size=None):
+        super().__init__(queue_size)
+        self.listener = None
+
+    def publish(self, channel, message):
+        # Сообщение — одна строка JSON, пробела в имени канала нет.
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [
+                self.pg_channel, f'{channel} {message.decode()}'
+            ])
+
+    def subscribe(self, channel):
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(
+                    target=self.listen, name='events-listener', daemon=True
+                )
+                self.listener.start()
+        return super().subscribe(channel)
+
+    def connect(self):
+        listener = psycopg2.connect(**connection.get_connection_params())
+        listener.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with listener.cursor() as cursor:
+            cursor.execute(f'LISTEN {self.pg_channel}')
+        return listener
+
+    def listen(self):
+        while True:
+            try:
+                listener = self.connect()
+                try:
+                    self.receive(listener)
+                finally:
+                    listener.close()
+            except psycopg2.Error:
+                time.sleep(self.reconnect_delay)
+
+    def receive(self, listener):
+        while True:
+            if not select.select([listener], [], [], self.poll_timeout)[0]:
+                continue
+            listener.poll()
+            while listener.notifies:
+                notify = listener.notifies.pop(0)
+                channel, _, message = notify.payload.partition(' ')
+                self.deliver(channel, message.encode())
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    """Брокер из настройки EVENTS_BROKER, один на процесс."""
+    return import_string(settings.EVENTS_BROKER)()
+
+
+def title_channel(title_id):
+    return f'title:{title_id}'
@@ -0,0 +1,88 @@
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from reviews.models import Title
+
+from .filters import TitlesFilter
+
+FACETS_VERSION_KEY = 'title_facets:version'
+
+
+def facets_version():
+    """Версия фасетов; меняется при любом изменении каталога."""
+    version = cache.get(FACETS_VERSION_KEY)
+    if version is None:
+        cache.add(FACETS_VERSION_KEY, uuid4().hex, None)
+        return cache.get(FACETS_VERSION_KEY)
+    return version
+
+
+def invalidate_facets():
+    cache.set(FACETS_VERSION_KEY, uuid4().hex, None)
+
+
+def facets_cache_key(params):
+    selection = '&'.join(
+        f'{name}={params[name]}' for name in sorted(params) if params[name]
+    )
+    digest = hashlib.md5(selection.encode()).hexdigest()
+    return f'title_facets:{facets_version()}:{digest}'
+
+
+def title_facets(titles):
+    """
+    Число произведений по категориям, жанрам и годам: два запроса
+    с группировкой. Жанровый фильтр может размножить строки, поэтому
+    считаются различные произведения.
+    """
+    categories, years = {}, {}
+    for row in titles.values(
+        'category__slug', 'category__name', 'year'
+    ).annotate(count=Count('pk', distinct=True)).order_by():
+        slug = row['category__slug']
+        if slug not in categories:
+            categories[slug] = {
+                'name': row['category__name'], 'slug': slug, 'count': 0
+            }
+        categories[slug]['count'] += row['count']
+        years[row['year']] = years.get(row['year'], 0) + row['count']
+    genres = Title.genre.through.objects.filter(
+        title__in=titles.values('pk')
+    ).values('genre__name', 'genre__slug').annotate(
+        count=Count('title_id', distinct=True)
+    ).order_by('genre__name')
+    return {
+        'count': sum(years.values()),
+        'category': sorted(
+            categories.values(), key=lambda item: item['name']
+        ),
+        'genre': [
+            {'name': row['genre__name'], 'slug': row['genre__slug'],
+             'count': row['count']}
+            for row in genres
+        ],
+        'year': [
+            {'year': year, 'count': count}
+            for year, count in sorted(years.items())
+        ],
+    }
+
+
+def facets_response(request):
+    """Фасеты каталога для выборки TitlesFilter из параметров запроса."""
+    filterset = TitlesFilter(
+        request.query_params, queryset=Title.objects.all()
+    )
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+    key = facets_cache_key(filterset.form.cleaned_data)
+    facets = cache.get(key)
+    if facets is None:
+        facets = title_facets(filterset.qs)
+        cache.set(key, facets, settings.FACETS_CACHE_TIMEOUT)
+    return Response(facets)
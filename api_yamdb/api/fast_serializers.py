@@ -0,0 +1,158 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField, SlugRelatedField
+
+# Поля, у которых to_representation для значения из БД ничего не меняет.
+IDENTITY_FIELDS = (serializers.CharField,)
+
+
+def _identity(value):
+    return value
+
+
+def _converter(field):
+    if isinstance(field, IDENTITY_FIELDS):
+        return _identity
+    return field.to_representation
+
+
+def _column(field):
+    return '__'.join(field.source_attrs)
+
+
+class FastListSerializer:
+    """
+    Сериализация списков только для чтения по строкам из .values().
+
+    План полей (какие колонки выбрать и как их преобразовать) строится
+    один раз по обычному сериализатору, поэтому порядок ключей и формат
+    значений совпадают с ним байт в байт. Поддерживаются простые поля,
+    SlugRelatedField/PrimaryKeyRelatedField, вложенный сериализатор
+    по внешнему ключу и вложенный many=True по ManyToMany.
+
+    fields ограничивает план перечисленными полями: колонки и связи
+    остальных полей не выбираются из БД.
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        self.model = serializer_class.Meta.model
+        self.pk = self.model._meta.pk.attname
+        self.columns = [self.pk]
+        self.plan = []
+        self.many = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only or fields is not None and name not in fields:
+                continue
+            self.plan.append(self._plan_field(name, field))
+        self.field_names = frozenset(name for name, _, _ in self.plan)
+
+    def _add_column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+        return column
+
+    def _plan_field(self, name, field):
+        if isinstance(field, serializers.ListSerializer):
+            self.many.append(self._plan_many(name, field))
+            return name, None, None
+        if isinstance(field, serializers.Serializer):
+            column = self._add_column(_column(field))
+            nested = [
+                (key, self._add_column(f'{column}__{col}'), convert)
+                for key, col, convert in self._plan_nested(field)
+            ]
+            return name, column, nested
+        if isinstance(field, SlugRelatedField):
+            column = f'{_column(field)}__{field.slug_field}'
+            return name, self._add_column(column), _identity
+        if isinstance(field, PrimaryKeyRelatedField):
+            return name, self._add_column(_column(field)), _identity
+        return name, self._add_column(_column(field)), _converter(field)
+
+    def _plan_nested(self, serializer):
+        plan = []
+        for key, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.BaseSerializer):
+                raise ImproperlyConfigured(
+                    f'{self.serializer_class.__name__}: вложенность глубже '
+                    f'одного уровня не поддерживается ({key}).'
+                )
+            plan.append((key, _column(field), _converter(field)))
+        return plan
+
+    def _plan_many(self, name, field):
+        relation = self.model._meta.get_field(_column(field))
+        if not relation.many_to_many or relation.auto_created:
+            raise ImproperlyConfigured(
+                f'{self.serializer_class.__name__}.{name}: many=True '
+                'поддерживается только для прямых ManyToMany.'
+            )
+        return (
+            name,
+            relation.related_model,
+            relation.related_query_name(),
+            self._plan_nested(field.child),
+        )
+
+    def values(self, queryset):
+        """Возвращает queryset строк с колонками плана."""
+        return queryset.values(*self.columns)
+
+    def _fetch_many(self, pks):
+        return {
+            name: self._group_many(
+                model.objects.filter(**{f'{query_name}__in': pks}).values(
+                    query_name, *(column for _, column, _ in plan)
+                ),
+                query_name,
+                plan,
+            )
+            for name, model, query_name, plan in self.many
+        }
+
+    @staticmethod
+    def _group_many(rows, query_name, plan):
+        items = {}
+        for row in rows:
+            items.setdefault(row[query_name], []).append({
+                key: None if row[column] is None else convert(row[column])
+                for key, column, convert in plan
+            })
+        return items
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        related = {}
+        if self.many and rows:
+            related = self._fetch_many([row[self.pk] for row in rows])
+        return [self._row(row, related) for row in rows]
+
+    def _row(self, row, related):
+        data = {}
+        for name, column, convert in self.plan:
+            if column is None:
+                data[name] = related[name].get(row[self.pk], [])
+            elif row[column] is None:
+                data[name] = None
+            elif isinstance(convert, list):
+                data[name] = {
+                    key: None if row[col] is None else conv(row[col])
+                    for key, col, conv in convert
+                }
+            else:
+                data[name] = convert(row[column])
+        return data
+
+
+_fast_serializers = {}
+
+
+def get_fast_serializer(serializer_class, fields=None):
+    """Возвращает закешированный FastListSerializer для класса и полей."""
+    key = serializer_class, fields
+    if key not in _fast_serializers:
+        _fast_serializers[key] = FastListSerializer(serializer_class, fields)
+    return _fast_serializers[key]
@@ -0,0 +1,99 @@
+"""
+Нагрузка на HTTP API из потоков стандартной библиотеки: каждый поток
+держит своё keep-alive соединение и по кругу запрашивает пути.
+"""
+import http.client
+import threading
+import time
+
+
+def percentile(values, share):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * share), len(values) - 1)]
+
+
+def client(host, port, paths, deadline, headers, latencies, errors):
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    index = 0
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(path)
+            connection.close()
+            continue
+        latencies.append(time.perf_counter() - start)
+        if response.status >= 400:
+            errors.append(path)
+        if response.will_close:
+            connection.close()
+    connection.close()
+
+
+def load(host, port, paths, concurrency, duration, headers=None):
+    """
+    concurrency потоков duration секунд запрашивают paths.
+    Возвращает число запросов и ошибок, запросов в секунду
+    и перцентили задержки в секундах.
+    """
+    # list.append атомарен, общие списки безопасны без блокировок
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client, args=(
+            host, port, paths, deadline, headers or {}, latencies, errors
+        ))
+        for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': len(latencies) / elapsed,
+        'p50': percentile(latencies, 0.5),
+        'p90': percentile(latencies, 0.9),
+        'p99': percentile(latencies, 0.99),
+    }
+
+
+def wait_ready(host, port, path, timeout):
+    """Ждёт, пока сервер начнёт отвечать; False, если не дождались."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        connection = http.client.HTTPConnection(host, port, timeout=1)
+        try:
+            connection.request('GET', path)
+            connection.getresponse().read()
+            return True
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+        finally:
+            connection.close()
+    return False
+
+
+def dominated(result, other):
+    return (
+        other['rps'] >= result['rps'] and other['p99'] <= result['p99']
+        and (other['rps'] > result['rps'] or other['p99'] < result['p99'])
+    )
+
+
+def frontier(results):
+    """Результаты, которые никто не превосходит сразу по rps и p99."""
+    return [
+        result for result in results
+        if not any(dominated(result, other) for other in results)
+    ]
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from ...startup import run
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность профилей настроек dev и prod '
+        '(через api_yamdb.settings.bench): запросов в секунду на GET '
+        'каждого пути в одном процессе, без сети.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--paths', nargs='+',
+            default=[
+                '/api/v1/titles/', '/api/v1/categories/', '/api/v1/genres/'
+            ],
+        )
+        parser.add_argument('--number', type=int, default=500)
+        parser.add_argument(
+            '--profiles', nargs=2, default=['dev', 'prod'],
+        )
+
+    def handle(self, *args, paths, number, profiles, **options):
+        before, after = (
+            run(
+                'api_yamdb.settings.bench',
+                f'throughput({paths!r}, {number})',
+                BENCH_PROFILE=profile,
+            )[0]['paths']
+            for profile in profiles
+        )
+        self.stdout.write(f'{profiles[0]} -> {profiles[1]}, запросов/с')
+        for path in paths:
+            old, new = before[path], after[path]
+            self.stdout.write(
+                f'{path}: {old["rps"]:.0f} -> {new["rps"]:.0f} '
+                f'(x{new["rps"] / old["rps"]:.2f}), '
+                f'коды {old["status"]}/{new["status"]}'
+            )
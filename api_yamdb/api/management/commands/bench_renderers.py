@@ -0,0 +1,93 @@
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from ...benchmarks import measure, report
+from ...renderers import FastJSONRenderer, orjson
+
+WORDS = (
+    'рукописи', 'не', 'горят', 'мастер', 'маргарита', 'война', 'мир',
+    'преступление', 'наказание', 'идиот', 'отцы', 'дети', '«кино»', '—',
+)
+
+
+def _text(rnd, words):
+    return ' '.join(rnd.choice(WORDS) for _ in range(words))
+
+
+def titles_page(rnd, size):
+    return {
+        'count': size * 50,
+        'next': 'http://localhost/api/v1/titles/?page=2',
+        'previous': None,
+        'results': [{
+            'id': i,
+            'name': _text(rnd, 3),
+            'year': rnd.randint(1900, 2022),
+            'genre': [
+                {'name': _text(rnd, 1), 'slug': f'genre-{g}'}
+                for g in range(rnd.randint(0, 3))
+            ],
+            'category': {'name': _text(rnd, 1), 'slug': 'movie'},
+            'description': _text(rnd, 40),
+            'rating': rnd.choice((None, rnd.randint(1, 10))),
+        } for i in range(size)],
+    }
+
+
+def reviews_page(rnd, size):
+    now = timezone.now()
+    return {
+        'count': size * 50,
+        'next': None,
+        'previous': None,
+        'results': [{
+            'id': i,
+            'title': _text(rnd, 3),
+            'author': f'user{rnd.randint(1, 1000)}',
+            'text': _text(rnd, 25),
+            'score': rnd.randint(1, 10),
+            'weight': Decimal('0.75'),
+            'pub_date': now - timedelta(minutes=i),
+            'edited': datetime(2022, 12, 2, 8, 12),
+        } for i in range(size)],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает стандартный JSONRenderer с FastJSONRenderer '
+        'на типичных страницах произведений и отзывов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--number', type=int, default=100)
+
+    def handle(self, *args, size, repeat, number, **options):
+        if orjson is None:
+            self.stderr.write('orjson не установлен, сравнивать не с чем.')
+        rnd = random.Random(0)
+        standard, fast = JSONRenderer(), FastJSONRenderer()
+        for name, data in (
+            ('titles', titles_page(rnd, size)),
+            ('reviews', reviews_page(rnd, size)),
+        ):
+            if standard.render(data) != fast.render(data):
+                raise CommandError(f'{name}: JSON не совпадает.')
+            before = measure(
+                lambda: standard.render(data), number=number, repeat=repeat
+            )
+            after = measure(
+                lambda: fast.render(data), number=number, repeat=repeat
+            )
+            report(self.stdout, name, before, after)
+            self.stdout.write(
+                f'{name}: {1 / before:.0f} -> '
+                f'{1 / after:.0f} страниц/с'
+            )
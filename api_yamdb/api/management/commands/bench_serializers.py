@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Comment, Review, Title
+
+from ...benchmarks import measure, report
+from ...fast_serializers import get_fast_serializer
+from ...serializers import (CommentSerializer, ReviewSerializer,
+                            TitleListSerializer)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает обычные сериализаторы списков с FastListSerializer: '
+        'проверяет совпадение JSON и печатает время на страницу.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, size, repeat, **options):
+        renderer = JSONRenderer()
+        cases = (
+            ('titles', TitleListSerializer, Title.objects.with_rating()),
+            ('reviews', ReviewSerializer, Review.objects.all()),
+            ('comments', CommentSerializer, Comment.objects.all()),
+        )
+        for name, serializer_class, queryset in cases:
+            fast = get_fast_serializer(serializer_class)
+
+            def slow_path():
+                return renderer.render(
+                    serializer_class(queryset.all()[:size], many=True).data
+                )
+
+            def fast_path():
+                return renderer.render(
+                    fast.to_representation(fast.values(queryset)[:size])
+                )
+
+            if slow_path() != fast_path():
+                raise CommandError(f'{name}: JSON не совпадает.')
+            report(
+                self.stdout, name,
+                measure(slow_path, repeat=repeat),
+                measure(fast_path, repeat=repeat),
+            )
@@ -0,0 +1,115 @@
+import math
+from collections import defaultdict
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from reviews.recommendations import similar_titles
+
+from ...benchmarks import measure, report
+
+
+def synthetic_ratings(reviews, users, titles, seed=0):
+    """Случайные оценки: популярность произведений убывает по Ципфу."""
+    rng = np.random.RandomState(seed)
+    weights = 1 / np.arange(1, titles + 1)
+    pairs = np.unique(
+        rng.randint(users, size=reviews) * titles
+        + rng.choice(titles, size=reviews, p=weights / weights.sum())
+    )
+    return (
+        pairs // titles,
+        pairs % titles,
+        rng.randint(1, 11, size=len(pairs)),
+    )
+
+
+def naive_similar_titles(authors, titles, scores, limit):
+    """Та же adjusted cosine на словарях, без NumPy."""
+    ratings = defaultdict(dict)
+    for author, title, score in zip(authors, titles, scores):
+        ratings[int(author)][int(title)] = float(score)
+    centered = defaultdict(dict)
+    for author, scored in ratings.items():
+        mean = sum(scored.values()) / len(scored)
+        for title, score in scored.items():
+            if score != mean:
+                centered[title][author] = score - mean
+    norms = {
+        title: math.sqrt(sum(value * value for value in vector.values()))
+        for title, vector in centered.items()
+    }
+    result = {}
+    for title in set(int(title) for title in titles):
+        vector = centered.get(title, {})
+        found = []
+        for other, other_vector in centered.items():
+            dot = sum(
+                value * other_vector.get(author, 0)
+                for author, value in vector.items()
+            )
+            if other != title and dot > 0:
+                found.append((dot / (norms[title] * norms[other]), other))
+        found.sort(reverse=True)
+        result[title] = [(other, score) for score, other in found[:limit]]
+    return result
+
+
+def build(authors, titles, scores, limit, block_size):
+    return {
+        title: similar
+        for block in similar_titles(
+            authors, titles, scores, limit, block_size
+        )
+        for title, similar in block
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Время расчёта похожих произведений: словари на Python против '
+        'блочного расчёта на NumPy на синтетических оценках.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reviews', type=int, default=20000)
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--titles', type=int, default=500)
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--block-size', type=int, default=64)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument(
+            '--no-naive', action='store_true',
+            help='Только NumPy: для объёмов, где словари слишком медленные.'
+        )
+
+    def compare(self, fast, naive):
+        for title, expected in naive.items():
+            got = [score for _, score in fast.get(title, [])]
+            if not np.allclose(
+                got, [score for _, score in expected], atol=1e-4
+            ):
+                raise CommandError(f'Произведение {title}: результаты '
+                                   f'не совпадают.')
+
+    def handle(self, *args, reviews, users, titles, limit, block_size,
+               repeat, no_naive, **options):
+        authors, items, scores = synthetic_ratings(reviews, users, titles)
+        self.stdout.write(f'Отзывов: {len(scores)}')
+        after = measure(
+            lambda: build(authors, items, scores, limit, block_size),
+            repeat=repeat,
+        )
+        if no_naive:
+            self.stdout.write(
+                f'numpy: {after:.2f} с, {len(scores) / after:.0f} отзывов/с'
+            )
+            return
+        self.compare(
+            build(authors, items, scores, limit, block_size),
+            naive_similar_titles(authors, items, scores, limit),
+        )
+        before = measure(
+            lambda: naive_similar_titles(authors, items, scores, limit),
+            repeat=1,
+        )
+        report(self.stdout, 'similar_titles', before, after)
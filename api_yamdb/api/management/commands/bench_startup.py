@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from ...benchmarks import report
+from ...startup import run
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время до первого ответа нового процесса для двух '
+        'профилей настроек (лучшее из --repeat запусков).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', nargs=2,
+            default=['api_yamdb.settings.dev', 'api_yamdb.settings.prod'],
+        )
+        parser.add_argument('--path', default='/api/v1/')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def best(self, profile, path, repeat):
+        results = [
+            run(profile, f'child({path!r})')[0] for _ in range(repeat)
+        ]
+        return {
+            metric: min(result[metric] for result in results)
+            for metric in ('setup', 'first_request', 'total', 'process')
+        }
+
+    def handle(self, *args, profiles, path, repeat, **options):
+        before, after = (
+            self.best(profile, path, repeat) for profile in profiles
+        )
+        self.stdout.write(f'{profiles[0]} -> {profiles[1]}, GET {path}')
+        for metric, name in (
+            ('setup', 'django.setup()'),
+            ('first_request', 'первый запрос'),
+            ('total', 'до первого ответа'),
+            ('process', 'процесс целиком'),
+        ):
+            report(self.stdout, name, before[metric], after[metric])
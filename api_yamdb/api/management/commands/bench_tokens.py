@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from reviews.models import User
+from reviews.tokens import access_token_issuer
+
+from ...benchmarks import measure, report
+from ...views import TokenAPIView
+
+
+def refresh_access_token(user):
+    """Как выпускались токены раньше: через RefreshToken."""
+    return str(RefreshToken.for_user(user).access_token)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает выпуск access-токена через RefreshToken и через '
+        'AccessTokenIssuer: отдельно и в TokenAPIView (токенов/с).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', help='По умолчанию первый.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--number', type=int, default=1000)
+
+    def get_user(self, username):
+        users = User.objects.all()
+        if username:
+            users = users.filter(username=username)
+        user = users.first()
+        if user is None:
+            raise CommandError('Нет пользователя для выпуска токенов.')
+        return user
+
+    def check_token(self, user):
+        token = AccessToken(access_token_issuer().for_user(user))
+        reference = AccessToken(refresh_access_token(user))
+        if token.payload.keys() != reference.payload.keys():
+            raise CommandError('Состав claims не совпадает с AccessToken.')
+
+    def bench_view(self, user, number, repeat):
+        view = TokenAPIView.as_view(throttle_classes=())
+        factory = APIRequestFactory()
+        data = {
+            'username': user.username,
+            'confirmation_code': user.generate_confirm_code(),
+        }
+
+        def call():
+            response = view(factory.post(
+                '/api/v1/auth/token/', data, format='json'
+            ))
+            if response.status_code != 200:
+                raise CommandError(f'TokenAPIView: {response.status_code}')
+
+        # Код одноразовый: в замерах его не гасим, иначе все вызовы после
+        # первого получат 400.
+        with mock.patch.object(User, 'use_confirm_code', lambda user: None):
+            with mock.patch.object(
+                User, 'token', property(refresh_access_token)
+            ):
+                before = measure(call, number=number, repeat=repeat)
+            after = measure(call, number=number, repeat=repeat)
+        return before, after
+
+    def handle(self, *args, username, repeat, number, **options):
+        user = self.get_user(username)
+        self.check_token(user)
+        before = measure(
+            lambda: refresh_access_token(user), number=number, repeat=repeat
+        )
+        after = measure(
+            lambda: access_token_issuer().for_user(user),
+            number=number, repeat=repeat,
+        )
+        report(self.stdout, 'access token', before, after)
+        before, after = self.bench_view(user, number // 10 or 1, repeat)
+        report(self.stdout, 'TokenAPIView', before, after)
+        self.stdout.write(
+            f'TokenAPIView: {1 / before:.0f} -> {1 / after:.0f} токенов/с'
+        )
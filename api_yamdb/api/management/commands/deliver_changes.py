@@ -0,0 +1,44 @@
+import time
+from urllib.error import URLError
+
+from django.core.management.base import BaseCommand
+from reviews.models import WebhookSubscription
+
+from ...webhooks import deliver
+
+
+class Command(BaseCommand):
+    help = (
+        'Доставляет журнал изменений активным подпискам пачками '
+        'до last_change_id. С --loop работает постоянно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--timeout', type=float, default=5)
+        parser.add_argument('--loop', action='store_true')
+        parser.add_argument('--interval', type=float, default=1)
+
+    def deliver_all(self, batch_size, timeout):
+        delivered = 0
+        for subscription in WebhookSubscription.objects.filter(
+            is_active=True
+        ):
+            try:
+                while True:
+                    sent = deliver(subscription, batch_size, timeout)
+                    delivered += sent
+                    if sent < batch_size:
+                        break
+            except URLError as error:
+                self.stderr.write(f'{subscription}: {error}')
+        return delivered
+
+    def handle(self, *args, batch_size, timeout, loop, interval, **options):
+        while True:
+            delivered = self.deliver_all(batch_size, timeout)
+            if delivered:
+                self.stdout.write(f'Доставлено изменений: {delivered}')
+            if not loop:
+                break
+            time.sleep(interval)
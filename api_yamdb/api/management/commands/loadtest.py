@@ -0,0 +1,49 @@
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+
+from ...loadtest import load
+
+CATALOG_PATHS = [
+    '/api/v1/titles/', '/api/v1/categories/', '/api/v1/genres/'
+]
+
+
+def format_result(result):
+    return (
+        f'{result["rps"]:.0f} запросов/с, p50 {result["p50"] * 1000:.1f} мс, '
+        f'p90 {result["p90"] * 1000:.1f} мс, '
+        f'p99 {result["p99"] * 1000:.1f} мс, '
+        f'ошибок {result["errors"]} из {result["requests"]}'
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает запущенный API GET-запросами по --paths из '
+        '--concurrency keep-alive соединений и печатает пропускную '
+        'способность и задержки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--paths', nargs='+', default=CATALOG_PATHS)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=10)
+        parser.add_argument(
+            '--header', action='append', default=[],
+            help='заголовок запроса "Имя: значение", можно несколько',
+        )
+
+    def handle(self, *args, url, paths, concurrency, duration, header,
+               **options):
+        parts = urlsplit(url)
+        headers = dict(
+            (name.strip(), value.strip())
+            for name, value in (item.split(':', 1) for item in header)
+        )
+        result = load(
+            parts.hostname, parts.port or 80, paths, concurrency, duration,
+            headers,
+        )
+        self.stdout.write(format_result(result))
@@ -0,0 +1,52 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from ...startup import by_package, run
+
+
+def ms(seconds):
+    return f'{seconds * 1000:.1f} мс'
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает новый интерпретатор, поднимает Django и выполняет '
+        'первый запрос; печатает время импорта, django.setup() по '
+        'приложениям и самые дорогие импорты (-X importtime).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile',
+            default=os.environ.get('DJANGO_SETTINGS_MODULE'),
+            help='модуль настроек дочернего процесса',
+        )
+        parser.add_argument('--path', default='/api/v1/')
+        parser.add_argument('--limit', type=int, default=20)
+
+    def handle(self, *args, profile, path, limit, **options):
+        result, modules = run(profile, f'child({path!r})', importtime=True)
+        self.stdout.write(
+            f'{profile}: процесс {ms(result["process"])}, '
+            f'импорт {ms(result["import"])}, '
+            f'django.setup() {ms(result["setup"])}, '
+            f'первый запрос {ms(result["first_request"])} '
+            f'({result["status"]}), модулей {result["modules"]}'
+        )
+        self.stdout.write('Приложения (импорт / модели / ready):')
+        for label, phases in result['apps'].items():
+            self.stdout.write(
+                f'  {label:30} ' + ' / '.join(
+                    ms(phases.get(phase, 0))
+                    for phase in ('import', 'models', 'ready')
+                )
+            )
+        self.stdout.write('Пакеты (собственное время импорта):')
+        for package, seconds in by_package(modules)[:limit]:
+            self.stdout.write(f'  {package:30} {ms(seconds)}')
+        self.stdout.write('Модули (с зависимостями):')
+        for name, _, cumulative in sorted(
+            modules, key=lambda module: -module[2]
+        )[:limit]:
+            self.stdout.write(f'  {name:50} {ms(cumulative)}')
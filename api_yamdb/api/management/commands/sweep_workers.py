@@ -0,0 +1,91 @@
+import itertools
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...loadtest import frontier, load, wait_ready
+from .loadtest import CATALOG_PATHS, format_result
+
+HOST = '127.0.0.1'
+
+
+class Command(BaseCommand):
+    help = (
+        'Перебирает класс воркера, число воркеров и потоков gunicorn '
+        '(gunicorn.conf.py), нагружает каждый вариант как loadtest '
+        'и печатает границу Парето по запросам/с и p99.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--worker-classes', nargs='+',
+            default=['sync', 'gthread', 'uvicorn.workers.UvicornWorker'],
+        )
+        parser.add_argument('--workers', nargs='+', type=int,
+                            default=[1, 2, 4])
+        parser.add_argument('--threads', nargs='+', type=int,
+                            default=[1, 4])
+        parser.add_argument('--concurrency', nargs='+', type=int,
+                            default=[8, 32])
+        parser.add_argument('--duration', type=float, default=10)
+        parser.add_argument('--paths', nargs='+', default=CATALOG_PATHS)
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument(
+            '--profile', default='api_yamdb.settings.bench',
+            help='DJANGO_SETTINGS_MODULE для gunicorn',
+        )
+
+    def variants(self, worker_classes, workers, threads):
+        for worker_class, count in itertools.product(worker_classes, workers):
+            # Потоки есть только у gthread
+            for thread_count in threads if worker_class == 'gthread' else [1]:
+                yield {
+                    'GUNICORN_WORKER_CLASS': worker_class,
+                    'GUNICORN_WORKERS': str(count),
+                    'GUNICORN_THREADS': str(thread_count),
+                }
+
+    def serve(self, variant, port, profile):
+        return subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+            cwd=settings.BASE_DIR,
+            env=dict(
+                os.environ, DJANGO_SETTINGS_MODULE=profile,
+                GUNICORN_BIND=f'{HOST}:{port}', **variant
+            ),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def measure(self, variant, options):
+        server = self.serve(variant, options['port'], options['profile'])
+        try:
+            if not wait_ready(HOST, options['port'], options['paths'][0], 30):
+                raise CommandError(f'gunicorn не запустился: {variant}')
+            for concurrency in options['concurrency']:
+                result = load(
+                    HOST, options['port'], options['paths'], concurrency,
+                    options['duration'],
+                )
+                result['name'] = (
+                    f'{variant["GUNICORN_WORKER_CLASS"].split(".")[-1]} '
+                    f'w={variant["GUNICORN_WORKERS"]} '
+                    f't={variant["GUNICORN_THREADS"]} c={concurrency}'
+                )
+                self.stdout.write(f'{result["name"]}: {format_result(result)}')
+                yield result
+        finally:
+            server.terminate()
+            server.wait()
+
+    def handle(self, *args, worker_classes, workers, threads, **options):
+        results = [
+            result
+            for variant in self.variants(worker_classes, workers, threads)
+            for result in self.measure(variant, options)
+        ]
+        self.stdout.write('Граница Парето (запросов/с против p99):')
+        for result in sorted(frontier(results), key=lambda r: -r['rps']):
+            self.stdout.write(f'  {result["name"]}: {format_result(result)}')
@@ -0,0 +1,31 @@
+import json
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Локальный получатель вебхуков: печатает пришедшие изменения.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8001)
+
+    def handle(self, *args, port, **options):
+        stdout = self.stdout
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):  # noqa: N802
+                length = int(self.headers.get('Content-Length', 0))
+                changes = json.loads(self.rfile.read(length))['changes']
+                stdout.write(
+                    f'{len(changes)} изменений: '
+                    f'{changes[0]["id"]}..{changes[-1]["id"]}'
+                )
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        stdout.write(f'Слушаю http://127.0.0.1:{port}/')
+        HTTPServer(('127.0.0.1', port), Handler).serve_forever()
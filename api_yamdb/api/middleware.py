@@ -0,0 +1,73 @@
+import gzip
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+re_accept_encoding = re.compile(r'([\w*-]+)\s*(?:;\s*q=([\d.]+))?')
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме явно запрещённых q=0."""
+    return {
+        coding.lower()
+        for coding, quality in re_accept_encoding.findall(header)
+        if not quality or float(quality) > 0
+    }
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=settings.BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=settings.GZIP_LEVEL)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Сжимает ответы brotli или gzip, если клиент их принимает, а тело
+    не меньше COMPRESSION_MIN_SIZE байт. Порядок выбора задаётся
+    COMPRESSION_ENCODINGS; brotli используется, только если установлен.
+    Потоковые ответы не сжимаются.
+    """
+
+    def get_encoding(self, request):
+        accepted = accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        for encoding in settings.COMPRESSION_ENCODINGS:
+            if encoding == 'br' and brotli is None:
+                continue
+            if encoding in accepted:
+                return encoding
+        return None
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.get_encoding(request)
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # Сжатое тело отличается побайтно, сильный ETag ему не подходит.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
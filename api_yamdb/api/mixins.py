@@ -0,0 +1,261 @@
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .fast_serializers import get_fast_serializer
+
+
+class FastListMixin:
+    """
+    Отдаёт action list через FastListSerializer.
+
+    Остальные действия по-прежнему используют get_serializer_class().
+    """
+    fast_list_serializer_class = None
+
+    def get_requested_fields(self):
+        """Поля, которые нужно отдать; None — все."""
+
+    def get_fast_serializer(self):
+        return get_fast_serializer(
+            self.fast_list_serializer_class or self.get_serializer_class(),
+            self.get_requested_fields(),
+        )
+
+    def get_rows(self, fast, narrow):
+        """
+        Строки для fast; narrow(queryset) сужает queryset — фильтрами
+        списка или id из ?ids=.
+        """
+        return fast.values(narrow(self.get_queryset()))
+
+    def list(self, request, *args, **kwargs):
+        fast = self.get_fast_serializer()
+        queryset = self.get_rows(fast, self.filter_queryset)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.to_representation(page))
+        return Response(fast.to_representation(queryset))
+
+
+class BatchRetrieveMixin:
+    """
+    GET списка с ?ids=1,2,3 отдаёт объекты с этими id в порядке запроса
+    фиксированным числом запросов через FastListSerializer. Вместо
+    ненайденных id — {"id": ..., "detail": ...}. Фильтры и пагинация
+    к такому запросу не применяются, id не больше BATCH_RETRIEVE_LIMIT.
+    Ставится перед FastListMixin.
+    """
+    ids_param = 'ids'
+
+    def get_requested_ids(self):
+        """id из ?ids= или None, если параметра нет."""
+        value = self.request.query_params.get(self.ids_param)
+        if value is None:
+            return None
+        try:
+            ids = [int(pk) for pk in value.split(',') if pk.strip()]
+        except ValueError:
+            raise ValidationError({
+                self.ids_param: 'Ожидается список id через запятую.'
+            })
+        if not ids or len(ids) > settings.BATCH_RETRIEVE_LIMIT:
+            raise ValidationError({
+                self.ids_param: 'Нужно от 1 до {} id.'.format(
+                    settings.BATCH_RETRIEVE_LIMIT
+                )
+            })
+        return ids
+
+    def list(self, request, *args, **kwargs):
+        ids = self.get_requested_ids()
+        if ids is None:
+            return super().list(request, *args, **kwargs)
+        fast = self.get_fast_serializer()
+        rows = list(self.get_rows(
+            fast, lambda queryset: queryset.filter(pk__in=ids)
+        ))
+        found = {
+            row[fast.pk]: data
+            for row, data in zip(rows, fast.to_representation(rows))
+        }
+        return Response({'results': [
+            found[pk] if pk in found else {'id': pk, 'detail': 'Не найдено.'}
+            for pk in ids
+        ]})
+
+
+class ArchiveReadMixin:
+    """
+    Безопасные запросы видят и архивные строки из get_archive_queryset():
+    список объединяет их с живыми в порядке Meta.ordering модели,
+    retrieve ищет в архиве, если живой строки нет. Архив только читается:
+    изменяющие запросы к архивной строке получают 404.
+    Ставится перед BatchRetrieveMixin и FastListMixin.
+    """
+
+    def get_archive_queryset(self):
+        raise NotImplementedError
+
+    def get_rows(self, fast, narrow):
+        live = narrow(self.get_queryset())
+        ordering = [*live.model._meta.ordering, fast.pk]
+        columns = [
+            *fast.columns, *(name for name in ordering
+                             if name not in fast.columns)
+        ]
+        archived = narrow(self.get_archive_queryset()).order_by().values(
+            *columns
+        )
+        return live.order_by().values(*columns).union(
+            archived, all=True
+        ).order_by(*ordering)
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            if self.request.method not in SAFE_METHODS:
+                raise
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = get_object_or_404(
+            self.get_archive_queryset(),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+class CacheControlMixin:
+    """
+    Проставляет Cache-Control успешным ответам на безопасные запросы.
+
+    Политика берётся из settings.CACHE_CONTROL_POLICIES по cache_policy.
+    Публичная политика применяется только к анонимным запросам:
+    запросы с заголовком Authorization всегда получают private.
+    """
+    cache_policy = 'private'
+
+    def get_cache_policy(self, request):
+        if 'HTTP_AUTHORIZATION' in request.META:
+            return 'private'
+        return self.cache_policy
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if (
+            request.method in SAFE_METHODS
+            and response.status_code == status.HTTP_200_OK
+            and not response.has_header('Cache-Control')
+        ):
+            patch_cache_control(
+                response,
+                **settings.CACHE_CONTROL_POLICIES[
+                    self.get_cache_policy(request)
+                ]
+            )
+            patch_vary_headers(response, ('Authorization',))
+        return response
+
+
+class SparseFieldsMixin:
+    """
+    Ограничивает ответ безопасных запросов полями из ?fields=.
+
+    ?expand= перечисляет связанные объекты, которые нужно добавить
+    к выбранным полям (например, ?fields=id,name&expand=genre). Без
+    ?fields= ответ не меняется, пустой ?fields= — ошибка 400. Queryset
+    должен учитывать get_requested_fields(), чтобы не делать лишних JOIN
+    и аннотаций.
+    Ставится перед FastListMixin.
+    """
+    fields_param = 'fields'
+    expand_param = 'expand'
+
+    def _query_list(self, param):
+        value = self.request.query_params.get(param, '')
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    def get_requested_fields(self):
+        """Запрошенные поля или None, если нужны все."""
+        if (
+            self.request.method not in SAFE_METHODS
+            or self.fields_param not in self.request.query_params
+        ):
+            return None
+        fields = self._query_list(self.fields_param)
+        if not fields:
+            raise ValidationError({
+                self.fields_param: 'Укажите хотя бы одно поле.'
+            })
+        requested = fields | self._query_list(self.expand_param)
+        serializer_class = self.get_serializer_class()
+        unknown = requested - get_fast_serializer(serializer_class).field_names
+        if unknown:
+            raise ValidationError({
+                self.fields_param: 'Неизвестные поля: {}.'.format(
+                    ', '.join(sorted(unknown))
+                )
+            })
+        return frozenset(requested)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_requested_fields()
+        if fields is not None:
+            child = getattr(serializer, 'child', serializer)
+            for name in set(child.fields) - fields:
+                child.fields.pop(name)
+        return serializer
+
+
+class AtomicWriteMixin:
+    """
+    Выполняет create/update/destroy в одной транзакции с побочными
+    записями сигналов (счётчики, журнал изменений).
+
+    Изменяемая строка блокируется до конца транзакции: иначе archive_content
+    или purge_deleted могли бы удалить её между чтением и save(), и save()
+    вставил бы её заново (или счётчики уменьшились бы за уже удалённую).
+    """
+
+    def get_object(self):
+        obj = super().get_object()
+        if self.request.method in SAFE_METHODS:
+            return obj
+        locked = type(obj)._base_manager.select_for_update().filter(
+            pk=obj.pk
+        )
+        if not locked.exists():
+            raise Http404
+        return obj
+
+    def create(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
+
+
+class SoftDeleteMixin:
+    """
+    DELETE помечает объект удалённым за один UPDATE; каскад выполнит
+    purge_deleted в фоне.
+    """
+
+    def perform_destroy(self, instance):
+        instance.soft_delete()
@@ -0,0 +1,38 @@
+from django.db.models import F
+from reviews.models import Comment, Review
+
+from .pagination import MergedCursorPagination
+from .serializers import ModerationItemSerializer
+
+
+def moderation_sources(hidden=None):
+    """
+    Отзывы и комментарии для очереди модерации; hidden=True/False
+    оставляет только скрытые или только видимые.
+    """
+    reviews, comments = Review.objects.all(), Comment.objects.all()
+    if hidden is not None:
+        reviews = reviews.filter(is_hidden=hidden)
+        comments = comments.filter(is_hidden=hidden)
+    return (
+        ('comment', comments.values(
+            'id', 'pub_date', 'text', 'review_id', 'is_hidden',
+            'author__username', title_id=F('review__title_id'),
+        )),
+        ('review', reviews.values(
+            'id', 'pub_date', 'text', 'score', 'title_id', 'is_hidden',
+            'author__username',
+        )),
+    )
+
+
+def moderation_queue_response(request):
+    """Страница очереди модерации, новые записи сверху; ?hidden=."""
+    hidden = {'true': True, 'false': False}.get(
+        request.query_params.get('hidden', '').lower()
+    )
+    paginator = MergedCursorPagination()
+    page = paginator.paginate(moderation_sources(hidden), request)
+    return paginator.get_paginated_response(
+        ModerationItemSerializer(page, many=True).data
+    )
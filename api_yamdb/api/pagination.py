@@ -1,5 +1,18 @@
+import heapq
+from base64 import b64decode, b64encode
+from datetime import timedelta
+from itertools import islice, takewhile
+from urllib import parse
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 
 
 class CustomPagination(pagination.PageNumberPagination):
@@ -10,3 +23,183 @@ class CustomPagination(pagination.PageNumberPagination):
             'previous': self.get_previous_link(),
             'results': data
         })
+
+
+class MergedCursorPagination(pagination.BasePagination):
+    """
+    Keyset-пагинация по нескольким querysets, слитым в одну ленту.
+
+    sources — пары (вид, queryset строк .values() с id и pub_date).
+    Лента упорядочена по (pub_date, вид, id) по убыванию, где вид
+    сравнивается по первой позиции в sources. У одного вида может быть
+    несколько querysets (например, живые строки и архив), если id
+    в них не пересекаются. Из каждого queryset читается
+    не больше страницы строк после курсора (по индексу на pub_date),
+    строки сливаются heapq.merge без сортировки всей выборки.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def get_page_size(self, request):
+        try:
+            return pagination._positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def decode_cursor(self, request, kinds):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = parse.parse_qs(
+                b64decode(encoded.encode('ascii')).decode('ascii')
+            )
+            pub_date = parse_datetime(tokens['d'][0])
+            rank = kinds.index(tokens['k'][0])
+            pk = int(tokens['i'][0])
+        except (KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return pub_date, rank, pk
+
+    def encode_cursor(self, row):
+        querystring = parse.urlencode({
+            'd': row['pub_date'].isoformat(),
+            'k': row['type'],
+            'i': row['id'],
+        })
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            b64encode(querystring.encode('ascii')).decode('ascii'),
+        )
+
+    @staticmethod
+    def after(queryset, rank, cursor):
+        """Строки queryset вида rank строго после курсора."""
+        if cursor is None:
+            return queryset
+        pub_date, cursor_rank, pk = cursor
+        condition = Q(pub_date__lt=pub_date)
+        if rank < cursor_rank:
+            condition |= Q(pub_date=pub_date)
+        elif rank == cursor_rank:
+            condition |= Q(pub_date=pub_date, pk__lt=pk)
+        return queryset.filter(condition)
+
+    @staticmethod
+    def _tagged(rows, kind):
+        for row in rows:
+            row['type'] = kind
+            yield row
+
+    def paginate(self, sources, request):
+        self.base_url = request.build_absolute_uri()
+        kinds = list(dict.fromkeys(kind for kind, _ in sources))
+        size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, kinds)
+        streams = [
+            self._tagged(
+                self.after(queryset, kinds.index(kind), cursor).order_by(
+                    '-pub_date', '-id'
+                )[:size + 1].iterator(),
+                kind,
+            )
+            for kind, queryset in sources
+        ]
+        merged = heapq.merge(
+            *streams,
+            key=lambda row: (row['pub_date'], kinds.index(row['type']),
+                             row['id']),
+            reverse=True,
+        )
+        rows = list(islice(merged, size + 1))
+        self.has_next = len(rows) > size
+        self.page = rows[:size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+
+def settled(rows):
+    """
+    Начало rows (строк журнала по возрастанию id) до первой записи
+    моложе settings.CHANGES_SAFETY_LAG секунд. Транзакция, которая
+    получила меньший id, могла ещё не закоммититься: курсор не уходит
+    дальше записей, рядом с которыми такие транзакции ещё возможны.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.CHANGES_SAFETY_LAG)
+    return list(takewhile(lambda row: row['created'] <= cutoff, rows))
+
+
+class SincePagination(pagination.BasePagination):
+    """
+    Keyset-пагинация журнала по возрастанию id: ?since=<последний
+    полученный id>. Работает со строками .values() с полем created;
+    записи моложе CHANGES_SAFETY_LAG придерживаются (см. settled).
+    В ответе since — значение для следующего опроса, даже если новых
+    записей нет.
+    """
+    page_size = 100
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+    since_query_param = 'since'
+
+    def get_page_size(self, request):
+        try:
+            return pagination._positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        try:
+            self.since = pagination._positive_int(
+                request.query_params.get(self.since_query_param, 0)
+            )
+        except ValueError:
+            raise NotFound('Неверное значение since.')
+        size = self.get_page_size(request)
+        rows = settled(
+            queryset.filter(pk__gt=self.since).order_by('pk')[:size + 1]
+        )
+        self.has_next = len(rows) > size
+        self.page = rows[:size]
+        if self.page:
+            self.since = self.page[-1]['id']
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.base_url, self.since_query_param, self.since
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'since': self.since,
+            'results': data,
+        })
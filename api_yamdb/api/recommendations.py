@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+from reviews.models import UserRecommendation
+
+from .serializers import RecommendationSerializer
+
+
+def user_recommendations(user):
+    """Рекомендации пользователя из кеша или из UserRecommendation."""
+    # Только модель: reviews.recommendations тянет NumPy, он нужен
+    # лишь build_recommendations.
+    key = UserRecommendation.cache_key(user.pk)
+    recommendations = cache.get(key)
+    if recommendations is None:
+        recommendations = RecommendationSerializer(
+            UserRecommendation.objects.filter(user=user).select_related(
+                'title__category'
+            ).prefetch_related('title__genre'),
+            many=True,
+        ).data
+        cache.set(
+            key, recommendations, settings.RECOMMENDATIONS_CACHE_TIMEOUT
+        )
+    return recommendations
+
+
+def matches(recommendation, genre, category):
+    return (
+        (not genre or any(
+            item['slug'] == genre for item in recommendation['genre']
+        ))
+        and (not category or recommendation['category']['slug'] == category)
+    )
+
+
+def recommendations_response(request, user):
+    """Рекомендации, отфильтрованные по ?genre=<slug>&category=<slug>."""
+    genre = request.query_params.get('genre')
+    category = request.query_params.get('category')
+    return Response([
+        recommendation for recommendation in user_recommendations(user)
+        if matches(recommendation, genre, category)
+    ])
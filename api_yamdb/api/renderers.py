@@ -0,0 +1,71 @@
+import math
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson else 0
+)
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+def has_non_finite(data):
+    """Есть ли в данных NaN или бесконечность."""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        data = data.values()
+    elif not isinstance(data, (list, tuple)):
+        return False
+    return any(has_non_finite(item) for item in data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer, который рендерит через orjson, если он установлен.
+
+    Даты, Decimal, UUID и ленивые строки отдаются в encoder_class, поэтому
+    результат совпадает со стандартным рендерером, кроме записи float:
+    orjson пишет 1e16 и 0.000053 там, где json пишет 1e+16 и 5.3e-05
+    (значение то же). Всё, что orjson не поддерживает (отступы,
+    ensure_ascii, слишком большие числа), рендерится стандартным json.
+    NaN и Infinity orjson молча пишет как null, поэтому такие данные тоже
+    рендерит стандартный json — в строгом режиме он бросает ValueError.
+    """
+
+    def use_orjson(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and not self.ensure_ascii
+            and self.compact
+            and self.strict
+            and self.get_indent(accepted_media_type, renderer_context) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.use_orjson(
+            accepted_media_type, renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=ORJSON_OPTIONS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'null' in ret and has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как и стандартный рендерер, экранируем U+2028 и U+2029.
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(LINE_SEPARATOR, b'\\u2028').replace(
+                PARAGRAPH_SEPARATOR, b'\\u2029'
+            )
+        return ret
@@ -1,7 +1,11 @@
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (ArchivedReview, Category, Change, Comment, Genre,
+                            Review, SimilarTitle, Title, User,
+                            UserRecommendation)
+from reviews.moderation import MODERATION_ACTIONS
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -58,6 +62,7 @@ class TokenSerializer(serializers.Serializer):
     username = serializers.SlugField(
 
     )
+    refresh = serializers.BooleanField(default=False)
 
     class Meta:
         model = User
@@ -87,15 +92,17 @@ class ReviewSerializer(serializers.ModelSerializer):
         author = request.user
         title_id = self.context.get('view').kwargs.get('title_id')
         title = get_object_or_404(Title, pk=title_id)
-        if (
-                request.method == 'POST'
-                and Review.objects.filter(title=title, author=author).exists()
+        # Перенесённый в архив отзыв тоже занимает место: иначе автор
+        # учитывался бы в рейтинге дважды.
+        if request.method == 'POST' and any(
+            model.objects.filter(title=title, author=author).exists()
+            for model in (Review, ArchivedReview)
         ):
             raise ValidationError('Может существовать только один отзыв!')
         return data
 
     class Meta:
-        fields = '__all__'
+        exclude = ('is_hidden', 'deleted_at')
         model = Review
 
 
@@ -110,7 +117,7 @@ class CommentSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('is_hidden', 'deleted_at')
         model = Comment
 
 
@@ -135,12 +142,34 @@ class TitleListSerializer(serializers.ModelSerializer):
 
     class Meta:
         fields = ('id', 'name', 'year', 'genre',
-                  'category', 'description', 'rating')
+                  'category', 'description', 'rating', 'review_count')
         model = Title
         read_only_fields = ('id', 'name',
                             'year', 'description')
 
 
+class SimilarTitleSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='similar_id')
+    name = serializers.CharField(source='similar.name')
+    year = serializers.IntegerField(source='similar.year')
+
+    class Meta:
+        fields = ('id', 'name', 'year', 'score')
+        model = SimilarTitle
+
+
+class RecommendationSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='title_id')
+    name = serializers.CharField(source='title.name')
+    year = serializers.IntegerField(source='title.year')
+    genre = GenreSerializer(source='title.genre', many=True)
+    category = CategorySerializer(source='title.category')
+
+    class Meta:
+        fields = ('id', 'name', 'year', 'genre', 'category', 'score')
+        model = UserRecommendation
+
+
 class TitleCreateSerializer(serializers.ModelSerializer):
     genre = serializers.SlugRelatedField(
         slug_field='slug',
@@ -156,3 +185,40 @@ class TitleCreateSerializer(serializers.ModelSerializer):
     class Meta:
         fields = '__all__'
         model = Title
+
+
+class ActivitySerializer(serializers.Serializer):
+    """Запись ленты активности: отзыв или комментарий."""
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    title_id = serializers.IntegerField()
+    review_id = serializers.IntegerField(default=None)
+    text = serializers.CharField()
+    score = serializers.IntegerField(default=None)
+    pub_date = serializers.DateTimeField()
+
+
+class ModerationItemSerializer(ActivitySerializer):
+    """Запись очереди модерации."""
+    author = serializers.CharField(source='author__username')
+    is_hidden = serializers.BooleanField()
+
+
+class ModerationActionSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=MODERATION_ACTIONS)
+    reviews = serializers.ListField(
+        child=serializers.IntegerField(),
+        default=list,
+        max_length=settings.MODERATION_BATCH_LIMIT
+    )
+    comments = serializers.ListField(
+        child=serializers.IntegerField(),
+        default=list,
+        max_length=settings.MODERATION_BATCH_LIMIT
+    )
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Change
+        fields = ('id', 'model', 'object_id', 'action', 'created')
@@ -0,0 +1,57 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Comment, Genre, Review, Title
+
+from .events import format_event, get_broker, title_channel
+from .facets import invalidate_facets
+from .serializers import ActivitySerializer
+
+
+def publish_on_commit(title_id, event, data):
+    """Рассылает событие подписчикам произведения после коммита."""
+    message = format_event(event, ActivitySerializer(data).data)
+    transaction.on_commit(partial(
+        get_broker().publish, title_channel(title_id), message
+    ))
+
+
+@receiver(post_save, sender=Review)
+def review_published(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        publish_on_commit(instance.title_id, 'review', {
+            'type': 'review',
+            'id': instance.pk,
+            'title_id': instance.title_id,
+            'text': instance.text,
+            'score': instance.score,
+            'pub_date': instance.pub_date,
+        })
+
+
+@receiver(post_save, sender=Comment)
+def comment_published(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        title_id = instance.review.title_id
+        publish_on_commit(title_id, 'comment', {
+            'type': 'comment',
+            'id': instance.pk,
+            'title_id': title_id,
+            'review_id': instance.review_id,
+            'text': instance.text,
+            'pub_date': instance.pub_date,
+        })
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(m2m_changed, sender=Title.genre.through)
+def catalog_changed(sender, **kwargs):
+    """Фасеты каталога устарели; сбрасываем их после коммита."""
+    transaction.on_commit(invalidate_facets)
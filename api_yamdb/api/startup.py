@@ -0,0 +1,145 @@
+"""
+Замеры в новом интерпретаторе с заданным профилем настроек.
+child() (холодный старт) и throughput() (запросы в секунду) выполняются
+в дочернем процессе и печатают результат JSON последней строкой;
+run() запускает их и разбирает вывод -X importtime.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get(application, path):
+    """Один GET path через WSGI без тестового клиента; код ответа."""
+    from wsgiref.util import setup_testing_defaults
+
+    environ = {'PATH_INFO': path}
+    setup_testing_defaults(environ)
+    statuses = []
+    response = application(
+        environ, lambda status, headers, exc_info=None: statuses.append(
+            status
+        )
+    )
+    try:
+        b''.join(response)
+    finally:
+        if hasattr(response, 'close'):
+            response.close()
+    return int(statuses[0].split()[0])
+
+
+def timed(timings, phase, func):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings[phase] = time.perf_counter() - start
+    return wrapper
+
+
+def child(path):
+    """Поднимает Django, выполняет первый запрос и печатает замеры."""
+    started = time.perf_counter()
+    import django
+    from django.apps import AppConfig
+
+    apps = {}
+    create = AppConfig.create.__func__
+
+    def create_timed(cls, entry):
+        timings = {}
+        config = timed(timings, 'import', create)(cls, entry)
+        config.import_models = timed(timings, 'models', config.import_models)
+        config.ready = timed(timings, 'ready', config.ready)
+        apps[config.label] = timings
+        return config
+
+    AppConfig.create = classmethod(create_timed)
+    imported = time.perf_counter()
+    django.setup(set_prefix=False)
+    ready = time.perf_counter()
+    from django.core.handlers.wsgi import WSGIHandler
+
+    status = get(WSGIHandler(), path)
+    done = time.perf_counter()
+    sys.stdout.write(json.dumps({
+        'import': imported - started,
+        'setup': ready - imported,
+        'first_request': done - ready,
+        'total': done - started,
+        'status': status,
+        'apps': apps,
+        'modules': len(sys.modules),
+    }) + '\n')
+
+
+def throughput(paths, number):
+    """Запросов в секунду по каждому пути после одного прогревочного."""
+    import django
+
+    django.setup(set_prefix=False)
+    from django.core.handlers.wsgi import WSGIHandler
+
+    application = WSGIHandler()
+    results = {}
+    for path in paths:
+        status = get(application, path)
+        start = time.perf_counter()
+        for _ in range(number):
+            get(application, path)
+        results[path] = {
+            'status': status,
+            'rps': number / (time.perf_counter() - start),
+        }
+    sys.stdout.write(json.dumps({'paths': results}) + '\n')
+
+
+def parse_importtime(stderr):
+    """Строки -X importtime: [(модуль, self, cumulative)] в секундах."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((
+            name.strip(), int(own) / 1e6, int(cumulative) / 1e6
+        ))
+    return modules
+
+
+def by_package(modules):
+    """Собственное время импорта, сложенное по пакетам верхнего уровня."""
+    totals = defaultdict(float)
+    for name, own, _ in modules:
+        totals[name.split('.')[0]] += own
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+
+def run(settings_module, call, importtime=False, **env):
+    """
+    Выполняет call (например, "child('/api/v1/')") в новом интерпретаторе
+    с settings_module и переменными окружения env. Возвращает замеры,
+    время процесса целиком и -X importtime.
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', f'from api import startup; startup.{call}']
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module, **env)
+    start = time.perf_counter()
+    process = subprocess.run(
+        command, cwd=PROJECT_DIR, env=env, check=True,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    wall = time.perf_counter() - start
+    result = json.loads(process.stdout.splitlines()[-1])
+    result['process'] = wall
+    return result, parse_importtime(process.stderr)
@@ -0,0 +1,114 @@
+import asyncio
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from reviews.models import Title
+
+from .events import get_broker, title_channel
+from .renderers import FastJSONRenderer
+
+re_title_events = re.compile(r'^/api/v1/titles/(?P<title_id>\d+)/events/$')
+
+EVENT_STREAM_HEADERS = [
+    (b'content-type', b'text/event-stream; charset=utf-8'),
+    (b'cache-control', b'no-cache'),
+    # nginx не должен буферизовать поток.
+    (b'x-accel-buffering', b'no'),
+]
+PING = b': ping\n\n'
+
+
+def title_exists(title_id):
+    close_old_connections()
+    try:
+        return Title.objects.filter(pk=title_id).exists()
+    finally:
+        close_old_connections()
+
+
+async def wait_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def send_json(send, status, data):
+    body = FastJSONRenderer().render(data)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def next_message(subscription, disconnect):
+    """
+    Следующее сообщение подписки, PING, если за EVENTS_KEEPALIVE секунд
+    ничего не пришло, или None, если клиент отключился или отстал.
+    """
+    get = asyncio.ensure_future(subscription.get())
+    done, _ = await asyncio.wait(
+        (get, disconnect),
+        timeout=settings.EVENTS_KEEPALIVE,
+        return_when=asyncio.FIRST_COMPLETED,
+    )
+    if get in done:
+        return get.result()
+    get.cancel()
+    return None if disconnect in done else PING
+
+
+async def stream_title_events(scope, receive, send, title_id):
+    """
+    Поток новых отзывов и комментариев к произведению (text/event-stream).
+    Клиент ждёт событий в цикле событий, а не в потоке воркера.
+    """
+    if not await sync_to_async(title_exists)(title_id):
+        await send_json(send, 404, {'detail': 'Страница не найдена.'})
+        return
+    subscription = get_broker().subscribe(title_channel(title_id))
+    disconnect = asyncio.ensure_future(wait_disconnect(receive))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': EVENT_STREAM_HEADERS,
+        })
+        message = b'retry: %d\n\n' % settings.EVENTS_RETRY
+        while message is not None:
+            await send({
+                'type': 'http.response.body',
+                'body': message,
+                'more_body': True,
+            })
+            message = await next_message(subscription, disconnect)
+        if not disconnect.done():
+            await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        subscription.close()
+        disconnect.cancel()
+
+
+class EventStreamRouter:
+    """
+    ASGI-приложение: потоки событий обслуживает само, остальные
+    запросы передаёт Django.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            match = re_title_events.match(scope['path'])
+            if match:
+                await stream_title_events(
+                    scope, receive, send, int(match['title_id'])
+                )
+                return
+        await self.application(scope, receive, send)
@@ -0,0 +1,113 @@
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов скользящим окном в кеше.
+
+    Вместо списка времён всех запросов (как в SimpleRateThrottle) в кеше
+    хранятся два счётчика: текущего и предыдущего интервала. Число запросов
+    за последние duration секунд оценивается как
+    previous * (доля предыдущего интервала в окне) + current.
+    На запрос уходит один get_many и один add или incr.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, offset = divmod(self.now, self.duration)
+        current_key = f'{self.key}:{int(window)}'
+        previous_key = f'{self.key}:{int(window) - 1}'
+        counts = self.cache.get_many((current_key, previous_key))
+        self.current = counts.get(current_key, 0)
+        self.previous = counts.get(previous_key, 0)
+        self.offset = offset / self.duration
+        estimate = self.previous * (1 - self.offset) + self.current
+        if estimate >= self.num_requests:
+            return self.throttle_failure()
+        self.hit(current_key)
+        return self.throttle_success()
+
+    def hit(self, key):
+        # Счётчик живёт два интервала: в следующем он станет предыдущим.
+        timeout = 2 * self.duration
+        if self.cache.add(key, 1, timeout):
+            return
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Ключ истёк между add и incr.
+            self.cache.set(key, 1, timeout)
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Сколько секунд ждать, пока оценка не опустится ниже лимита."""
+        if self.current >= self.num_requests:
+            # Ждём следующего интервала, где текущий станет предыдущим.
+            share = 1 - self.num_requests / (self.current + 1)
+            return self.duration * (1 - self.offset + share)
+        share = 1 - (self.num_requests - self.current) / self.previous
+        return max(self.duration * (share - self.offset), 0)
+
+
+class IPThrottle(SlidingWindowThrottle):
+    """Ограничение по IP клиента."""
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class IdentityThrottle(SlidingWindowThrottle):
+    """Ограничение по значению поля identity_field в теле запроса."""
+    identity_field = 'username'
+
+    def get_cache_key(self, request, view):
+        identity = request.data.get(self.identity_field)
+        if not identity or not isinstance(identity, str):
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': identity.strip().lower(),
+        }
+
+
+class SignUpIPThrottle(IPThrottle):
+    scope = 'signup_ip'
+
+
+class SignUpIdentityThrottle(IdentityThrottle):
+    scope = 'signup_identity'
+    identity_field = 'email'
+
+
+class TokenIPThrottle(IPThrottle):
+    scope = 'token_ip'
+
+
+class TokenIdentityThrottle(IdentityThrottle):
+    scope = 'token_identity'
+
+
+class WriteThrottle(SlidingWindowThrottle):
+    """Ограничение изменяющих запросов по пользователю или IP."""
+    scope = 'write'
+
+    def get_cache_key(self, request, view):
+        if request.method in SAFE_METHODS:
+            return None
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
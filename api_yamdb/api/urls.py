@@ -1,9 +1,12 @@
 from django.urls import include, path
 from rest_framework import routers
+from rest_framework_simplejwt.views import TokenRefreshView
 
-from .views import (AdminUserViewSet, CategoryViewSet, CommentViewSet,
-                    GenreViewSet, MeDetailsViewSet, ReviewViewSet,
-                    SignUpAPIView, TitlesViewSet, TokenAPIView)
+from .views import (AdminUserViewSet, CategoryViewSet, ChangeViewSet,
+                    CommentViewSet, GenreViewSet, MeActivityAPIView,
+                    MeDetailsViewSet, MeRecommendationsAPIView,
+                    ModerationActionAPIView, ModerationQueueAPIView,
+                    ReviewViewSet, SignUpAPIView, TitlesViewSet, TokenAPIView)
 
 app_name = 'api'
 
@@ -13,6 +16,7 @@ router_v1.register('users', AdminUserViewSet, basename='AdminUser')
 router_v1.register('categories', CategoryViewSet, basename='Category')
 router_v1.register('genres', GenreViewSet, basename='Genre')
 router_v1.register('titles', TitlesViewSet, basename='Title')
+router_v1.register('changes', ChangeViewSet, basename='Change')
 router_v1.register(
     r'titles/(?P<title_id>\d+)/reviews',
     ReviewViewSet,
@@ -26,7 +30,14 @@ router_v1.register(
 
 urlpatterns = [
     path('v1/users/me/', MeDetailsViewSet.as_view()),
+    path('v1/users/me/activity/', MeActivityAPIView.as_view()),
+    path(
+        'v1/users/me/recommendations/', MeRecommendationsAPIView.as_view()
+    ),
+    path('v1/moderation/queue/', ModerationQueueAPIView.as_view()),
+    path('v1/moderation/actions/', ModerationActionAPIView.as_view()),
     path('v1/', include(router_v1.urls)),
     path('v1/auth/signup/', SignUpAPIView.as_view()),
     path('v1/auth/token/', TokenAPIView.as_view()),
+    path('v1/auth/token/refresh/', TokenRefreshView.as_view()),
 ]
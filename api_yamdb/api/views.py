@@ -1,22 +1,35 @@
-from django.db.models import Avg
-from rest_framework import filters, status, viewsets
+from django.http import Http404
+from django.utils.functional import cached_property
+from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.generics import RetrieveUpdateAPIView, get_object_or_404
 from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import SAFE_METHODS, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.models import (ArchivedReview, Category, Change, Genre, Review,
+                            SimilarTitle, Title, User)
+from reviews.moderation import moderate
 
+from .activity import activity_response
+from .facets import facets_response
 from .filters import TitlesFilter
-from .pagination import CustomPagination
+from .mixins import (ArchiveReadMixin, AtomicWriteMixin, BatchRetrieveMixin,
+                     CacheControlMixin, FastListMixin, SoftDeleteMixin,
+                     SparseFieldsMixin)
+from .moderation import moderation_queue_response
+from .pagination import CustomPagination, SincePagination
 from .permissions import (AdminModeratorAuthorPermission, CustomPermission,
-                          IsAdmin, IsAdminUserOrReadOnly)
-from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, RegistrationSerializer,
-                          ReviewSerializer, TitleCreateSerializer,
-                          TitleListSerializer, TokenSerializer, UserSerializer,
-                          UserSerializerRole)
+                          IsAdmin, IsAdminUserOrReadOnly, IsModerator)
+from .recommendations import recommendations_response
+from .serializers import (CategorySerializer, ChangeSerializer,
+                          CommentSerializer, GenreSerializer,
+                          ModerationActionSerializer, RegistrationSerializer,
+                          ReviewSerializer, SimilarTitleSerializer,
+                          TitleCreateSerializer, TitleListSerializer,
+                          TokenSerializer, UserSerializer, UserSerializerRole)
+from .throttling import (SignUpIdentityThrottle, SignUpIPThrottle,
+                         TokenIdentityThrottle, TokenIPThrottle)
 
 
 class SignUpAPIView(APIView):
@@ -25,6 +38,7 @@ class SignUpAPIView(APIView):
     (аутентифицированным и нет) доступ к данному эндпоинту.
     """
     permission_classes = (AllowAny,)
+    throttle_classes = (SignUpIPThrottle, SignUpIdentityThrottle)
     serializer_class = RegistrationSerializer
 
     def post(self, request):
@@ -38,11 +52,14 @@ class SignUpAPIView(APIView):
                 email=serializer.data.get('email'))
             new_user.email_user('Confirmation code',
                                 new_user.generate_confirm_code())
-        if User.objects.filter(email=serializer.data.get('email')).exists():
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        # Удалённые пользователи занимают имя и почту до очистки.
+        if User.all_objects.filter(
+                email=serializer.data.get('email')).exists():
             return Response(
                 'Такой емайл уже есть у другого username',
                 status=status.HTTP_400_BAD_REQUEST)
-        if User.objects.filter(username=serializer.data.get(
+        if User.all_objects.filter(username=serializer.data.get(
                 'username')).exists():
             return Response(
                 'Такой username уже зарегестрирован с другим мылом',
@@ -61,20 +78,33 @@ class SignUpAPIView(APIView):
 
 class TokenAPIView(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (TokenIPThrottle, TokenIdentityThrottle)
     serializer_class = TokenSerializer
 
     def post(self, request):
         data = request.data
         serializer = self.serializer_class(data=data)
         serializer.is_valid(raise_exception=True)
-        user = get_object_or_404(User, username=data.get('username'))
-        if user.check_confirm_code(data.get('confirmation_code')):
-            return Response(user.token, status=status.HTTP_200_OK)
+        # Удалённый пользователь не получает токен по старому коду.
+        user = get_object_or_404(User.objects, username=data.get('username'))
+        if not user.check_confirm_code(data.get('confirmation_code')):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        user.use_confirm_code()
+        if serializer.validated_data['refresh']:
+            # Пара для /auth/token/refresh/; без refresh — только
+            # access-токен строкой, как раньше.
+            from rest_framework_simplejwt.tokens import RefreshToken
 
-        return Response(status=status.HTTP_400_BAD_REQUEST)
+            refresh = RefreshToken.for_user(user)
+            return Response({
+                'token': str(refresh.access_token),
+                'refresh': str(refresh),
+            }, status=status.HTTP_200_OK)
+        return Response(user.token, status=status.HTTP_200_OK)
 
 
-class AdminUserViewSet(viewsets.ModelViewSet):
+class AdminUserViewSet(CacheControlMixin, AtomicWriteMixin, SoftDeleteMixin,
+                       viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     lookup_field = 'username'
@@ -83,8 +113,12 @@ class AdminUserViewSet(viewsets.ModelViewSet):
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
 
+    @action(detail=True, methods=['get'])
+    def activity(self, request, username):
+        return activity_response(request, self.get_object())
 
-class MeDetailsViewSet(RetrieveUpdateAPIView):
+
+class MeDetailsViewSet(CacheControlMixin, RetrieveUpdateAPIView):
     serializer_class = UserSerializerRole
     permission_classes = (CustomPermission,)
 
@@ -92,33 +126,104 @@ class MeDetailsViewSet(RetrieveUpdateAPIView):
         return self.request.user
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
+class MeActivityAPIView(CacheControlMixin, APIView):
+    """
+    Отзывы и комментарии текущего пользователя, новые сверху.
+    """
+    permission_classes = (CustomPermission,)
+
+    def get(self, request):
+        return activity_response(request, request.user)
+
+
+class MeRecommendationsAPIView(CacheControlMixin, APIView):
+    """
+    Рекомендованные текущему пользователю произведения,
+    ?genre=<slug>&category=<slug>.
+    """
+    permission_classes = (CustomPermission,)
+
+    def get(self, request):
+        return recommendations_response(request, request.user)
+
+
+class ModerationQueueAPIView(APIView):
+    """
+    Очередь модерации: отзывы и комментарии, новые сверху;
+    ?hidden=true|false.
+    """
+    permission_classes = (IsModerator,)
+
+    def get(self, request):
+        return moderation_queue_response(request)
+
+
+class ModerationActionAPIView(APIView):
+    """
+    Скрыть, вернуть или удалить пачку отзывов и комментариев
+    одной транзакцией.
+    """
+    permission_classes = (IsModerator,)
+
+    def post(self, request):
+        serializer = ModerationActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(moderate(
+            serializer.validated_data['action'],
+            serializer.validated_data['reviews'],
+            serializer.validated_data['comments'],
+        ))
+
+
+class TitlesViewSet(CacheControlMixin, AtomicWriteMixin, SparseFieldsMixin,
+                    BatchRetrieveMixin, FastListMixin, viewsets.ModelViewSet):
     """
     Предоставляет CRUD-действия для произведений.
     """
-    queryset = Title.objects.all().annotate(
-        Avg('reviews__score')
-    ).order_by('name')
     serializer_class = TitleListSerializer
     permission_classes = (IsAdminUserOrReadOnly,)
+    cache_policy = 'public'
     filter_backends = (filters.SearchFilter,)
     search_fields = ('=name',)
     filterset_class = TitlesFilter
     pagination_class = PageNumberPagination
 
+    def get_queryset(self):
+        queryset = Title.objects.order_by('name')
+        fields = self.get_requested_fields()
+        if fields is None or 'rating' in fields:
+            return queryset.with_rating()
+        return queryset
+
     def get_serializer_class(self):
         if self.action in ('create', 'update', 'partial_update'):
             return TitleCreateSerializer
         return TitleListSerializer
 
+    @action(detail=False)
+    def facets(self, request):
+        """Число произведений по категориям, жанрам и годам."""
+        return facets_response(request)
 
-class CategoryViewSet(viewsets.ModelViewSet):
+    @action(detail=True)
+    def similar(self, request, pk=None):
+        """Похожие произведения, заранее посчитанные build_similar_titles."""
+        get_object_or_404(Title.objects.only('pk'), pk=pk)
+        similar = SimilarTitle.objects.filter(
+            title_id=pk
+        ).select_related('similar')
+        return Response(SimilarTitleSerializer(similar, many=True).data)
+
+
+class CategoryViewSet(CacheControlMixin, AtomicWriteMixin,
+                      viewsets.ModelViewSet):
     """
     Возвращает список, создает новые и удаляет существующие категории.
     """
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsAdminUserOrReadOnly,)
+    cache_policy = 'public'
     filter_backends = (filters.SearchFilter,)
     search_fields = ("name",)
 
@@ -133,13 +238,15 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class GenreViewSet(viewsets.ModelViewSet):
+class GenreViewSet(CacheControlMixin, AtomicWriteMixin,
+                   viewsets.ModelViewSet):
     """
     Возвращает список, создает новые и удаляет существующие жанры.
     """
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminUserOrReadOnly,)
+    cache_policy = 'public'
     filter_backends = (filters.SearchFilter,)
     search_fields = ("name",)
 
@@ -153,35 +260,63 @@ class GenreViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(CacheControlMixin, AtomicWriteMixin, SoftDeleteMixin,
+                     SparseFieldsMixin, FastListMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (AdminModeratorAuthorPermission,)
+    cache_policy = 'public'
 
     def get_queryset(self):
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'))
-        return review.comments.all()
+        review_id = self.kwargs.get('review_id')
+        review = Review.objects.filter(id=review_id, is_hidden=False).first()
+        if review is None:
+            # Архивный отзыв переносится вместе со всеми комментариями
+            # и доступен только на чтение.
+            if self.request.method not in SAFE_METHODS:
+                raise Http404
+            review = get_object_or_404(
+                ArchivedReview,
+                id=review_id,
+                is_hidden=False)
+        return review.comments.filter(is_hidden=False)
 
     def perform_create(self, serializer):
         review = get_object_or_404(
             Review,
-            id=self.kwargs.get('review_id'))
+            id=self.kwargs.get('review_id'),
+            is_hidden=False)
         serializer.save(author=self.request.user, review=review)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(CacheControlMixin, AtomicWriteMixin, SoftDeleteMixin,
+                    SparseFieldsMixin, ArchiveReadMixin, BatchRetrieveMixin,
+                    FastListMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (AdminModeratorAuthorPermission,)
+    cache_policy = 'public'
 
-    def get_queryset(self):
-        title = get_object_or_404(
+    @cached_property
+    def title(self):
+        return get_object_or_404(
             Title,
             id=self.kwargs.get('title_id'))
-        return title.reviews.all()
+
+    def get_queryset(self):
+        return self.title.reviews.filter(is_hidden=False)
+
+    def get_archive_queryset(self):
+        return self.title.archived_reviews.filter(is_hidden=False)
 
     def perform_create(self, serializer):
-        title = get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.title)
+
+
+class ChangeViewSet(FastListMixin, mixins.ListModelMixin,
+                    viewsets.GenericViewSet):
+    """
+    Журнал изменений для внешних сервисов: ?since=<id>&limit=<n>.
+    """
+    queryset = Change.objects.all()
+    serializer_class = ChangeSerializer
+    permission_classes = (IsAdmin,)
+    pagination_class = SincePagination
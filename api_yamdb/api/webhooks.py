@@ -0,0 +1,40 @@
+from urllib.request import Request, urlopen
+
+from reviews.models import Change, WebhookSubscription
+
+from .fast_serializers import get_fast_serializer
+from .pagination import settled
+from .renderers import FastJSONRenderer
+from .serializers import ChangeSerializer
+
+
+def pending_changes(subscription, batch_size):
+    """Изменения после last_change_id, кроме придержанных settled."""
+    fast = get_fast_serializer(ChangeSerializer)
+    return fast.to_representation(settled(fast.values(
+        Change.objects.filter(pk__gt=subscription.last_change_id)
+    )[:batch_size]))
+
+
+def deliver(subscription, batch_size, timeout):
+    """
+    Отправляет подписчику POST с пачкой изменений после last_change_id
+    и сдвигает курсор, если получатель ответил 2xx. Возвращает размер
+    пачки; ошибки доставки (URLError, HTTPError) пробрасываются.
+    """
+    changes = pending_changes(subscription, batch_size)
+    if not changes:
+        return 0
+    request = Request(
+        subscription.url,
+        data=FastJSONRenderer().render({'changes': changes}),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    with urlopen(request, timeout=timeout):
+        pass
+    subscription.last_change_id = changes[-1]['id']
+    WebhookSubscription.objects.filter(pk=subscription.pk).update(
+        last_change_id=subscription.last_change_id
+    )
+    return len(changes)
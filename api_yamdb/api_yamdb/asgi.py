@@ -1,7 +1,12 @@
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from asgiref.wsgi import WsgiToAsgi
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+django.setup(set_prefix=False)
 
-application = get_asgi_application()
+from api.streams import EventStreamRouter  # noqa: E402
+
+application = EventStreamRouter(WsgiToAsgi(get_wsgi_application()))
@@ -0,0 +1,27 @@
+import atexit
+import logging
+import os
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+
+
+class BackgroundStreamHandler(QueueHandler):
+    """
+    StreamHandler, который пишет из фонового потока: в запросе запись
+    только форматируется и кладётся в очередь.
+
+    Поток не переживает fork (gunicorn --preload), поэтому в дочернем
+    процессе очередь и поток создаются заново.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(Queue(-1))
+        self.target = logging.StreamHandler(stream)
+        self.start()
+        atexit.register(lambda: self.listener.stop())
+        os.register_at_fork(after_in_child=self.start)
+
+    def start(self):
+        self.queue = Queue(-1)
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
@@ -0,0 +1,3 @@
+# Профили: base (по умолчанию), dev, prod и bench —
+# DJANGO_SETTINGS_MODULE=api_yamdb.settings.<профиль>.
+from .base import *  # noqa: F401,F403
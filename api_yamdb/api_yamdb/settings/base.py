@@ -0,0 +1,241 @@
+import os
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)
+)))
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+SECRET_KEY = os.getenv('SECRET_KEY', 'Optional default value')
+
+DEBUG = False
+
+ALLOWED_HOSTS = ['*']
+
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django_extensions',
+    'rest_framework',
+    'api',
+    'reviews',
+    'rest_framework_simplejwt',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'api_yamdb.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'api_yamdb.wsgi.application'
+ASGI_APPLICATION = 'api_yamdb.asgi.application'
+
+
+# Счётчики throttling и прочие кеши. LocMemCache живёт в памяти процесса,
+# для нескольких воркеров нужен общий бэкенд (Redis, Memcached).
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', default=''),
+    }
+}
+
+DATABASES = {
+    'default': {
+        'ENGINE': os.getenv('DB_ENGINE', default='django.db.backends.postgresql'),
+        'NAME': os.getenv('DB_NAME', default='postgres'),
+        'USER': os.getenv('POSTGRES_USER', default='postgres'),
+        'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='postgres'),
+        'HOST': os.getenv('DB_HOST', default='localhost'),
+        'PORT': os.getenv('DB_PORT', default='5432')
+    }
+}
+
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+LANGUAGE_CODE = 'ru-ru'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+STATIC_URL = '/static/'
+# STATICFILES_DIRS необходимо закомментировать или удалить
+# STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static/'),)
+STATIC_ROOT = os.path.join(BASE_DIR, 'static')
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+AUTH_USER_MODEL = 'reviews.User'
+
+# Срок действия кода подтверждения, секунды
+CONFIRMATION_CODE_TIMEOUT = int(
+    os.getenv('CONFIRMATION_CODE_TIMEOUT', 60 * 60 * 24)
+)
+# Принимать коды, сохранённые в User.confirmation_code до перехода
+# на ConfirmationCodeGenerator; после LEGACY_CONFIRMATION_CODES_UNTIL
+# (по умолчанию — месяц после перехода) они не действуют в любом случае
+LEGACY_CONFIRMATION_CODES = os.getenv(
+    'LEGACY_CONFIRMATION_CODES', 'false'
+).lower() in ('1', 'true', 'yes')
+LEGACY_CONFIRMATION_CODES_UNTIL = datetime.fromisoformat(
+    os.getenv('LEGACY_CONFIRMATION_CODES_UNTIL', '2026-11-19T00:00:00+00:00')
+)
+
+# Сжатие ответов (api.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_ENCODINGS = ('br', 'gzip')
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+# Политики Cache-Control для api.mixins.CacheControlMixin.
+# s-maxage — срок микрокеша nginx для анонимных запросов.
+CACHE_CONTROL_POLICIES = {
+    'public': {
+        'public': True,
+        'max_age': 60,
+        's_maxage': int(os.getenv('CACHE_S_MAXAGE', 5)),
+    },
+    'private': {'private': True, 'no_cache': True},
+}
+
+# Потоки событий (api.streams). LocalBroker рассылает события только
+# внутри процесса, PostgresBroker — всем воркерам через LISTEN/NOTIFY.
+EVENTS_BROKER = os.getenv(
+    'EVENTS_BROKER',
+    'api.events.PostgresBroker'
+    if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+    else 'api.events.LocalBroker'
+)
+EVENTS_QUEUE_SIZE = 100
+EVENTS_KEEPALIVE = 15
+EVENTS_RETRY = 3000
+
+# Сколько секунд живут фасеты каталога (сбрасываются при изменениях)
+FACETS_CACHE_TIMEOUT = 60 * 60
+
+# Сколько объектов можно запросить за раз через ?ids=
+BATCH_RETRIEVE_LIMIT = 100
+
+# Сколько похожих произведений хранит build_similar_titles
+SIMILAR_TITLES_LIMIT = 20
+# Сколько рекомендаций хранит build_recommendations и сколько секунд
+# они живут в кеше
+RECOMMENDATIONS_LIMIT = 100
+RECOMMENDATIONS_CACHE_TIMEOUT = 60 * 60
+
+# Сколько отзывов и комментариев можно модерировать одним запросом
+MODERATION_BATCH_LIMIT = 100
+
+# Через сколько дней без новых комментариев archive_content переносит
+# отзыв в архив
+ARCHIVE_AFTER_DAYS = 365
+
+# Сколько секунд журнал изменений (/changes/, вебхуки) придерживает свежие
+# записи: id выдаётся при вставке, а видна запись после коммита, поэтому
+# меньший id может появиться позже большего. Должно быть больше самой
+# долгой транзакции, пишущей в журнал.
+CHANGES_SAFETY_LAG = int(os.getenv('CHANGES_SAFETY_LAG', 5))
+
+REST_FRAMEWORK = {
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.IsAuthenticated',
+    ],
+
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework_simplejwt.authentication.JWTAuthentication',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'PAGE_SIZE': 10,
+    # orjson, если установлен, иначе стандартный json
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Перед приложением один nginx: адрес клиента — последний элемент
+    # X-Forwarded-For, который дописал он. Начало заголовка присылает
+    # сам клиент, по нему ограничения частоты обходились бы.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 1)),
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.WriteThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': os.getenv('THROTTLE_SIGNUP_IP', '20/hour'),
+        'signup_identity': os.getenv('THROTTLE_SIGNUP_IDENTITY', '3/hour'),
+        'token_ip': os.getenv('THROTTLE_TOKEN_IP', '60/hour'),
+        'token_identity': os.getenv('THROTTLE_TOKEN_IDENTITY', '10/hour'),
+        'write': os.getenv('THROTTLE_WRITE', '120/min'),
+    },
+}
+
+
+SIMPLE_JWT = {
+    # Устанавливаем срок жизни токена
+    'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
+    'AUTH_HEADER_TYPES': ('Bearer',),
+}
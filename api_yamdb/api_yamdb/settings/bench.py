@@ -0,0 +1,25 @@
+"""
+Профиль для bench_profiles: настройки профиля BENCH_PROFILE (dev или
+prod) с кешем в памяти процесса и без ограничения частоты запросов,
+чтобы замеры не зависели от внешних сервисов.
+"""
+import os
+from importlib import import_module
+
+profile = import_module(
+    f'api_yamdb.settings.{os.getenv("BENCH_PROFILE", "prod")}'
+)
+globals().update(
+    (name, value) for name, value in vars(profile).items() if name.isupper()
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Замеры идут без collectstatic, манифеста статики нет
+STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+
+REST_FRAMEWORK = dict(profile.REST_FRAMEWORK, DEFAULT_THROTTLE_CLASSES=[])
@@ -0,0 +1,4 @@
+"""Локальная разработка: DEBUG, BrowsableAPI, админка, django_extensions."""
+from .base import *  # noqa: F401,F403
+
+DEBUG = True
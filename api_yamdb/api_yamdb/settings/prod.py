@@ -0,0 +1,101 @@
+"""
+Профиль для контейнеров API: DJANGO_SETTINGS_MODULE=api_yamdb.settings.prod.
+
+Без админки, сессий, сообщений, CSRF, django_extensions и BrowsableAPI:
+API аутентифицирует только по JWT. Общий кеш Memcached, постоянные
+соединения с БД, закешированные шаблоны и логирование из фонового
+потока.
+"""
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import DATABASES, INSTALLED_APPS, REST_FRAMEWORK, TEMPLATES_DIR
+
+UNUSED_APPS = (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django_extensions',
+)
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in UNUSED_APPS]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+# Кеш общий для всех воркеров: throttling, фасеты, рекомендации
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.memcached.MemcachedCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='memcached:11211'),
+        'KEY_PREFIX': 'yamdb',
+    }
+}
+
+# Соединение с БД переиспользуется между запросами
+DATABASES = {
+    'default': dict(
+        DATABASES['default'],
+        CONN_MAX_AGE=int(os.getenv('CONN_MAX_AGE', 60)),
+    )
+}
+
+# Имена файлов с хешем содержимого: nginx отдаёт их с долгим кешем.
+# Манифест пишет collectstatic, без него страницы со статикой отдают 500.
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+)
+
+# Остаётся только redoc.html, он читается с диска один раз
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+REST_FRAMEWORK = dict(
+    REST_FRAMEWORK,
+    DEFAULT_RENDERER_CLASSES=['api.renderers.FastJSONRenderer'],
+)
+
+# Запрос только кладёт запись в очередь, в stderr пишет фоновый поток
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {
+            'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
+        },
+    },
+    'handlers': {
+        'background': {
+            'class': 'api_yamdb.log.BackgroundStreamHandler',
+            'formatter': 'plain',
+        },
+    },
+    'root': {
+        'handlers': ['background'],
+        'level': os.getenv('LOG_LEVEL', 'WARNING'),
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['background'],
+            'level': os.getenv('LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
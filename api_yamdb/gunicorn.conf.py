@@ -0,0 +1,65 @@
+"""
+Настройки gunicorn из переменных окружения GUNICORN_*; gunicorn читает
+./gunicorn.conf.py сам. Подобрать значения под машину помогает
+manage.py sweep_workers.
+"""
+import multiprocessing
+import os
+
+ASGI_WORKERS = (
+    'uvicorn.workers.UvicornWorker',
+    'uvicorn.workers.UvicornH11Worker',
+)
+
+
+def env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def env_bool(name, default=False):
+    return os.getenv(name, str(default)).lower() in ('1', 'true', 'yes')
+
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+# sync, gthread или ASGI-воркер uvicorn (нужен для потоков событий)
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', ASGI_WORKERS[0])
+wsgi_app = os.getenv(
+    'GUNICORN_APP',
+    'api_yamdb.asgi:application' if worker_class in ASGI_WORKERS
+    else 'api_yamdb.wsgi:application'
+)
+workers = env_int('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+# Потоки на воркер, только для gthread
+threads = env_int('GUNICORN_THREADS', 1)
+# Дольше, чем держит простаивающее соединение nginx (keepalive_timeout
+# в upstream, 4 с): иначе nginx пишет в уже закрытый сокет и отдаёт 502
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+# Перезапуск воркера после max_requests ± jitter запросов: утечки памяти
+# не копятся, а воркеры не перезапускаются все разом
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 0)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 0)
+# Django загружается до fork: быстрее старт и общая память страниц
+preload_app = env_bool('GUNICORN_PRELOAD')
+accesslog = os.getenv('GUNICORN_ACCESSLOG')
+
+
+def on_starting(server):
+    """
+    LocalBroker рассылает события только внутри процесса: с несколькими
+    ASGI-воркерами клиенты потоков теряли бы большую часть событий.
+    """
+    if (
+        server.cfg.worker_class_str not in ASGI_WORKERS
+        or server.cfg.workers < 2
+    ):
+        return
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    from django.conf import settings
+    if settings.EVENTS_BROKER == 'api.events.LocalBroker':
+        raise RuntimeError(
+            'api.events.LocalBroker не работает с несколькими воркерами: '
+            'задайте EVENTS_BROKER=api.events.PostgresBroker '
+            'или GUNICORN_WORKERS=1.'
+        )
@@ -1,10 +1,49 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Genre, Review, Title, User
+from .models import (Category, Comment, Genre, Review, Title, User,
+                     WebhookSubscription)
+from .paginators import ApproximateCountPaginator
+
+
+class DeletedListFilter(admin.SimpleListFilter):
+    """Мягко удалённые строки; без выбора показываются все."""
+    title = 'удалён'
+    parameter_name = 'deleted'
+
+    def lookups(self, request, model_admin):
+        return (('yes', 'Да'), ('no', 'Нет'))
+
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return queryset.filter(deleted_at__isnull=False)
+        if self.value() == 'no':
+            return queryset.filter(deleted_at__isnull=True)
+        return queryset
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Список для таблиц на миллионы строк: приблизительный счётчик,
+    без второго COUNT(*) по всей таблице и без фильтров по FK.
+
+    Строки берутся из all_objects: условие deleted_at IS NULL
+    менеджера objects выключило бы приблизительный счётчик.
+    Удалённые отделяет DeletedListFilter.
+    """
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    empty_value_display = '-пусто-'
+
+    def get_queryset(self, request):
+        queryset = self.model.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if not ordering:
+            return queryset
+        return queryset.order_by(*ordering)
 
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(LargeTableAdmin):
     list_display = (
         'username',
         'email',
@@ -13,35 +52,47 @@ class UserAdmin(admin.ModelAdmin):
         'last_name',
         'bio',
     )
-    search_fields = ('username', 'role',)
-    list_filter = ('username',)
-    empty_value_display = '-пусто-'
+    # Поиск по префиксу с учётом регистра идёт по индексу уникальных полей.
+    search_fields = ('username__startswith', 'email__startswith')
+    list_filter = ('role', 'is_staff', DeletedListFilter)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(LargeTableAdmin):
     list_display = (
+        'id',
         'review',
         'text',
         'author',
         'pub_date',
     )
-    search_fields = ('review',)
-    list_filter = ('review',)
-    empty_value_display = '-пусто-'
+    list_select_related = ('review', 'author')
+    raw_id_fields = ('review',)
+    autocomplete_fields = ('author',)
+    search_fields = ('author__username__startswith',)
+    list_filter = ('is_hidden', DeletedListFilter)
+    # Меняется через /moderation/actions/, там же пересчитываются счётчики.
+    readonly_fields = ('is_hidden',)
+    date_hierarchy = 'pub_date'
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(LargeTableAdmin):
     list_display = (
+        'id',
         'title',
         'text',
         'author',
         'score',
+        'pub_date',
     )
-    search_fields = ('pub_date',)
-    list_filter = ('pub_date',)
-    empty_value_display = '-пусто-'
+    list_select_related = ('title', 'author')
+    raw_id_fields = ('title',)
+    autocomplete_fields = ('author',)
+    search_fields = ('author__username__startswith',)
+    list_filter = ('score', 'is_hidden', DeletedListFilter)
+    readonly_fields = ('is_hidden',)
+    date_hierarchy = 'pub_date'
 
 
 @admin.register(Category)
@@ -63,8 +114,9 @@ class TitleAdmin(admin.ModelAdmin):
         'category',
         'description',
     )
+    list_select_related = ('category',)
     search_fields = ('name',)
-    list_filter = ('name',)
+    list_filter = ('category',)
     empty_value_display = '-пусто-'
 
 
@@ -77,3 +129,13 @@ class GenreAdmin(admin.ModelAdmin):
     search_fields = ('name',)
     list_filter = ('name',)
     empty_value_display = '-пусто-'
+
+
+@admin.register(WebhookSubscription)
+class WebhookSubscriptionAdmin(admin.ModelAdmin):
+    list_display = (
+        'url',
+        'last_change_id',
+        'is_active',
+    )
+    list_filter = ('is_active',)
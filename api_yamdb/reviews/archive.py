@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.db.models import F
+
+from .models import (ArchivedComment, ArchivedReview, Comment, Review, Title,
+                     User)
+
+
+def archive_candidates(cutoff):
+    """
+    Отзывы, которые можно перенести в архив: сами и все их комментарии
+    опубликованы раньше cutoff, и ничего из них не ждёт purge_deleted.
+    """
+    deleted_users = User.all_objects.filter(deleted_at__isnull=False)
+    return Review.objects.exclude(
+        pub_date__gte=cutoff
+    ).exclude(
+        author__in=deleted_users
+    ).exclude(
+        comments__pub_date__gte=cutoff
+    ).exclude(
+        comments__deleted_at__isnull=False
+    ).exclude(
+        comments__author__in=deleted_users
+    )
+
+
+def copy_rows(model, rows):
+    """Строки model с теми же значениями полей, что у rows."""
+    names = [field.attname for field in model._meta.concrete_fields]
+    return [
+        model(**{name: getattr(row, name) for name in names})
+        for row in rows
+    ]
+
+
+def credit_titles(reviews):
+    """Добавляет видимые отзывы reviews к итогам архива произведений."""
+    totals = {}
+    for review in reviews:
+        if not review.is_hidden:
+            count, score_sum = totals.get(review.title_id, (0, 0))
+            totals[review.title_id] = count + 1, score_sum + review.score
+    # По возрастанию id, чтобы параллельные пачки не ждали друг друга.
+    for title_id, (count, score_sum) in sorted(totals.items()):
+        Title.objects.filter(pk=title_id).update(
+            archived_review_count=F('archived_review_count') + count,
+            archived_score_sum=F('archived_score_sum') + score_sum,
+        )
+
+
+def archive(cutoff, batch_size):
+    """
+    Переносит в архив не больше batch_size отзывов вместе с комментариями
+    одной транзакцией. Возвращает число перенесённых отзывов; 0 —
+    переносить нечего.
+
+    Строки удаляются без сигналов: отзыв остаётся видимым, поэтому
+    review_count, comment_count и журнал изменений не меняются.
+    """
+    with transaction.atomic():
+        reviews = list(
+            archive_candidates(cutoff).order_by('pk').select_for_update()[
+                :batch_size
+            ]
+        )
+        if not reviews:
+            return 0
+        ids = [review.pk for review in reviews]
+        comments = Comment.all_objects.filter(review__in=ids)
+        ArchivedReview.objects.bulk_create(copy_rows(ArchivedReview, reviews))
+        ArchivedComment.objects.bulk_create(
+            copy_rows(ArchivedComment, comments), batch_size=batch_size
+        )
+        credit_titles(reviews)
+        comments._raw_delete(comments.db)
+        archived = Review.all_objects.filter(pk__in=ids)
+        archived._raw_delete(archived.db)
+    return len(ids)
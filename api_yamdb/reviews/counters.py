@@ -0,0 +1,58 @@
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import ArchivedComment, ArchivedReview, Comment, Review, Title
+
+
+def visible_subquery(model, field, aggregate):
+    """
+    aggregate по видимым (не скрытым модератором и не удалённым) строкам
+    model, ссылающимся на внешнюю строку через field.
+    """
+    return Coalesce(Subquery(
+        model.objects.filter(
+            is_hidden=False, **{field: OuterRef('pk')}
+        ).order_by().values(
+            field
+        ).annotate(total=aggregate).values('total')
+    ), 0)
+
+
+def count_subquery(model, field):
+    """Число видимых строк model, ссылающихся на внешнюю через field."""
+    return visible_subquery(model, field, Count('pk'))
+
+
+def recount_review_counts(titles=None):
+    """
+    Пересчитывает Title.review_count (видимые живые и архивные)
+    и итоги архива одним UPDATE.
+    """
+    if titles is None:
+        titles = Title.objects.all()
+    return titles.update(
+        review_count=(
+            count_subquery(Review, 'title')
+            + count_subquery(ArchivedReview, 'title')
+        ),
+        archived_review_count=count_subquery(ArchivedReview, 'title'),
+        archived_score_sum=visible_subquery(
+            ArchivedReview, 'title', Sum('score')
+        ),
+    )
+
+
+def recount_comment_counts(reviews=None):
+    """Пересчитывает Review.comment_count (видимые) одним UPDATE."""
+    if reviews is None:
+        reviews = Review.objects.all()
+    return reviews.update(comment_count=count_subquery(Comment, 'review'))
+
+
+def recount_archived_comment_counts(reviews=None):
+    """Пересчитывает ArchivedReview.comment_count одним UPDATE."""
+    if reviews is None:
+        reviews = ArchivedReview.objects.all()
+    return reviews.update(
+        comment_count=count_subquery(ArchivedComment, 'review')
+    )
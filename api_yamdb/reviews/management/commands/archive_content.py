@@ -0,0 +1,42 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...archive import archive
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит отзывы старше --days дней (и без более новых '
+        'комментариев) вместе с комментариями в архивные таблицы '
+        'пачками по --batch-size. С --loop работает постоянно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.ARCHIVE_AFTER_DAYS
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--loop', action='store_true')
+        parser.add_argument('--interval', type=float, default=60)
+
+    def archive_all(self, days, batch_size):
+        cutoff = timezone.now() - timedelta(days=days)
+        archived = 0
+        while True:
+            moved = archive(cutoff, batch_size)
+            archived += moved
+            if not moved:
+                return archived
+
+    def handle(self, *args, days, batch_size, loop, interval, **options):
+        while True:
+            archived = self.archive_all(days, batch_size)
+            if archived:
+                self.stdout.write(f'Перенесено отзывов: {archived}')
+            if not loop:
+                break
+            time.sleep(interval)
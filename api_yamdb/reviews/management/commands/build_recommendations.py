@@ -0,0 +1,108 @@
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from ...models import (ArchivedReview, RecommendationState, Review,
+                       SimilarTitle, User, UserRecommendation)
+from ...recommendations import recommend
+
+
+def load_reviews(users):
+    """
+    (author_id, title_id, score) видимых отзывов users, включая архивные:
+    прочитанное в архиве тоже нельзя рекомендовать.
+    """
+    return np.array([
+        row
+        for model in (Review, ArchivedReview)
+        for row in model.objects.filter(
+            author_id__in=users, is_hidden=False
+        ).values_list('author_id', 'title_id', 'score')
+    ], dtype=np.int64).reshape(-1, 3)
+
+
+def load_neighbors():
+    rows = SimilarTitle.objects.order_by('title_id').values_list(
+        'title_id', 'similar_id', 'score'
+    )
+    neighbors = np.array(rows, dtype=np.float64).reshape(-1, 3)
+    return (
+        neighbors[:, 0].astype(np.int64),
+        neighbors[:, 1].astype(np.int64),
+        neighbors[:, 2],
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рекомендации пользователей, у которых изменились '
+        'отзывы (или всех с --full), по похожим произведениям.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=settings.RECOMMENDATIONS_LIMIT
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Пересчитать всех, например после build_similar_titles.'
+        )
+
+    def mark_stale(self, full):
+        if full:
+            RecommendationState.objects.update(stale=True)
+        RecommendationState.objects.bulk_create(
+            (
+                RecommendationState(user_id=user_id)
+                for user_id in User.objects.filter(
+                    reviews__isnull=False,
+                    recommendation_state__isnull=True,
+                ).distinct().values_list('pk', flat=True).iterator()
+            ),
+            ignore_conflicts=True,
+        )
+
+    def claim(self, batch_size):
+        """
+        Забирает пачку устаревших пользователей. stale сбрасывается до
+        чтения отзывов: отзыв, пришедший во время расчёта, снова его
+        поставит, и пользователь попадёт в следующий запуск.
+        """
+        users = list(RecommendationState.objects.filter(
+            stale=True
+        ).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        RecommendationState.objects.filter(pk__in=users).update(
+            stale=False, computed_at=timezone.now()
+        )
+        return users
+
+    def save(self, users, recommendations):
+        with transaction.atomic():
+            UserRecommendation.objects.filter(user_id__in=users).delete()
+            UserRecommendation.objects.bulk_create(
+                UserRecommendation(user_id=user_id, title_id=title_id,
+                                   score=score)
+                for user_id, titles in recommendations.items()
+                for title_id, score in titles
+            )
+        cache.delete_many(
+            [UserRecommendation.cache_key(user_id) for user_id in users]
+        )
+
+    def handle(self, *args, limit, batch_size, full, **options):
+        self.mark_stale(full)
+        neighbors = load_neighbors()
+        total = 0
+        users = self.claim(batch_size)
+        while users:
+            reviews = load_reviews(users)
+            self.save(users, recommend(
+                reviews[:, 0], reviews[:, 1], reviews[:, 2], neighbors, limit
+            ))
+            total += len(users)
+            users = self.claim(batch_size)
+        self.stdout.write(f'Пересчитано пользователей: {total}')
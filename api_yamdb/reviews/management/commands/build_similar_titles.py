@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...models import ArchivedReview, Review, SimilarTitle
+from ...recommendations import load_ratings, similar_titles
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает похожие произведения по оценкам читателей '
+        '(adjusted cosine) и сохраняет top-K для каждого произведения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=settings.SIMILAR_TITLES_LIMIT
+        )
+        parser.add_argument('--block-size', type=int, default=64)
+        parser.add_argument('--chunk-size', type=int, default=100000)
+
+    def save(self, block):
+        with transaction.atomic():
+            SimilarTitle.objects.filter(
+                title_id__in=[title_id for title_id, _ in block]
+            ).delete()
+            SimilarTitle.objects.bulk_create(
+                SimilarTitle(title_id=title_id, similar_id=similar_id,
+                             score=score)
+                for title_id, similar in block
+                for similar_id, score in similar
+            )
+
+    def handle(self, *args, limit, block_size, chunk_size, **options):
+        # Архивные отзывы по-прежнему входят в рейтинг, значит и в близость.
+        authors, titles, scores = load_ratings((
+            Review.objects.filter(is_hidden=False),
+            ArchivedReview.objects.filter(is_hidden=False),
+        ), chunk_size)
+        saved = 0
+        for block in similar_titles(
+            authors, titles, scores, limit, block_size, chunk_size
+        ):
+            self.save(block)
+            saved += len(block)
+        # У произведений без отзывов похожих нет.
+        SimilarTitle.objects.filter(title__review_count=0).delete()
+        self.stdout.write(
+            f'Отзывов: {len(scores)}, произведений: {saved}'
+        )
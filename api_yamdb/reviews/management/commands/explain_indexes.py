@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+
+from ...models import Comment, Review
+
+INDEXES = (
+    'review_title_pub_date_idx',
+    'review_author_pub_date_idx',
+    'comment_review_pub_date_idx',
+    'comment_author_pub_date_idx',
+)
+
+
+def busiest(queryset, field):
+    row = queryset.values(field).annotate(
+        total=Count('pk')
+    ).order_by('-total').first()
+    if row is None:
+        raise CommandError('Нет данных: сначала заполните базу.')
+    return row[field]
+
+
+class Command(BaseCommand):
+    help = (
+        'Печатает EXPLAIN и время горячих запросов к отзывам '
+        'и комментариям без составных индексов и с ними.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10)
+
+    def get_queries(self, limit):
+        title_id = busiest(Review.objects.all(), 'title')
+        review_id = busiest(Comment.objects.all(), 'review')
+        author_id = busiest(Review.objects.all(), 'author')
+        return (
+            ('отзывы произведения', Review.objects.filter(
+                title_id=title_id).order_by('pub_date')[:limit]),
+            ('комментарии к отзыву', Comment.objects.filter(
+                review_id=review_id).order_by('pub_date')[:limit]),
+            ('отзывы автора', Review.objects.filter(
+                author_id=author_id).order_by('-pub_date')[:limit]),
+            ('комментарии автора', Comment.objects.filter(
+                author_id=author_id).order_by('-pub_date')[:limit]),
+        )
+
+    def explain(self, queries):
+        for name, queryset in queries:
+            start = time.perf_counter()
+            list(queryset.all())
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'-- {name}: {elapsed * 1000:.2f} мс')
+            self.stdout.write(queryset.explain())
+
+    def handle(self, *args, limit, **options):
+        queries = self.get_queries(limit)
+        self.stdout.write('=== без составных индексов ===')
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for name in INDEXES:
+                    cursor.execute(
+                        f'DROP INDEX {connection.ops.quote_name(name)}'
+                    )
+            self.explain(queries)
+            # Индексы удалялись только на время замера.
+            transaction.set_rollback(True)
+        self.stdout.write('=== с составными индексами ===')
+        self.explain(queries)
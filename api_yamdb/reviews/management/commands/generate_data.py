@@ -0,0 +1,192 @@
+import time
+from datetime import timedelta
+from itertools import repeat
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from ...models import (USER, ArchivedComment, ArchivedReview, Category,
+                       Comment, Genre, Review, Title, User)
+from ...synthetic import format_times, generate, insert_rows
+
+# Пароль, который не подходит ни к одному вводу (как set_unusable_password)
+UNUSABLE_PASSWORD = '!'
+
+
+def next_id(*models):
+    """Первый свободный id с учётом всех models (например, и архива)."""
+    return max(
+        model._base_manager.aggregate(last=Max('pk'))['last'] or 0
+        for model in models
+    ) + 1
+
+
+def batched_rows(size, batch_size, make_rows):
+    """Строки make_rows(start, stop) для последовательных кусков 0..size."""
+    for start in range(0, size, batch_size):
+        yield from make_rows(start, min(start + batch_size, size))
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет БД синтетическими пользователями, произведениями, '
+        'отзывами и комментариями: популярность произведений и активность '
+        'пользователей по Ципфу, жанры ManyToMany, длинные ветки '
+        'комментариев. Одно и то же --seed даёт одни и те же данные '
+        '(время отсчитывается от запуска). '
+        'Строки вставляются пачками (COPY в PostgreSQL) без сигналов, '
+        'review_count и comment_count заполняются сразу.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--titles', type=int, default=2000)
+        parser.add_argument('--reviews', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=200000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument(
+            '--zipf', type=float, default=1.1,
+            help='Показатель Ципфа для популярности и активности.'
+        )
+        parser.add_argument(
+            '--days', type=int, default=730,
+            help='За сколько последних дней распределены отзывы.'
+        )
+        parser.add_argument('--batch-size', type=int, default=50000)
+        parser.add_argument(
+            '--prefix', default='synthetic',
+            help='Префикс имён пользователей и слагов.'
+        )
+
+    def write(self, model, columns, rows, label=None):
+        started = time.perf_counter()
+        count = insert_rows(model, columns, rows, self.batch_size)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{label or model._meta.verbose_name_plural}: {count} '
+            f'за {elapsed:.1f} с ({count / max(elapsed, 1e-9):.0f} строк/с)'
+        )
+
+    def write_catalog(self, data, categories, genres):
+        self.write(Category, ('id', 'name', 'slug'), (
+            (pk, f'Категория {pk}', f'{self.prefix}-category-{pk}')
+            for pk in range(self.category_id, self.category_id + categories)
+        ))
+        self.write(Genre, ('id', 'name', 'slug'), (
+            (pk, f'Жанр {pk}', f'{self.prefix}-genre-{pk}')
+            for pk in range(self.genre_id, self.genre_id + genres)
+        ))
+        titles = len(data['review_count'])
+        self.write(Title, (
+            'id', 'name', 'year', 'category_id', 'review_count',
+            'archived_review_count', 'archived_score_sum',
+        ), zip(
+            range(self.title_id, self.title_id + titles),
+            (f'Произведение {pk}'
+             for pk in range(self.title_id, self.title_id + titles)),
+            data['title_year'].tolist(),
+            (data['title_category'] + self.category_id).tolist(),
+            data['review_count'].tolist(),
+            repeat(0),
+            repeat(0),
+        ))
+        self.write(Title.genre.through, ('title_id', 'genre_id'), zip(
+            (data['title_genre'] + self.title_id).tolist(),
+            (data['genre'] + self.genre_id).tolist(),
+        ), label='Жанры произведений')
+
+    def write_users(self, users):
+        self.write(User, (
+            'id', 'password', 'is_superuser', 'username', 'email', 'role',
+            'bio', 'first_name', 'last_name', 'is_staff', 'confirmation_code',
+            'confirmation_nonce',
+        ), (
+            (pk, UNUSABLE_PASSWORD, False, f'{self.prefix}{pk}',
+             f'{self.prefix}{pk}@example.com', USER, '', '', '', False, '',
+             '')
+            for pk in range(self.user_id, self.user_id + users)
+        ))
+
+    def review_rows(self, data, start, stop):
+        ids = range(self.review_id + start, self.review_id + stop)
+        return zip(
+            ids,
+            (data['review_title'][start:stop] + self.title_id).tolist(),
+            (f'Отзыв {pk}' for pk in ids),
+            (data['review_author'][start:stop] + self.user_id).tolist(),
+            data['review_score'][start:stop].tolist(),
+            format_times(data['review_time'][start:stop]),
+            data['comment_count'][start:stop].tolist(),
+            repeat(False),
+        )
+
+    def comment_rows(self, data, start, stop):
+        ids = range(self.comment_id + start, self.comment_id + stop)
+        return zip(
+            ids,
+            (data['comment_review'][start:stop] + self.review_id).tolist(),
+            (f'Комментарий {pk}' for pk in ids),
+            (data['comment_author'][start:stop] + self.user_id).tolist(),
+            format_times(data['comment_time'][start:stop]),
+            repeat(False),
+        )
+
+    def write_content(self, data):
+        self.write(Review, (
+            'id', 'title_id', 'text', 'author_id', 'score', 'pub_date',
+            'comment_count', 'is_hidden',
+        ), batched_rows(
+            len(data['review_title']), self.batch_size,
+            lambda start, stop: self.review_rows(data, start, stop),
+        ))
+        self.write(Comment, (
+            'id', 'review_id', 'text', 'author_id', 'pub_date', 'is_hidden',
+        ), batched_rows(
+            len(data['comment_review']), self.batch_size,
+            lambda start, stop: self.comment_rows(data, start, stop),
+        ))
+
+    def reset_sequences(self):
+        """Вставка с явными id не двигает последовательности PostgreSQL."""
+        models = (Category, Genre, Title, Title.genre.through, User, Review,
+                  Comment)
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+    def handle(self, *args, seed, users, titles, reviews, comments,
+               categories, genres, zipf, days, batch_size, prefix,
+               **options):
+        if min(users, titles, categories, genres, batch_size) < 1:
+            raise CommandError(
+                'Пользователей, произведений, категорий, жанров и размер '
+                'пачки должно быть не меньше одного.'
+            )
+        self.batch_size = batch_size
+        self.prefix = prefix
+        end = int(timezone.now().timestamp() * 10 ** 6)
+        started = time.perf_counter()
+        data = generate(
+            seed, users, titles, reviews, comments, categories, genres,
+            zipf, end - int(timedelta(days=days).total_seconds() * 10 ** 6),
+            end,
+        )
+        self.stdout.write(
+            f'Разыграно за {time.perf_counter() - started:.1f} с'
+        )
+        with transaction.atomic():
+            self.category_id = next_id(Category)
+            self.genre_id = next_id(Genre)
+            self.title_id = next_id(Title)
+            self.user_id = next_id(User)
+            self.review_id = next_id(Review, ArchivedReview)
+            self.comment_id = next_id(Comment, ArchivedComment)
+            self.write_catalog(data, categories, genres)
+            self.write_users(users)
+            self.write_content(data)
+            self.reset_sequences()
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...purge import purge
+
+
+class Command(BaseCommand):
+    help = (
+        'Физически удаляет помеченные удалёнными отзывы, комментарии '
+        'и пользователей пачками по --batch-size. С --loop работает '
+        'постоянно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--loop', action='store_true')
+        parser.add_argument('--interval', type=float, default=5)
+
+    def purge_all(self, batch_size):
+        purged = 0
+        while True:
+            deleted = purge(batch_size)
+            purged += deleted
+            if not deleted:
+                return purged
+
+    def handle(self, *args, batch_size, loop, interval, **options):
+        while True:
+            purged = self.purge_all(batch_size)
+            if purged:
+                self.stdout.write(f'Удалено строк: {purged}')
+            if not loop:
+                break
+            time.sleep(interval)
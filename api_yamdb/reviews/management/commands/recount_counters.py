@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from ...counters import (recount_archived_comment_counts,
+                         recount_comment_counts, recount_review_counts)
+from ...models import ArchivedReview, Review, Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает Title.review_count, итоги архива и comment_count '
+        'пакетными UPDATE по диапазонам id.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def recount(self, model, recount, batch_size):
+        last = model.objects.aggregate(last=Max('pk'))['last'] or 0
+        updated = 0
+        for start in range(0, last + 1, batch_size):
+            updated += recount(model.objects.filter(
+                pk__gte=start, pk__lt=start + batch_size
+            ))
+        self.stdout.write(f'{model._meta.verbose_name_plural}: {updated}')
+
+    def handle(self, *args, batch_size, **options):
+        self.recount(Title, recount_review_counts, batch_size)
+        self.recount(Review, recount_comment_counts, batch_size)
+        self.recount(
+            ArchivedReview, recount_archived_comment_counts, batch_size
+        )
@@ -0,0 +1,42 @@
+# Generated by Django 2.2.16 on 2026-10-19 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_review_comment_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=20, verbose_name='модель')),
+                ('object_id', models.PositiveIntegerField(verbose_name='id объекта')),
+                ('action', models.CharField(choices=[('create', 'create'), ('update', 'update'), ('delete', 'delete')], max_length=6, verbose_name='действие')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='время изменения')),
+            ],
+            options={
+                'verbose_name': 'Изменение',
+                'verbose_name_plural': 'Изменения',
+                'ordering': ('id',),
+            },
+        ),
+        migrations.CreateModel(
+            name='WebhookSubscription',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(unique=True, verbose_name='адрес')),
+                ('last_change_id', models.BigIntegerField(default=0, verbose_name='последнее доставленное изменение')),
+                ('is_active', models.BooleanField(default=True, verbose_name='активна')),
+            ],
+            options={
+                'verbose_name': 'Подписка на изменения',
+                'verbose_name_plural': 'Подписки на изменения',
+                'ordering': ('id',),
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_user_recommendations'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='confirmation_code',
+            field=models.CharField(blank=True, max_length=21, verbose_name='Код подтверждения'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 2.2.16 on 2026-10-19 18:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='archived_review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Число архивных отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='archived_score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок архивных отзывов'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedReview',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('text', models.CharField(max_length=200)),
+                ('score', models.PositiveSmallIntegerField()),
+                ('pub_date', models.DateTimeField(verbose_name='дата публикации')),
+                ('comment_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='число комментариев')),
+                ('is_hidden', models.BooleanField(default=False, verbose_name='скрыт модератором')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_reviews', to=settings.AUTH_USER_MODEL, verbose_name='автор')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_reviews', to='reviews.Title', verbose_name='произведение')),
+            ],
+            options={
+                'verbose_name': 'Архивный отзыв',
+                'verbose_name_plural': 'Архивные отзывы',
+                'ordering': ('pub_date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('text', models.CharField(max_length=200, verbose_name='текст комментария')),
+                ('pub_date', models.DateTimeField(verbose_name='дата публикации')),
+                ('is_hidden', models.BooleanField(default=False, verbose_name='скрыт модератором')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_comments', to=settings.AUTH_USER_MODEL, verbose_name='автор')),
+                ('review', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='reviews.ArchivedReview', verbose_name='отзыв')),
+            ],
+            options={
+                'verbose_name': 'Архивный комментарий',
+                'verbose_name_plural': 'Архивные комментарии',
+                'ordering': ('pub_date',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedreview',
+            index=models.Index(fields=['title', 'pub_date'], name='archived_review_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedreview',
+            index=models.Index(fields=['author', 'pub_date'], name='archived_review_author_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcomment',
+            index=models.Index(fields=['review', 'pub_date'], name='archived_comment_review_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcomment',
+            index=models.Index(fields=['author', 'pub_date'], name='archived_comment_author_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 19:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='confirmation_nonce',
+            field=models.CharField(blank=True, editable=False, max_length=12),
+        ),
+    ]
@@ -1,11 +1,16 @@
+from django.conf import settings
 from django.contrib.auth.models import (AbstractBaseUser, BaseUserManager,
                                         PermissionsMixin)
 from django.core.mail import send_mail
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.utils.crypto import get_random_string
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Q, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, get_random_string
 
+from .softdelete import SoftDeleteModel, SoftDeleteQuerySet
+from .tokens import access_token_issuer, confirmation_code_generator
 from .validators import validator_year
 
 USER = 'user'
@@ -19,7 +24,7 @@ ROLE_CHOICES = [
 ]
 
 
-class UserManager(BaseUserManager):
+class UserManager(BaseUserManager.from_queryset(SoftDeleteQuerySet)):
 
     def create_user(self, username, email, password=None, **extra_fields):
         if username is None:
@@ -47,7 +52,14 @@ class UserManager(BaseUserManager):
         return user
 
 
-class User(AbstractBaseUser, PermissionsMixin):
+class ActiveUserManager(UserManager):
+    """Пользователи без мягко удалённых."""
+
+    def get_queryset(self):
+        return super().get_queryset().alive()
+
+
+class User(SoftDeleteModel, AbstractBaseUser, PermissionsMixin):
     username = models.CharField(
         max_length=150,
         unique=True,
@@ -85,20 +97,34 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(
         default=False
     )
+    # Коды, выданные до ConfirmationCodeGenerator. Новые не сохраняются.
     confirmation_code = models.CharField(
         'Код подтверждения',
-        max_length=21
+        max_length=21,
+        blank=True
+    )
+    # Меняется при каждой выдаче кода: старые коды перестают действовать.
+    confirmation_nonce = models.CharField(
+        max_length=12,
+        blank=True,
+        editable=False
     )
 
     EMAIL_FIELD = 'email'
     USERNAME_FIELD = 'username'
     REQUIRED_FIELDS = ['email']
 
-    objects = UserManager()
+    objects = ActiveUserManager()
+    all_objects = UserManager()
 
     def __str__(self) -> str:
         return self.username
 
+    @property
+    def is_active(self):
+        # Удалённый пользователь не проходит аутентификацию.
+        return self.deleted_at is None
+
     @property
     def is_user(self):
         return self.role == USER
@@ -127,22 +153,46 @@ class User(AbstractBaseUser, PermissionsMixin):
         send_mail(subject, message, from_email, [self.email], **kwargs)
 
     def _generate_jwt_token(self):
-        refresh = RefreshToken.for_user(self)
-        return str(refresh.access_token)
+        return access_token_issuer().for_user(self)
 
     def generate_confirm_code(self):
-        chars = 'abcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*(-_=+)'
-        self.confirmation_code = get_random_string(20, chars)
-        self.save()
-        return self.confirmation_code
+        """Новый код подтверждения; ранее выданные перестают действовать."""
+        self.confirmation_nonce = get_random_string(12)
+        type(self).all_objects.filter(pk=self.pk).update(
+            confirmation_nonce=self.confirmation_nonce
+        )
+        return confirmation_code_generator.make_code(self)
 
     def check_confirm_code(self, value):
-        return value == self.confirmation_code
+        if confirmation_code_generator.check_code(self, value):
+            return True
+        # Старые коды из БД действуют, пока не выключен переходный режим.
+        return bool(
+            settings.LEGACY_CONFIRMATION_CODES
+            and timezone.now() < settings.LEGACY_CONFIRMATION_CODES_UNTIL
+            and self.confirmation_code
+            and isinstance(value, str)
+            and constant_time_compare(value, self.confirmation_code)
+        )
+
+    def use_confirm_code(self):
+        """
+        Гасит принятый код: новый last_login меняет HMAC выданных кодов,
+        код из БД стирается.
+        """
+        self.last_login = timezone.now()
+        self.confirmation_code = ''
+        type(self).all_objects.filter(pk=self.pk).update(
+            last_login=self.last_login, confirmation_code=''
+        )
 
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
         ordering = ('username',)
+        # Проверки уникальности, createsuperuser и бэкенд аутентификации
+        # должны видеть и удалённых пользователей.
+        default_manager_name = 'all_objects'
 
 
 class Category(models.Model):
@@ -187,6 +237,32 @@ class Genre(models.Model):
         ordering = ('name',)
 
 
+class TitleQuerySet(models.QuerySet):
+
+    def with_rating(self):
+        """
+        Средняя оценка видимых отзывов, живых и архивных,
+        в reviews__score__avg.
+        """
+        visible = Q(
+            reviews__is_hidden=False,
+            reviews__deleted_at__isnull=True
+        )
+        total = ExpressionWrapper(
+            Coalesce(Sum('reviews__score', filter=visible), 0)
+            + F('archived_score_sum'),
+            output_field=models.IntegerField()
+        )
+        count = ExpressionWrapper(
+            Count('reviews', filter=visible) + F('archived_review_count'),
+            output_field=models.IntegerField()
+        )
+        return self.annotate(reviews__score__avg=ExpressionWrapper(
+            Cast(total, FloatField()) / NullIf(count, 0),
+            output_field=FloatField()
+        ))
+
+
 class Title(models.Model):
     """Модель произведений."""
     name = models.CharField(
@@ -213,6 +289,24 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Категории',
     )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Число отзывов',
+        default=0,
+        editable=False,
+    )
+    # Видимые отзывы в архиве: их число входит и в review_count
+    archived_review_count = models.PositiveIntegerField(
+        verbose_name='Число архивных отзывов',
+        default=0,
+        editable=False,
+    )
+    archived_score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок архивных отзывов',
+        default=0,
+        editable=False,
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     def __str__(self) -> str:
         return self.name
@@ -223,7 +317,7 @@ class Title(models.Model):
         ordering = ('name',)
 
 
-class Review(models.Model):
+class Review(SoftDeleteModel):
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
@@ -251,19 +345,41 @@ class Review(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    comment_count = models.PositiveIntegerField(
+        'число комментариев',
+        default=0,
+        editable=False,
+    )
+    is_hidden = models.BooleanField(
+        'скрыт модератором',
+        default=False
+    )
 
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         constraints = [
+            # Удалённый отзыв не мешает написать новый.
             models.UniqueConstraint(
                 fields=('title', 'author',),
+                condition=Q(deleted_at__isnull=True),
                 name='unique_review'
             )]
+        indexes = [
+            # Отзывы произведения и отзывы автора в порядке публикации
+            models.Index(
+                fields=('title', 'pub_date'),
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='review_author_pub_date_idx'
+            ),
+        ]
         ordering = ('pub_date',)
 
 
-class Comment(models.Model):
+class Comment(SoftDeleteModel):
     review = models.ForeignKey(
         Review,
         on_delete=models.CASCADE,
@@ -285,8 +401,287 @@ class Comment(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    is_hidden = models.BooleanField(
+        'скрыт модератором',
+        default=False
+    )
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            # Комментарии к отзыву и комментарии автора в порядке публикации
+            models.Index(
+                fields=('review', 'pub_date'),
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='comment_author_pub_date_idx'
+            ),
+        ]
+        ordering = ('pub_date',)
+
+
+class ArchivedReview(models.Model):
+    """
+    Отзыв, перенесённый командой archive_content из Review вместе
+    с комментариями. id остаётся прежним; архив только читается.
+    """
+    id = models.IntegerField(
+        primary_key=True
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='archived_reviews',
+        verbose_name='произведение'
+    )
+    text = models.CharField(
+        max_length=200
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_reviews',
+        verbose_name='автор'
+    )
+    score = models.PositiveSmallIntegerField()
+    pub_date = models.DateTimeField(
+        'дата публикации'
+    )
+    comment_count = models.PositiveIntegerField(
+        'число комментариев',
+        default=0,
+        editable=False,
+    )
+    is_hidden = models.BooleanField(
+        'скрыт модератором',
+        default=False
+    )
+
+    class Meta:
+        verbose_name = 'Архивный отзыв'
+        verbose_name_plural = 'Архивные отзывы'
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date'),
+                name='archived_review_title_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='archived_review_author_idx'
+            ),
+        ]
+        ordering = ('pub_date',)
+
+
+class ArchivedComment(models.Model):
+    """Комментарий архивного отзыва; id остаётся прежним."""
+    id = models.IntegerField(
+        primary_key=True
+    )
+    review = models.ForeignKey(
+        ArchivedReview,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        verbose_name='отзыв'
+    )
+    text = models.CharField(
+        'текст комментария',
+        max_length=200
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments',
+        verbose_name='автор'
+    )
+    pub_date = models.DateTimeField(
+        'дата публикации'
+    )
+    is_hidden = models.BooleanField(
+        'скрыт модератором',
+        default=False
+    )
+
+    class Meta:
+        verbose_name = 'Архивный комментарий'
+        verbose_name_plural = 'Архивные комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date'),
+                name='archived_comment_review_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='archived_comment_author_idx'
+            ),
+        ]
         ordering = ('pub_date',)
+
+
+CREATE = 'create'
+UPDATE = 'update'
+DELETE = 'delete'
+
+ACTION_CHOICES = [
+    (CREATE, CREATE),
+    (UPDATE, UPDATE),
+    (DELETE, DELETE),
+]
+
+
+class Change(models.Model):
+    """
+    Журнал изменений каталога, отзывов и комментариев.
+
+    Записи только добавляются, в той же транзакции, что и само изменение;
+    потребители читают журнал по возрастанию id.
+    """
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(
+        'модель',
+        max_length=20
+    )
+    object_id = models.PositiveIntegerField(
+        'id объекта'
+    )
+    action = models.CharField(
+        'действие',
+        max_length=6,
+        choices=ACTION_CHOICES
+    )
+    created = models.DateTimeField(
+        'время изменения',
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Изменения'
+        ordering = ('id',)
+
+
+class WebhookSubscription(models.Model):
+    """Получатель журнала изменений и последний доставленный id."""
+    url = models.URLField(
+        'адрес',
+        unique=True
+    )
+    last_change_id = models.BigIntegerField(
+        'последнее доставленное изменение',
+        default=0
+    )
+    is_active = models.BooleanField(
+        'активна',
+        default=True
+    )
+
+    def __str__(self) -> str:
+        return self.url
+
+    class Meta:
+        verbose_name = 'Подписка на изменения'
+        verbose_name_plural = 'Подписки на изменения'
+        ordering = ('id',)
+
+
+class SimilarTitle(models.Model):
+    """
+    Похожее произведение и его близость по оценкам читателей.
+
+    Заполняется командой build_similar_titles, для каждого произведения
+    хранится не больше SIMILAR_TITLES_LIMIT записей.
+    """
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_titles',
+        verbose_name='произведение'
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='похожее произведение'
+    )
+    score = models.FloatField(
+        'близость'
+    )
+
+    class Meta:
+        verbose_name = 'Похожее произведение'
+        verbose_name_plural = 'Похожие произведения'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'similar'),
+                name='unique_similar_title'
+            )]
+        ordering = ('title', '-score')
+
+
+class UserRecommendation(models.Model):
+    """
+    Рекомендованное пользователю произведение и ожидаемая оценка.
+
+    Заполняется командой build_recommendations.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='recommendations',
+        verbose_name='пользователь'
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='произведение'
+    )
+    score = models.FloatField(
+        'ожидаемая оценка'
+    )
+
+    @staticmethod
+    def cache_key(user_id):
+        """Ключ кеша готовых рекомендаций пользователя."""
+        return f'recommendations:{user_id}'
+
+    class Meta:
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('user', 'title'),
+                name='unique_user_recommendation'
+            )]
+        ordering = ('user', '-score')
+
+
+class RecommendationState(models.Model):
+    """
+    Нужно ли пересчитать рекомендации пользователя: stale ставится
+    при изменении его отзывов, build_recommendations его сбрасывает.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='recommendation_state',
+        verbose_name='пользователь'
+    )
+    stale = models.BooleanField(
+        'требует пересчёта',
+        default=True,
+        db_index=True
+    )
+    computed_at = models.DateTimeField(
+        'время расчёта',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Состояние рекомендаций'
+        verbose_name_plural = 'Состояния рекомендаций'
@@ -0,0 +1,74 @@
+from django.db import transaction
+
+from .counters import recount_comment_counts, recount_review_counts
+from .models import (DELETE, UPDATE, Change, Comment, RecommendationState,
+                     Review, Title)
+
+HIDE = 'hide'
+RESTORE = 'restore'
+MODERATION_ACTIONS = (HIDE, RESTORE, DELETE)
+
+
+def set_hidden(querysets, hidden):
+    """
+    Меняет is_hidden одним UPDATE на модель и пишет журнал изменений
+    одним bulk_create. Возвращает число изменённых строк по моделям.
+    """
+    changed = {}
+    for name, queryset in querysets.items():
+        ids = list(queryset.exclude(is_hidden=hidden).values_list(
+            'pk', flat=True
+        ))
+        queryset.model.objects.filter(pk__in=ids).update(is_hidden=hidden)
+        Change.objects.bulk_create(
+            Change(model=queryset.model._meta.model_name, object_id=pk,
+                   action=UPDATE)
+            for pk in ids
+        )
+        changed[name] = len(ids)
+    return changed
+
+
+def delete(querysets):
+    """
+    Помечает строки удалёнными одним UPDATE на модель и пишет журнал
+    одним bulk_create; физически их удалит purge_deleted.
+    """
+    deleted = {}
+    for name, queryset in querysets.items():
+        ids = list(queryset.values_list('pk', flat=True))
+        queryset.model.objects.filter(pk__in=ids).soft_delete()
+        Change.objects.bulk_create(
+            Change(model=queryset.model._meta.model_name, object_id=pk,
+                   action=DELETE)
+            for pk in ids
+        )
+        deleted[name] = len(ids)
+    return deleted
+
+
+def moderate(action, review_ids=(), comment_ids=()):
+    """
+    Скрывает, возвращает или удаляет отзывы и комментарии в одной
+    транзакции и пересчитывает счётчики затронутых произведений
+    и отзывов. Возвращает {'reviews': n, 'comments': m}.
+    """
+    with transaction.atomic():
+        reviews = Review.objects.filter(pk__in=review_ids)
+        comments = Comment.objects.filter(pk__in=comment_ids)
+        titles = set(reviews.values_list('title_id', flat=True))
+        parents = set(comments.values_list('review_id', flat=True))
+        authors = set(reviews.values_list('author_id', flat=True))
+        querysets = {'reviews': reviews, 'comments': comments}
+        changed = {}
+        if action == DELETE:
+            changed.update(delete(querysets))
+        else:
+            changed.update(set_hidden(querysets, action == HIDE))
+        recount_review_counts(Title.objects.filter(pk__in=titles))
+        recount_comment_counts(Review.objects.filter(pk__in=parents))
+        # Скрытые отзывы не участвуют в рекомендациях своих авторов.
+        RecommendationState.objects.filter(user_id__in=authors).update(
+            stale=True
+        )
+    return changed
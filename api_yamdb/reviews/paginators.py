@@ -0,0 +1,37 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Пагинатор для больших таблиц в админке.
+
+    Для неотфильтрованного списка на PostgreSQL число строк берётся
+    из статистики планировщика (pg_class.reltuples) вместо COUNT(*).
+    Отфильтрованные списки и таблицы меньше exact_count_limit строк
+    считаются точно.
+    """
+    exact_count_limit = 100000
+
+    def estimated_count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql' or queryset.query.where:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < self.exact_count_limit:
+            return None
+        return int(row[0])
+
+    @cached_property
+    def count(self):
+        estimated = self.estimated_count()
+        if estimated is None:
+            return super().count
+        return estimated
@@ -0,0 +1,43 @@
+from django.db import transaction
+
+from .models import ArchivedComment, ArchivedReview, Comment, Review, User
+
+
+def purge_targets():
+    """
+    Что удалить физически, потомки раньше родителей: тогда каскад
+    при удалении родителя ничего не находит и пачка остаётся малой.
+    Комментарии к удалённым отзывам сами не помечены, их счётчики
+    и журнал обновляются обычными сигналами post_delete; отзывы
+    и комментарии удалённого пользователя помечает user_deleted.
+    """
+    return (
+        Comment.all_objects.filter(deleted_at__isnull=False),
+        Comment.all_objects.filter(review__deleted_at__isnull=False),
+        Comment.all_objects.filter(author__deleted_at__isnull=False),
+        Comment.all_objects.filter(review__author__deleted_at__isnull=False),
+        Review.all_objects.filter(deleted_at__isnull=False),
+        Review.all_objects.filter(author__deleted_at__isnull=False),
+        ArchivedComment.objects.filter(author__deleted_at__isnull=False),
+        ArchivedComment.objects.filter(
+            review__author__deleted_at__isnull=False
+        ),
+        ArchivedReview.objects.filter(author__deleted_at__isnull=False),
+        User.all_objects.filter(deleted_at__isnull=False),
+    )
+
+
+def purge(batch_size):
+    """
+    Удаляет не больше batch_size помеченных строк одной транзакцией.
+    Возвращает число удалённых строк; 0 — удалять больше нечего.
+    """
+    for queryset in purge_targets():
+        ids = list(queryset.order_by('pk').values_list(
+            'pk', flat=True
+        )[:batch_size])
+        if ids:
+            with transaction.atomic():
+                queryset.model._base_manager.filter(pk__in=ids).delete()
+            return len(ids)
+    return 0
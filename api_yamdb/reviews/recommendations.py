@@ -0,0 +1,200 @@
+"""
+Близость произведений по оценкам (adjusted cosine).
+
+Оценки читателя центрируются по его средней оценке, после чего
+близость двух произведений — косинус между их столбцами в разреженной
+матрице читатель × произведение. Матрица целиком не строится:
+произведения обрабатываются блоками по block_size, для блока строится
+плотная матрица только по читателям, оценившим что-то из блока,
+а отзывы этих читателей перемножаются с ней кусками по chunk_size.
+Память — O(число отзывов + читатели блока × block_size).
+"""
+import numpy as np
+
+
+def load_ratings(querysets, chunk_size):
+    """
+    Читает (author_id, title_id, score) из querysets отзывов (например,
+    живых и архивных) кусками по pk и возвращает три массива NumPy.
+    """
+    chunks = []
+    for reviews in querysets:
+        last = 0
+        while True:
+            rows = list(reviews.filter(pk__gt=last).order_by(
+                'pk'
+            ).values_list('pk', 'author_id', 'title_id', 'score')[
+                :chunk_size
+            ])
+            if not rows:
+                break
+            chunk = np.array(rows, dtype=np.int64)
+            last = int(chunk[-1, 0])
+            chunks.append(chunk[:, 1:])
+    if not chunks:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    ratings = np.concatenate(chunks)
+    return ratings[:, 0], ratings[:, 1], ratings[:, 2]
+
+
+def center(users, scores):
+    """Оценки минус средняя оценка их автора."""
+    sums = np.bincount(users, weights=scores)
+    counts = np.bincount(users)
+    return scores - (sums / counts)[users]
+
+
+def block_products(items, users, values, start, stop, size, chunk_size):
+    """
+    Скалярные произведения произведений start..stop-1 со всеми size
+    произведениями: матрица (stop - start) × size.
+    Отзывы должны быть отсортированы по items.
+    """
+    products = np.zeros((size, stop - start), dtype=np.float32)
+    low, high = np.searchsorted(items, (start, stop))
+    if low == high:
+        return products.T
+    block_users, inverse = np.unique(users[low:high], return_inverse=True)
+    dense = np.zeros((len(block_users), stop - start), dtype=np.float32)
+    dense[inverse, items[low:high] - start] = values[low:high]
+
+    # Строка dense для каждого читателя, -1 — читатель не из блока.
+    positions = np.full(users.max() + 1, -1, dtype=np.int64)
+    positions[block_users] = np.arange(len(block_users))
+    relevant = np.flatnonzero(positions[users] >= 0)
+    for offset in range(0, len(relevant), chunk_size):
+        index = relevant[offset:offset + chunk_size]
+        chunk_items = items[index]
+        starts = np.flatnonzero(np.concatenate((
+            [True], chunk_items[1:] != chunk_items[:-1]
+        )))
+        contributions = dense[positions[users[index]]] * values[index, None]
+        products[chunk_items[starts]] += np.add.reduceat(
+            contributions, starts, axis=0
+        )
+    return products.T
+
+
+def top_similar(similarity, limit):
+    """Индексы и значения limit наибольших положительных по строкам."""
+    if limit < similarity.shape[1]:
+        top = np.argpartition(-similarity, limit - 1, axis=1)[:, :limit]
+    else:
+        top = np.tile(np.arange(similarity.shape[1]), (len(similarity), 1))
+    for row, candidates in enumerate(top):
+        scores = similarity[row, candidates]
+        order = np.argsort(-scores, kind='stable')
+        candidates, scores = candidates[order], scores[order]
+        positive = scores > 0
+        yield candidates[positive], scores[positive]
+
+
+def prepare(authors, titles, scores):
+    """
+    Центрированные оценки, отсортированные по произведению:
+    (title_ids, items, users, values, norms).
+    """
+    title_ids, items = np.unique(titles, return_inverse=True)
+    _, users = np.unique(authors, return_inverse=True)
+    values = center(users, scores.astype(np.float64))
+    # Нулевые центрированные оценки ничего не добавляют в произведения.
+    nonzero = np.flatnonzero(values)
+    nonzero = nonzero[np.argsort(items[nonzero], kind='stable')]
+    items, users, values = items[nonzero], users[nonzero], values[nonzero]
+    norms = np.sqrt(np.bincount(
+        items, weights=values ** 2, minlength=len(title_ids)
+    ))
+    return title_ids, items, users, values.astype(np.float32), norms
+
+
+def similar_titles(authors, titles, scores, limit, block_size=64,
+                   chunk_size=100000):
+    """
+    Для каждого оценённого произведения — до limit похожих.
+
+    Генерирует блоки списков (title_id, [(similar_id, score), ...]),
+    чтобы вызывающий код мог сохранять результат по мере расчёта.
+    """
+    title_ids, items, users, values, norms = prepare(authors, titles, scores)
+    size = len(title_ids)
+    for start in range(0, size, block_size):
+        stop = min(start + block_size, size)
+        products = block_products(
+            items, users, values, start, stop, size, chunk_size
+        )
+        # Похожими могут быть только столбцы с положительным произведением.
+        columns = np.flatnonzero((products > 0).any(axis=0))
+        with np.errstate(invalid='ignore'):
+            # 0 / 0 у произведений блока без центрированных оценок.
+            similarity = np.nan_to_num(products[:, columns] / np.outer(
+                norms[start:stop], norms[columns]
+            ))
+        similarity[columns[None, :] == np.arange(start, stop)[:, None]] = 0
+        yield [
+            (int(title_ids[start + row]), [
+                (int(title_ids[columns[candidate]]), float(score))
+                for candidate, score in zip(candidates, found)
+            ])
+            for row, (candidates, found) in enumerate(
+                top_similar(similarity, limit)
+            )
+        ]
+
+
+def expand(starts, counts):
+    """Индексы всех диапазонов starts[i]..starts[i] + counts[i] подряд."""
+    offsets = np.cumsum(counts) - counts
+    return (
+        np.arange(counts.sum())
+        - np.repeat(offsets, counts)
+        + np.repeat(starts, counts)
+    )
+
+
+def recommend(authors, titles, scores, neighbors, limit, shrink=1.0):
+    """
+    Рекомендации по похожим произведениям (item-based).
+
+    authors, titles, scores — все отзывы пересчитываемых пользователей,
+    neighbors — массивы (title_id, similar_id, score) из SimilarTitle,
+    отсортированные по title_id. Ожидаемая оценка непрочитанного
+    произведения — средняя оценка пользователя плюс взвешенная по
+    близости центрированная оценка соседей; shrink в знаменателе
+    приглушает кандидатов, до которых дотянулся один слабый сосед.
+    Возвращает {author_id: [(title_id, score), ...]} по убыванию score.
+    """
+    result = {int(author): [] for author in np.unique(authors)}
+    neighbor_titles, neighbor_similar, similarity = neighbors
+    if not len(scores) or not len(similarity):
+        return result
+    author_ids, users = np.unique(authors, return_inverse=True)
+    scores = scores.astype(np.float64)
+    means = np.bincount(users, weights=scores) / np.bincount(users)
+    low = np.searchsorted(neighbor_titles, titles, 'left')
+    counts = np.searchsorted(neighbor_titles, titles, 'right') - low
+    reviews = np.repeat(np.arange(len(scores)), counts)
+    edges = expand(low, counts)
+
+    space = int(max(neighbor_similar.max(), titles.max())) + 1
+    keys = users[reviews] * space + neighbor_similar[edges]
+    # Прочитанные произведения не рекомендуем.
+    fresh = ~np.isin(keys, users * space + titles)
+    keys, reviews, edges = keys[fresh], reviews[fresh], edges[fresh]
+    pairs, inverse = np.unique(keys, return_inverse=True)
+    weights = similarity[edges]
+    numerator = np.bincount(
+        inverse, weights=weights * (scores - means[users])[reviews]
+    )
+    denominator = np.bincount(inverse, weights=weights)
+    pair_users = pairs // space
+    predicted = means[pair_users] + numerator / (denominator + shrink)
+
+    order = np.lexsort((-predicted, pair_users))
+    group_starts = np.searchsorted(pair_users[order], pair_users[order])
+    top = order[np.arange(len(order)) - group_starts < limit]
+    for user, title, score in zip(
+        pair_users[top], pairs[top] % space, predicted[top]
+    ):
+        result[int(author_ids[user])].append((int(title), float(score)))
+    return result
@@ -0,0 +1,179 @@
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (CREATE, DELETE, UPDATE, ArchivedComment, ArchivedReview,
+                     Category, Change, Comment, Genre, RecommendationState,
+                     Review, Title, User)
+from .moderation import moderate
+from .softdelete import soft_deleted
+
+TRACKED_MODELS = (Title, Genre, Category, Review, Comment)
+
+
+def change_counters(queryset, **deltas):
+    """
+    Атомарно сдвигает счётчики field=delta одним UPDATE; строка,
+    где какой-то из них ушёл бы ниже нуля, не меняется.
+    """
+    for field, delta in deltas.items():
+        if delta < 0:
+            queryset = queryset.filter(**{f'{field}__gte': -delta})
+    queryset.update(**{
+        field: F(field) + delta for field, delta in deltas.items()
+    })
+
+
+def change_counter(queryset, field, delta):
+    """Атомарно сдвигает счётчик на delta, не уходя ниже нуля."""
+    change_counters(queryset, **{field: delta})
+
+
+def already_deleted(instance, signal):
+    """
+    Физически удаляется строка, уже помеченная удалённой: счётчики
+    и журнал обновлены при пометке, повторять не нужно.
+    """
+    return (
+        signal is post_delete
+        and getattr(instance, 'deleted_at', None) is not None
+    )
+
+
+# Счётчики учитывают только видимые строки: скрытые модератором
+# пересчитываются массово в reviews.moderation.
+
+
+@receiver(post_save, sender=Review)
+def review_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and not instance.is_hidden:
+        change_counter(
+            Title.objects.filter(pk=instance.title_id), 'review_count', 1
+        )
+
+
+@receiver(post_delete, sender=Review)
+@receiver(soft_deleted, sender=Review)
+def review_deleted(sender, instance, signal, **kwargs):
+    if not instance.is_hidden and not already_deleted(instance, signal):
+        change_counter(
+            Title.objects.filter(pk=instance.title_id), 'review_count', -1
+        )
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and not instance.is_hidden:
+        change_counter(
+            Review.objects.filter(pk=instance.review_id), 'comment_count', 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+@receiver(soft_deleted, sender=Comment)
+def comment_deleted(sender, instance, signal, **kwargs):
+    if not instance.is_hidden and not already_deleted(instance, signal):
+        change_counter(
+            Review.objects.filter(pk=instance.review_id), 'comment_count', -1
+        )
+
+
+# Архив только читается: строки из него удаляет лишь каскад
+# (purge_deleted, удаление произведения).
+
+
+@receiver(post_delete, sender=ArchivedReview)
+def archived_review_deleted(sender, instance, **kwargs):
+    if not instance.is_hidden:
+        change_counters(
+            Title.objects.filter(pk=instance.title_id),
+            review_count=-1,
+            archived_review_count=-1,
+            archived_score_sum=-instance.score,
+        )
+    log_change(Review, instance, DELETE)
+
+
+@receiver(post_delete, sender=ArchivedComment)
+def archived_comment_deleted(sender, instance, **kwargs):
+    if not instance.is_hidden:
+        change_counter(
+            ArchivedReview.objects.filter(pk=instance.review_id),
+            'comment_count', -1
+        )
+    log_change(Comment, instance, DELETE)
+
+
+@receiver(soft_deleted, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    """
+    Отзывы и комментарии удалённого пользователя сразу пропадают
+    из выдачи и рейтинга, а не после purge_deleted: живые помечаются
+    удалёнными с пересчётом счётчиков, архивные (их не пометить)
+    удаляются, счётчики обновят сигналы post_delete.
+    """
+    moderate(
+        DELETE,
+        Review.objects.filter(author=instance).values('pk'),
+        Comment.objects.filter(author=instance).values('pk'),
+    )
+    ArchivedComment.objects.filter(author=instance).delete()
+    ArchivedReview.objects.filter(author=instance).delete()
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(soft_deleted, sender=Review)
+def recommendations_stale(sender, instance, raw=False, **kwargs):
+    """Отзывы автора изменились — его рекомендации надо пересчитать."""
+    if not raw:
+        RecommendationState.objects.filter(
+            user_id=instance.author_id, stale=False
+        ).update(stale=True)
+
+
+def log_change(sender, instance, action):
+    Change.objects.create(
+        model=sender._meta.model_name,
+        object_id=instance.pk,
+        action=action,
+    )
+
+
+def log_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        log_change(sender, instance, CREATE if created else UPDATE)
+
+
+def log_deleted(sender, instance, signal, **kwargs):
+    if not already_deleted(instance, signal):
+        log_change(sender, instance, DELETE)
+
+
+def log_genres_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # post_clear приходит без pk_set: произведения запоминаем заранее.
+        instance._cleared_title_ids = list(
+            instance.titles.values_list('pk', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        if action == 'post_clear':
+            pk_set = instance.__dict__.pop('_cleared_title_ids', ())
+        # Жанр привязали к произведениям: меняются сами произведения.
+        Change.objects.bulk_create(
+            Change(model=Title._meta.model_name, object_id=pk, action=UPDATE)
+            for pk in pk_set or ()
+        )
+    else:
+        log_change(Title, instance, UPDATE)
+
+
+for model in TRACKED_MODELS:
+    post_save.connect(log_saved, sender=model)
+    post_delete.connect(log_deleted, sender=model)
+for model in (Review, Comment):
+    soft_deleted.connect(log_deleted, sender=model)
+m2m_changed.connect(log_genres_changed, sender=Title.genre.through)
@@ -0,0 +1,51 @@
+from django.db import models
+from django.dispatch import Signal
+from django.utils import timezone
+
+# Отправляется после мягкого удаления одной строки (instance).
+soft_deleted = Signal()
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+
+    def alive(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def soft_delete(self):
+        """Помечает строки удалёнными одним UPDATE, без каскада."""
+        return self.alive().update(deleted_at=timezone.now())
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Менеджер без мягко удалённых строк."""
+
+    def get_queryset(self):
+        return super().get_queryset().alive()
+
+
+class SoftDeleteModel(models.Model):
+    """
+    Строка с отметкой об удалении. objects не видит удалённые строки,
+    all_objects видит все; физически их удаляет purge_deleted.
+    """
+    deleted_at = models.DateTimeField(
+        'время удаления',
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True
+    )
+
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def soft_delete(self):
+        """Помечает строку удалённой за один UPDATE, без каскада."""
+        self.deleted_at = timezone.now()
+        type(self).all_objects.filter(pk=self.pk).update(
+            deleted_at=self.deleted_at
+        )
+        soft_deleted.send(sender=type(self), instance=self)
@@ -0,0 +1,209 @@
+"""
+Синтетические данные для бенчмарков (команда generate_data).
+
+Всё разыгрывается массивами NumPy из одного зерна, поэтому при тех же
+параметрах получаются те же данные. Пользователи, произведения, отзывы
+и комментарии задаются индексами 0..n-1, время — микросекундами
+от эпохи; в id и строки для БД их переводит команда.
+"""
+import io
+from itertools import islice
+
+import numpy as np
+from django.db import connection
+
+GENRES_PER_TITLE = 3
+FIRST_YEAR = 1900
+LAST_YEAR = 2021
+# Средняя оценка произведения и разброс оценок вокруг неё
+QUALITY_MEAN = 6.5
+QUALITY_SCALE = 1.5
+SCORE_SCALE = 2
+# Чем меньше форма Парето, тем длиннее самые длинные ветки комментариев
+THREAD_SHAPE = 1.5
+# Средняя задержка комментария после отзыва, мкс (неделя)
+COMMENT_DELAY = 7 * 24 * 3600 * 10 ** 6
+# Сколько раз добирать пары (произведение, автор) с весами по Ципфу
+SAMPLE_ROUNDS = 5
+
+
+def zipf_weights(size, exponent):
+    """Вероятности рангов 1..size по закону Ципфа."""
+    weights = 1 / np.arange(1, size + 1) ** exponent
+    return weights / weights.sum()
+
+
+def shuffled_zipf(rng, size, exponent):
+    """Вероятности по Ципфу, ранги перемешаны между индексами."""
+    return zipf_weights(size, exponent)[rng.permutation(size)]
+
+
+def sample_sorted(rng, p, size):
+    """
+    size индексов с вероятностями p по возрастанию. То же, что
+    np.sort(rng.choice(len(p), size, p=p)), но поиск отсортированных
+    случайных чисел идёт подряд по памяти и на миллионах p в разы быстрее.
+    """
+    cdf = np.cumsum(p)
+    cdf /= cdf[-1]
+    return np.searchsorted(
+        cdf, np.sort(rng.random_sample(size)), side='right'
+    )
+
+
+def sample_genres(rng, titles, genres, exponent):
+    """
+    Пары (произведение, жанр): у каждого произведения от одного
+    до GENRES_PER_TITLE разных жанров, популярность жанров по Ципфу.
+    """
+    drawn = rng.choice(
+        genres, (titles, GENRES_PER_TITLE), p=zipf_weights(genres, exponent)
+    )
+    keys = unique((np.arange(titles)[:, None] * genres + drawn).ravel())
+    return keys // genres, keys % genres
+
+
+def unique(keys):
+    """
+    Уникальные целые по возрастанию. Быстрее np.unique на десятках
+    миллионов: почти отсортированный массив сортируется за один проход.
+    """
+    keys = np.sort(keys, kind='stable')
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+
+def sample_pairs(rng, size, title_p, user_p):
+    """
+    Уникальные пары (произведение, автор) в случайном порядке. Повторы
+    добираются заново с теми же весами SAMPLE_ROUNDS раз, остаток —
+    равномерно: при сильном перекосе иначе добор почти не движется.
+    """
+    titles, users = len(title_p), len(user_p)
+    size = min(size, titles * users)
+    keys = np.empty(0, dtype=np.int64)
+    rounds = 0
+    while len(keys) < size:
+        drawn = 2 * (size - len(keys)) + 16
+        if rounds < SAMPLE_ROUNDS:
+            new = (
+                sample_sorted(rng, title_p, drawn).astype(np.int64) * users
+                + rng.choice(users, drawn, p=user_p)
+            )
+        else:
+            new = rng.randint(titles * users, size=drawn, dtype=np.int64)
+        keys = unique(np.concatenate((keys, new)))
+        rounds += 1
+    keys = rng.permutation(keys)[:size]
+    return keys // users, keys % users
+
+
+def sample_comments(rng, size, review_times, user_p, end):
+    """
+    Комментарии по времени: (отзыв, автор, время). Веса отзывов
+    распределены по Парето, поэтому у немногих отзывов длинные ветки,
+    а у большинства комментариев нет или мало.
+    """
+    if not size or not len(review_times):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    weights = rng.pareto(THREAD_SHAPE, len(review_times))
+    # Авторы и задержки независимы от отзыва, поэтому отзывы можно
+    # разыграть по возрастанию.
+    review = sample_sorted(rng, weights / weights.sum(), size)
+    delay = rng.exponential(COMMENT_DELAY, size).astype(np.int64)
+    times = np.minimum(review_times[review] + delay, end - 1)
+    author = rng.choice(len(user_p), size, p=user_p)
+    order = np.argsort(times, kind='stable')
+    return review[order], author[order], times[order]
+
+
+def generate(seed, users, titles, reviews, comments, categories, genres,
+             exponent, start, end):
+    """
+    Разыгрывает данные и возвращает словарь массивов. Популярность
+    произведений и активность пользователей убывают по Ципфу
+    с показателем exponent; отзывы и комментарии упорядочены по времени
+    в [start, end), мкс. review_count и comment_count посчитаны
+    по разыгранным строкам.
+    """
+    rng = np.random.RandomState(seed)
+    title_p = shuffled_zipf(rng, titles, exponent)
+    user_p = shuffled_zipf(rng, users, exponent)
+    title_genre, genre = sample_genres(rng, titles, genres, exponent)
+    review_title, review_author = sample_pairs(rng, reviews, title_p, user_p)
+    review_times = np.sort(
+        rng.randint(start, end, len(review_title), dtype=np.int64)
+    )
+    quality = rng.normal(QUALITY_MEAN, QUALITY_SCALE, titles)
+    scores = np.clip(np.rint(
+        quality[review_title]
+        + rng.normal(0, SCORE_SCALE, len(review_title))
+    ), 1, 10).astype(np.int64)
+    comment_review, comment_author, comment_times = sample_comments(
+        rng, comments, review_times, user_p, end
+    )
+    return {
+        'title_category': rng.choice(
+            categories, titles, p=zipf_weights(categories, exponent)
+        ),
+        'title_year': rng.randint(FIRST_YEAR, LAST_YEAR + 1, titles),
+        'title_genre': title_genre,
+        'genre': genre,
+        'review_title': review_title,
+        'review_author': review_author,
+        'review_score': scores,
+        'review_time': review_times,
+        'comment_review': comment_review,
+        'comment_author': comment_author,
+        'comment_time': comment_times,
+        'review_count': np.bincount(review_title, minlength=titles),
+        'comment_count': np.bincount(
+            comment_review, minlength=len(review_title)
+        ),
+    }
+
+
+def format_times(times):
+    """Микросекунды от эпохи в строки UTC, которые принимает любая СУБД."""
+    return np.char.replace(np.datetime_as_string(
+        np.asarray(times).astype('datetime64[us]'), unit='us'
+    ), 'T', ' ').tolist()
+
+
+def copy_rows(cursor, table, columns, rows):
+    """Одна пачка через COPY: текстовый формат, NULL — \\N."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(
+            '\\N' if value is None else str(value) for value in row
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+    cursor.copy_expert(
+        f'COPY {table} ({", ".join(columns)}) FROM STDIN', buffer
+    )
+
+
+def insert_rows(model, columns, rows, batch_size):
+    """
+    Вставляет rows (кортежи значений columns) в таблицу model пачками
+    по batch_size: COPY в PostgreSQL, executemany в остальных СУБД.
+    Сигналы и save() не вызываются. Возвращает число строк.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = [connection.ops.quote_name(column) for column in columns]
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        table, ', '.join(columns), ', '.join(['%s'] * len(columns))
+    )
+    rows = iter(rows)
+    inserted = 0
+    with connection.cursor() as cursor:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return inserted
+            if connection.vendor == 'postgresql':
+                copy_rows(cursor, table, columns, batch)
+            else:
+                cursor.executemany(sql, batch)
+            inserted += len(batch)
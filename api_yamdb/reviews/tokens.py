@@ -0,0 +1,127 @@
+import json
+import time
+from functools import lru_cache
+from uuid import uuid4
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.http import base36_to_int, int_to_base36
+
+
+class ConfirmationCodeGenerator:
+    """
+    Коды подтверждения без хранения в БД, как PasswordResetTokenGenerator.
+
+    Код — «время выдачи в base36-HMAC». HMAC считается по SECRET_KEY,
+    id, email, паролю, last_login и confirmation_nonce пользователя,
+    поэтому код нельзя подделать. Смена email или пароля, новый код
+    (confirmation_nonce) и выдача токена (last_login) делают старые коды
+    недействительными. Код действует CONFIRMATION_CODE_TIMEOUT секунд.
+    """
+    key_salt = 'reviews.tokens.ConfirmationCodeGenerator'
+
+    def make_code(self, user):
+        return self._make_code(user, self._now())
+
+    def check_code(self, user, code):
+        if not isinstance(code, str):
+            return False
+        try:
+            timestamp = base36_to_int(code.split('-', 1)[0])
+        except ValueError:
+            return False
+        return (
+            constant_time_compare(self._make_code(user, timestamp), code)
+            and 0 <= self._now() - timestamp
+            <= settings.CONFIRMATION_CODE_TIMEOUT
+        )
+
+    def _make_code(self, user, timestamp):
+        digest = salted_hmac(
+            self.key_salt, self._hash_value(user, timestamp)
+        ).hexdigest()[::2]
+        return f'{int_to_base36(timestamp)}-{digest}'
+
+    def _hash_value(self, user, timestamp):
+        last_login = (
+            '' if user.last_login is None
+            else user.last_login.replace(tzinfo=None)
+        )
+        return (
+            f'{user.pk}{user.email}{user.password}{last_login}'
+            f'{user.confirmation_nonce}{timestamp}'
+        )
+
+    def _now(self):
+        return int(time.time())
+
+
+confirmation_code_generator = ConfirmationCodeGenerator()
+
+
+class AccessTokenIssuer:
+    """
+    Выпускает access-токены simplejwt без RefreshToken и объектов Token.
+
+    Заголовок JWT, постоянные claims и подготовленный ключ подписи
+    вычисляются один раз; на токен остаются json.dumps, base64 и подпись.
+    Токены совпадают по формату с AccessToken.for_user и проверяются
+    JWTAuthentication как обычно.
+    """
+
+    def __init__(self):
+        from jwt.algorithms import get_default_algorithms
+        from jwt.utils import base64url_encode
+        from rest_framework_simplejwt.settings import api_settings
+        from rest_framework_simplejwt.state import token_backend
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self.base64url_encode = base64url_encode
+        self.algorithm = get_default_algorithms()[token_backend.algorithm]
+        self.key = self.algorithm.prepare_key(token_backend.signing_key)
+        self.json_encoder = token_backend.json_encoder
+        self.header = base64url_encode(json.dumps(
+            {'typ': 'JWT', 'alg': token_backend.algorithm},
+            separators=(',', ':'),
+        ).encode())
+        self.token_type = (api_settings.TOKEN_TYPE_CLAIM, 'access')
+        self.lifetime = int(AccessToken.lifetime.total_seconds())
+        self.jti_claim = api_settings.JTI_CLAIM
+        self.user_id_field = api_settings.USER_ID_FIELD
+        self.user_id_claim = api_settings.USER_ID_CLAIM
+        self.extra_claims = tuple(
+            (claim, value)
+            for claim, value in (
+                ('aud', token_backend.audience),
+                ('iss', token_backend.issuer),
+            )
+            if value is not None
+        )
+
+    def for_user(self, user):
+        user_id = getattr(user, self.user_id_field)
+        if not isinstance(user_id, int):
+            user_id = str(user_id)
+        now = int(time.time())
+        payload = dict((
+            self.token_type,
+            ('exp', now + self.lifetime),
+            ('iat', now),
+            (self.jti_claim, uuid4().hex),
+            (self.user_id_claim, user_id),
+        ) + self.extra_claims)
+        signing_input = self.header + b'.' + self.base64url_encode(
+            json.dumps(
+                payload, separators=(',', ':'), cls=self.json_encoder
+            ).encode()
+        )
+        signature = self.algorithm.sign(signing_input, self.key)
+        return (
+            signing_input + b'.' + self.base64url_encode(signature)
+        ).decode()
+
+
+@lru_cache(maxsize=None)
+def access_token_issuer():
+    """AccessTokenIssuer, один на процесс."""
+    return AccessTokenIssuer()
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from rest_framework.test import APIClient
+from reviews.models import Category, Comment, Review, Title, User
+
+URL = '/api/v1/users/me/activity/'
+START = datetime(2022, 12, 2, 8, 0, tzinfo=timezone.utc)
+
+
+def published(instance, minutes):
+    """Выставляет pub_date (auto_now_add) через UPDATE."""
+    type(instance).all_objects.filter(pk=instance.pk).update(
+        pub_date=START + timedelta(minutes=minutes)
+    )
+    return instance
+
+
+@pytest.fixture
+def author():
+    return User.objects.create_user('reader', 'reader@example.com')
+
+
+@pytest.fixture
+def client(author):
+    client = APIClient()
+    client.force_authenticate(author)
+    return client
+
+
+@pytest.fixture
+def feed(author):
+    """
+    Лента автора по убыванию (pub_date, вид, id): при равном pub_date
+    отзыв идёт раньше комментариев.
+    """
+    category = Category.objects.create(name='Книги', slug='books')
+    first, second = (
+        Title.objects.create(name=name, year=year, category=category)
+        for name, year in (('Мастер и Маргарита', 1967),
+                           ('Собачье сердце', 1925))
+    )
+    old = published(Review.objects.create(
+        title=first, author=author, text='да', score=8
+    ), 0)
+    comment = published(Comment.objects.create(
+        review=old, author=author, text='ещё'
+    ), 10)
+    tied = [
+        published(Comment.objects.create(
+            review=old, author=author, text='и ещё'
+        ), 20)
+        for _ in range(2)
+    ]
+    latest = published(Review.objects.create(
+        title=second, author=author, text='нет', score=3
+    ), 20)
+    return [
+        ('review', latest.pk),
+        ('comment', tied[1].pk),
+        ('comment', tied[0].pk),
+        ('comment', comment.pk),
+        ('review', old.pk),
+    ]
+
+
+def items(response):
+    return [(row['type'], row['id']) for row in response.json()['results']]
+
+
+def walk(client, limit):
+    """Все страницы ленты по ссылкам next."""
+    pages = []
+    url = f'{URL}?limit={limit}'
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append(items(response))
+        url = response.json()['next']
+    return pages
+
+
+@pytest.mark.django_db
+class TestActivity:
+
+    def test_order(self, client, feed):
+        response = client.get(URL)
+        assert response.status_code == 200
+        assert items(response) == feed, (
+            'Проверьте, что лента упорядочена по (pub_date, вид, id) '
+            'по убыванию'
+        )
+        assert response.json()['next'] is None
+
+    @pytest.mark.parametrize('limit', [1, 2, 3])
+    def test_pages(self, client, feed, limit):
+        pages = walk(client, limit)
+        assert [item for page in pages for item in page] == feed, (
+            'Проверьте, что страницы по курсору не теряют и не повторяют '
+            'записи с одинаковым pub_date'
+        )
+        assert all(len(page) == limit for page in pages[:-1])
+
+    def test_cursor_crosses_kinds(self, client, feed):
+        # Первая страница кончается отзывом, а вторая начинается
+        # комментариями с тем же pub_date.
+        first = client.get(f'{URL}?limit=1')
+        assert items(first) == feed[:1]
+        second = client.get(first.json()['next'].replace('limit=1', 'limit=2'))
+        assert items(second) == feed[1:3], (
+            'Проверьте, что курсор на отзыве не пропускает комментарии '
+            'с тем же pub_date'
+        )
+
+    def test_hidden_and_deleted(self, client, feed):
+        (_, hidden), (_, old) = feed[1], feed[-1]
+        Comment.objects.filter(pk=hidden).update(is_hidden=True)
+        Review.objects.get(pk=old).soft_delete()
+        assert items(client.get(URL)) == feed[:1], (
+            'Проверьте, что в ленте нет скрытых записей и комментариев '
+            'к удалённым отзывам'
+        )
+
+    def test_comments_to_hidden_review(self, client, feed):
+        Review.objects.filter(pk=feed[-1][1]).update(is_hidden=True)
+        assert items(client.get(URL)) == feed[:1], (
+            'Проверьте, что в ленте нет комментариев к скрытым отзывам, '
+            'как и в CommentViewSet'
+        )
+
+    def test_invalid_cursor(self, client, feed):
+        assert client.get(f'{URL}?cursor=garbage').status_code == 404
@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+import pytest
+from api.mixins import ArchiveReadMixin
+from django.utils import timezone
+from rest_framework.test import APIClient
+from reviews.archive import archive, copy_rows
+from reviews.models import (ArchivedComment, ArchivedReview, Category, Comment,
+                            Review, Title, User)
+from reviews.recommendations import load_ratings
+
+
+def make_title():
+    category = Category.objects.create(name='Книги', slug='books')
+    return Title.objects.create(
+        name='Мастер и Маргарита', year=1967, category=category
+    )
+
+
+def archive_all():
+    """Переносит в архив всё, что опубликовано до сих пор."""
+    return archive(timezone.now() + timedelta(days=1), 100)
+
+
+class TestArchive:
+
+    def test_same_columns(self):
+        for live, archived in (
+            (Review, ArchivedReview),
+            (Comment, ArchivedComment),
+        ):
+            live_fields = {
+                field.attname for field in live._meta.concrete_fields
+            }
+            for field in archived._meta.concrete_fields:
+                assert field.attname in live_fields, (
+                    f'Проверьте, что у {live.__name__} есть поле '
+                    f'{field.attname} архивной модели'
+                )
+
+    def test_copy_rows(self):
+        review = Review(
+            pk=7, title_id=1, author_id=2, text='отзыв', score=9,
+            pub_date=timezone.now(), comment_count=3, is_hidden=True,
+        )
+        archived, = copy_rows(ArchivedReview, [review])
+        assert isinstance(archived, ArchivedReview)
+        for name in ('pk', 'title_id', 'author_id', 'text', 'score',
+                     'pub_date', 'comment_count', 'is_hidden'):
+            assert getattr(archived, name) == getattr(review, name), (
+                f'Проверьте, что в архив переносится {name} отзыва'
+            )
+
+    @pytest.mark.django_db
+    def test_no_second_review_after_archive(self):
+        title = make_title()
+        author = User.objects.create_user('reader', 'reader@example.com')
+        Review.objects.create(title=title, author=author, text='да', score=8)
+        assert archive_all() == 1
+        client = APIClient()
+        client.force_authenticate(author)
+        response = client.post(
+            f'/api/v1/titles/{title.pk}/reviews/', {'text': 'ещё', 'score': 1}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что автор архивного отзыва не может написать '
+            'второй отзыв на то же произведение'
+        )
+        title.refresh_from_db()
+        assert title.review_count == 1
+
+    @pytest.mark.django_db
+    def test_archived_activity(self):
+        title = make_title()
+        author = User.objects.create_user('reader', 'reader@example.com')
+        review = Review.objects.create(
+            title=title, author=author, text='да', score=8
+        )
+        comment = Comment.objects.create(
+            review=review, author=author, text='и ещё'
+        )
+        assert archive_all() == 1
+        client = APIClient()
+        client.force_authenticate(author)
+        response = client.get('/api/v1/users/me/activity/')
+        assert response.status_code == 200
+        assert [
+            (row['type'], row['id']) for row in response.data['results']
+        ] == [('comment', comment.pk), ('review', review.pk)], (
+            'Проверьте, что в ленте активности есть архивные '
+            'отзывы и комментарии'
+        )
+
+    @pytest.mark.django_db
+    def test_archived_ratings(self):
+        title = make_title()
+        first = User.objects.create_user('first', 'first@example.com')
+        second = User.objects.create_user('second', 'second@example.com')
+        Review.objects.create(title=title, author=first, text='да', score=8)
+        assert archive_all() == 1
+        Review.objects.create(title=title, author=second, text='нет', score=3)
+        authors, titles, scores = load_ratings((
+            Review.objects.all(), ArchivedReview.objects.all()
+        ), chunk_size=1)
+        assert sorted(zip(authors, titles, scores)) == [
+            (first.pk, title.pk, 8), (second.pk, title.pk, 3),
+        ], 'Проверьте, что похожие произведения учитывают архивные оценки'
+
+    @pytest.mark.django_db
+    def test_no_write_after_archive(self, monkeypatch):
+        title = make_title()
+        author = User.objects.create_user('reader', 'reader@example.com')
+        review = Review.objects.create(
+            title=title, author=author, text='да', score=8
+        )
+        get_object = ArchiveReadMixin.get_object
+
+        def archived_after_read(view):
+            # Отзыв уже прочитан, но ещё не сохранён.
+            obj = get_object(view)
+            archive_all()
+            return obj
+
+        monkeypatch.setattr(ArchiveReadMixin, 'get_object',
+                            archived_after_read)
+        client = APIClient()
+        client.force_authenticate(author)
+        response = client.patch(
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/',
+            {'text': 'нет'}
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что изменение перенесённого в архив отзыва '
+            'возвращает 404'
+        )
+        # Здесь перенос идёт в транзакции запроса и откатывается вместе
+        # с ней; главное — строка не оказалась в обеих таблицах.
+        live = Review.all_objects.filter(pk=review.pk)
+        archived = ArchivedReview.objects.filter(pk=review.pk)
+        assert live.exists() != archived.exists(), (
+            'Проверьте, что save() не вставляет архивный отзыв заново'
+        )
+        assert (live.first() or archived.first()).text == 'да'
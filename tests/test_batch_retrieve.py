@@ -0,0 +1,52 @@
+import pytest
+from django.conf import settings
+from rest_framework.test import APIClient
+from reviews.models import Category, Genre, Title
+
+URL = '/api/v1/titles/'
+
+
+@pytest.fixture
+def titles():
+    category = Category.objects.create(name='Книги', slug='books')
+    genre = Genre.objects.create(name='Роман', slug='novel')
+    created = [
+        Title.objects.create(name=name, year=year, category=category)
+        for name, year in (('Мастер и Маргарита', 1967),
+                           ('Собачье сердце', 1925))
+    ]
+    for title in created:
+        title.genre.add(genre)
+    return created
+
+
+@pytest.mark.django_db
+class TestBatchRetrieve:
+
+    def test_ids_in_request_order(self, titles):
+        first, second = titles
+        response = APIClient().get(f'{URL}?ids={second.pk},0,{first.pk}')
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert [row['id'] for row in results] == [second.pk, 0, first.pk], (
+            'Проверьте, что ?ids= отдаёт объекты в порядке запроса'
+        )
+        assert results[1] == {'id': 0, 'detail': 'Не найдено.'}, (
+            'Проверьте, что вместо ненайденного id отдаётся detail'
+        )
+        assert results[0]['name'] == second.name
+        assert results[0]['category'] == {'name': 'Книги', 'slug': 'books'}
+
+    @pytest.mark.parametrize('ids', ['', ',', 'a,1'])
+    def test_invalid_ids(self, ids):
+        response = APIClient().get(f'{URL}?ids={ids}')
+        assert response.status_code == 400, (
+            'Проверьте, что пустой или нечисловой ?ids= отклоняется'
+        )
+
+    def test_ids_limit(self):
+        ids = ','.join(map(str, range(1, settings.BATCH_RETRIEVE_LIMIT + 2)))
+        assert APIClient().get(f'{URL}?ids={ids}').status_code == 400, (
+            'Проверьте, что за раз можно запросить не больше '
+            'BATCH_RETRIEVE_LIMIT id'
+        )
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+import pytest
+from api.webhooks import pending_changes
+from django.utils import timezone
+from rest_framework.test import APIClient
+from reviews.models import (ADMIN, UPDATE, Category, Change, Genre, Title,
+                            User, WebhookSubscription)
+
+LAG = 5
+
+
+def make_changes(*ages):
+    """Записи журнала по возрастанию id; ages — возраст в секундах."""
+    now = timezone.now()
+    changes = []
+    for age in ages:
+        change = Change.objects.create(model='title', object_id=1,
+                                       action=UPDATE)
+        Change.objects.filter(pk=change.pk).update(
+            created=now - timedelta(seconds=age)
+        )
+        changes.append(change.pk)
+    return changes
+
+
+@pytest.fixture
+def admin_client(settings):
+    settings.CHANGES_SAFETY_LAG = LAG
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(
+        'admin', 'admin@example.com', role=ADMIN
+    ))
+    return client
+
+
+@pytest.mark.django_db
+class TestChanges:
+
+    def test_fresh_changes_held_back(self, admin_client):
+        make_changes(0, 0)
+        response = admin_client.get('/api/v1/changes/')
+        assert response.status_code == 200
+        assert response.data['results'] == [], (
+            'Проверьте, что записи моложе CHANGES_SAFETY_LAG не отдаются'
+        )
+        assert response.data['since'] == 0
+        assert response.data['next'] is None
+
+    def test_cursor_stops_at_fresh_change(self, admin_client):
+        first, fresh, last = make_changes(LAG * 2, 0, LAG * 2)
+        response = admin_client.get('/api/v1/changes/')
+        assert [row['id'] for row in response.data['results']] == [first], (
+            'Проверьте, что курсор не перескакивает через свежую запись: '
+            'транзакция с меньшим id ещё могла не закоммититься'
+        )
+        assert response.data['since'] == first
+        assert response.data['next'] is None
+        Change.objects.filter(pk=fresh).update(
+            created=timezone.now() - timedelta(seconds=LAG * 2)
+        )
+        response = admin_client.get(f'/api/v1/changes/?since={first}')
+        assert [row['id'] for row in response.data['results']] == [
+            fresh, last
+        ]
+        assert response.data['since'] == last
+
+    def test_pages(self, admin_client):
+        first, second, third = make_changes(LAG * 2, LAG * 2, LAG * 2)
+        response = admin_client.get('/api/v1/changes/?limit=2')
+        assert [row['id'] for row in response.data['results']] == [
+            first, second
+        ]
+        assert f'since={second}' in response.data['next']
+        response = admin_client.get(response.data['next'])
+        assert [row['id'] for row in response.data['results']] == [third]
+        assert response.data['next'] is None
+
+    def test_webhook_changes_held_back(self, settings):
+        settings.CHANGES_SAFETY_LAG = LAG
+        first, _, _ = make_changes(LAG * 2, 0, LAG * 2)
+        subscription = WebhookSubscription.objects.create(
+            url='http://example.com/hook'
+        )
+        assert [
+            change['id'] for change in pending_changes(subscription, 10)
+        ] == [first], (
+            'Проверьте, что вебхук не сдвигает курсор дальше свежей записи'
+        )
+
+    def test_genre_clear_logs_titles(self):
+        category = Category.objects.create(name='Книги', slug='books')
+        genre = Genre.objects.create(name='Роман', slug='novel')
+        titles = [
+            Title.objects.create(name=name, year=1967, category=category)
+            for name in ('Мастер и Маргарита', 'Сто лет одиночества')
+        ]
+        genre.titles.add(*titles)
+        Change.objects.all().delete()
+        genre.titles.clear()
+        assert sorted(Change.objects.values_list(
+            'model', 'object_id', 'action'
+        )) == [
+            (Title._meta.model_name, title.pk, UPDATE) for title in titles
+        ], (
+            'Проверьте, что genre.titles.clear() записывает изменение '
+            'каждого произведения'
+        )
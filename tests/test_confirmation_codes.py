@@ -0,0 +1,125 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from reviews.models import User
+from reviews.tokens import ConfirmationCodeGenerator
+
+
+def make_user(**kwargs):
+    fields = {'pk': 1, 'username': 'reader', 'email': 'reader@yamdb.fake',
+              'password': ''}
+    fields.update(kwargs)
+    return User(**fields)
+
+
+def get_token(code):
+    return APIClient().post('/api/v1/auth/token/', {
+        'username': 'reader', 'confirmation_code': code,
+    })
+
+
+@pytest.mark.django_db
+class TestConfirmationCodes:
+
+    def test_code_checks(self):
+        user = make_user()
+        code = user.generate_confirm_code()
+        assert user.check_confirm_code(code), (
+            'Проверьте, что выданный код подтверждения принимается'
+        )
+        assert user.confirmation_code == '', (
+            'Проверьте, что код подтверждения не сохраняется в пользователе'
+        )
+
+    def test_code_bound_to_user(self):
+        user = make_user()
+        code = user.generate_confirm_code()
+        nonce = user.confirmation_nonce
+        assert not make_user(
+            pk=2, confirmation_nonce=nonce
+        ).check_confirm_code(code), (
+            'Проверьте, что код другого пользователя не принимается'
+        )
+        assert not make_user(
+            email='new@yamdb.fake', confirmation_nonce=nonce
+        ).check_confirm_code(code), (
+            'Проверьте, что после смены email старый код не действует'
+        )
+
+    def test_code_expires(self):
+        generator = ConfirmationCodeGenerator()
+        user = make_user()
+        code = generator.make_code(user)
+        now = generator._now()
+        with mock.patch.object(
+            ConfirmationCodeGenerator, '_now',
+            return_value=now + settings.CONFIRMATION_CODE_TIMEOUT + 1,
+        ):
+            assert not generator.check_code(user, code), (
+                'Проверьте, что просроченный код не принимается'
+            )
+
+    def test_bad_codes(self):
+        user = make_user()
+        for code in (None, '', 'abc', '-', 'zz-00', 123):
+            assert not user.check_confirm_code(code), (
+                'Проверьте, что некорректный код не принимается'
+            )
+
+    def test_new_code_revokes_old(self):
+        user = User.objects.create_user('reader', 'reader@yamdb.fake')
+        old = user.generate_confirm_code()
+        new = user.generate_confirm_code()
+        user = User.objects.get(pk=user.pk)
+        assert not user.check_confirm_code(old), (
+            'Проверьте, что повторная регистрация отменяет выданный код'
+        )
+        assert user.check_confirm_code(new)
+
+    def test_code_single_use(self):
+        user = User.objects.create_user('reader', 'reader@yamdb.fake')
+        code = user.generate_confirm_code()
+        assert get_token(code).status_code == 200
+        assert get_token(code).status_code == 400, (
+            'Проверьте, что код подтверждения действует один раз'
+        )
+
+    def test_legacy_code(self, settings):
+        settings.LEGACY_CONFIRMATION_CODES = True
+        settings.LEGACY_CONFIRMATION_CODES_UNTIL = (
+            timezone.now() + timedelta(days=1)
+        )
+        user = make_user(confirmation_code='old-code')
+        assert user.check_confirm_code('old-code'), (
+            'Проверьте, что код, сохранённый до перехода, принимается'
+        )
+        settings.LEGACY_CONFIRMATION_CODES_UNTIL = (
+            timezone.now() - timedelta(days=1)
+        )
+        assert not user.check_confirm_code('old-code'), (
+            'Проверьте, что после LEGACY_CONFIRMATION_CODES_UNTIL старые '
+            'коды не принимаются'
+        )
+
+    def test_legacy_code_off_by_default(self):
+        assert not settings.LEGACY_CONFIRMATION_CODES
+        assert not make_user(confirmation_code='old-code').check_confirm_code(
+            'old-code'
+        ), 'Проверьте, что старые коды по умолчанию не принимаются'
+
+    def test_legacy_code_single_use(self, settings):
+        settings.LEGACY_CONFIRMATION_CODES = True
+        settings.LEGACY_CONFIRMATION_CODES_UNTIL = (
+            timezone.now() + timedelta(days=1)
+        )
+        User.objects.create_user(
+            'reader', 'reader@yamdb.fake', confirmation_code='old-code'
+        )
+        assert get_token('old-code').status_code == 200
+        assert get_token('old-code').status_code == 400, (
+            'Проверьте, что старый код стирается после выдачи токена'
+        )
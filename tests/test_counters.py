@@ -0,0 +1,154 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from reviews.archive import archive
+from reviews.models import (ArchivedReview, Category, Comment, Review, Title,
+                            User)
+from reviews.signals import change_counter, change_counters
+
+
+def counters():
+    return (
+        list(Title.objects.order_by('pk').values_list(
+            'pk', 'review_count', 'archived_review_count',
+            'archived_score_sum',
+        )),
+        list(Review.objects.order_by('pk').values_list(
+            'pk', 'comment_count'
+        )),
+        list(ArchivedReview.objects.order_by('pk').values_list(
+            'pk', 'comment_count'
+        )),
+    )
+
+
+def assert_recounted():
+    """Счётчики, которые ведут сигналы, совпадают с recount_counters."""
+    kept = counters()
+    call_command('recount_counters', batch_size=2, stdout=StringIO())
+    assert counters() == kept, (
+        'Проверьте, что сигналы ведут счётчики так же, как их считает '
+        'recount_counters'
+    )
+
+
+@pytest.fixture
+def title():
+    category = Category.objects.create(name='Книги', slug='books')
+    return Title.objects.create(
+        name='Мастер и Маргарита', year=1967, category=category
+    )
+
+
+@pytest.fixture
+def users():
+    return [
+        User.objects.create_user(name, f'{name}@example.com')
+        for name in ('first', 'second', 'third')
+    ]
+
+
+def review_count(title):
+    title.refresh_from_db()
+    return title.review_count
+
+
+def comment_count(review):
+    review.refresh_from_db()
+    return review.comment_count
+
+
+@pytest.mark.django_db
+class TestCounters:
+
+    def test_change_counter_not_below_zero(self, title):
+        titles = Title.objects.filter(pk=title.pk)
+        change_counter(titles, 'review_count', 2)
+        change_counter(titles, 'review_count', -3)
+        assert review_count(title) == 2, (
+            'Проверьте, что счётчик не уходит ниже нуля'
+        )
+        change_counters(titles, review_count=-1, archived_review_count=-1)
+        title.refresh_from_db()
+        assert (title.review_count, title.archived_review_count) == (2, 0), (
+            'Проверьте, что change_counters не меняет строку, где один '
+            'из счётчиков ушёл бы ниже нуля'
+        )
+
+    def test_reviews(self, title, users):
+        first, second, third = users
+        visible = Review.objects.create(
+            title=title, author=first, text='да', score=8
+        )
+        deleted = Review.objects.create(
+            title=title, author=second, text='нет', score=3
+        )
+        hidden = Review.objects.create(
+            title=title, author=third, text='скрыт', score=1, is_hidden=True
+        )
+        assert review_count(title) == 2, (
+            'Проверьте, что скрытый отзыв не учитывается в review_count'
+        )
+        assert_recounted()
+        deleted.soft_delete()
+        assert review_count(title) == 1
+        assert_recounted()
+        # Физическое удаление помеченного отзыва счётчик не трогает.
+        Review.all_objects.filter(pk=deleted.pk).delete()
+        hidden.delete()
+        assert review_count(title) == 1
+        assert_recounted()
+        visible.delete()
+        assert review_count(title) == 0
+        assert_recounted()
+
+    def test_comments(self, title, users):
+        first, second, third = users
+        review = Review.objects.create(
+            title=title, author=first, text='да', score=8
+        )
+        deleted, removed = (
+            Comment.objects.create(review=review, author=author, text='да')
+            for author in (first, second)
+        )
+        hidden = Comment.objects.create(
+            review=review, author=third, text='скрыт', is_hidden=True
+        )
+        assert comment_count(review) == 2, (
+            'Проверьте, что скрытый комментарий не учитывается'
+        )
+        assert_recounted()
+        deleted.soft_delete()
+        assert comment_count(review) == 1
+        Comment.all_objects.filter(pk=deleted.pk).delete()
+        hidden.delete()
+        assert comment_count(review) == 1
+        assert_recounted()
+        removed.delete()
+        assert comment_count(review) == 0
+        assert_recounted()
+
+    def test_archive(self, title, users):
+        first, second, _ = users
+        review = Review.objects.create(
+            title=title, author=first, text='да', score=8
+        )
+        Comment.objects.create(review=review, author=second, text='да')
+        Review.objects.create(
+            title=title, author=second, text='скрыт', score=1, is_hidden=True
+        )
+        assert archive(timezone.now() + timedelta(days=1), 100) == 2
+        title.refresh_from_db()
+        assert (
+            title.review_count, title.archived_review_count,
+            title.archived_score_sum,
+        ) == (1, 1, 8), (
+            'Проверьте, что в итоги архива попадают только видимые отзывы'
+        )
+        assert_recounted()
+        ArchivedReview.objects.filter(pk=review.pk).delete()
+        assert review_count(title) == 0
+        assert_recounted()
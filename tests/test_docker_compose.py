@@ -27,3 +27,23 @@ class TestDockerfileCompose:
         assert re.search(r'image:\s+([a-zA-Z0-9]+)\/([a-zA-Z0-9_\.])+(\:[a-zA-Z0-9_-]+)?', docker_compose), (
             'Проверьте, что добавили сборку контейнера из образа на вашем DockerHub в файл docker-compose.yaml'
         )
+
+
+class TestNginx:
+
+    def test_upstream_keepalive_shorter_than_gunicorn(self):
+        with open(os.path.join(infra_dir_path, 'nginx', 'default.conf')) as f:
+            nginx = f.read()
+        with open(os.path.join(root_dir, 'api_yamdb', 'gunicorn.conf.py')) as f:
+            gunicorn = f.read()
+        upstream = re.search(r'upstream api_backend \{(.*?)\n\}', nginx, re.S)
+        timeout = re.search(r'keepalive_timeout (\d+)s;', upstream.group(1))
+        assert timeout, (
+            'Проверьте, что в upstream задан keepalive_timeout: по умолчанию '
+            'nginx держит соединение 60 с, дольше gunicorn'
+        )
+        keepalive = re.search(r"'GUNICORN_KEEPALIVE', (\d+)", gunicorn)
+        assert int(timeout.group(1)) < int(keepalive.group(1)), (
+            'Проверьте, что nginx закрывает простаивающее соединение '
+            'раньше gunicorn'
+        )
@@ -0,0 +1,182 @@
+import asyncio
+import socket
+import threading
+from importlib.util import module_from_spec, spec_from_file_location
+from os.path import join
+from types import SimpleNamespace
+
+import psycopg2
+import pytest
+from api import events
+from api.events import LocalBroker, PostgresBroker, format_event
+
+from .conftest import root_dir
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestLocalBroker:
+
+    def test_publish_from_other_thread(self):
+        broker = LocalBroker(queue_size=10)
+
+        async def listen():
+            subscription = broker.subscribe('title:1')
+            thread = threading.Thread(
+                target=broker.publish, args=('title:1', b'event')
+            )
+            thread.start()
+            try:
+                return await asyncio.wait_for(subscription.get(), 1)
+            finally:
+                thread.join()
+                subscription.close()
+
+        assert run(listen()) == b'event', (
+            'Проверьте, что подписчик получает событие, опубликованное '
+            'из другого потока'
+        )
+        assert not broker.subscriptions, (
+            'Проверьте, что close() удаляет подписку из брокера'
+        )
+
+    def test_other_channel_not_delivered(self):
+        broker = LocalBroker(queue_size=10)
+
+        async def listen():
+            subscription = broker.subscribe('title:1')
+            broker.publish('title:2', b'event')
+            await asyncio.sleep(0)
+            subscription.close()
+            return subscription.queue.empty()
+
+        assert run(listen()), (
+            'Проверьте, что события другого произведения не доставляются'
+        )
+
+    def test_overflow_closes_stream(self):
+        broker = LocalBroker(queue_size=2)
+
+        async def listen():
+            subscription = broker.subscribe('title:1')
+            for _ in range(3):
+                broker.publish('title:1', b'event')
+            await asyncio.sleep(0)
+            subscription.close()
+            return await subscription.get()
+
+        assert run(listen()) is None, (
+            'Проверьте, что отставший клиент получает сигнал закрыть поток'
+        )
+
+
+class FakeCursor:
+
+    def __init__(self, executed):
+        self.executed = executed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql, params):
+        self.executed.append((sql, params))
+
+
+class FakeListener:
+    """Соединение с LISTEN: отдаёт notifies один раз, потом обрывается."""
+
+    def __init__(self, payloads):
+        self.reader, self.writer = socket.socketpair()
+        self.writer.send(b'!')
+        self.payloads = payloads
+        self.notifies = []
+
+    def fileno(self):
+        return self.reader.fileno()
+
+    def poll(self):
+        if self.payloads is None:
+            raise psycopg2.OperationalError('соединение закрыто')
+        self.notifies.extend(
+            SimpleNamespace(payload=payload) for payload in self.payloads
+        )
+        self.payloads = None
+
+
+class TestPostgresBroker:
+
+    def test_notify_round_trip(self, monkeypatch):
+        executed = []
+        monkeypatch.setattr(events, 'connection', SimpleNamespace(
+            cursor=lambda: FakeCursor(executed)
+        ))
+        broker = PostgresBroker(queue_size=10)
+        message = format_event('review', {'id': 1, 'text': 'да да'})
+        broker.publish('title:1', message)
+        (sql, (channel, payload)), = executed
+        assert 'pg_notify' in sql and channel == broker.pg_channel, (
+            'Проверьте, что publish отправляет NOTIFY'
+        )
+
+        async def listen():
+            # Подписка без фонового слушателя: его роль играет receive.
+            subscription = LocalBroker.subscribe(broker, 'title:1')
+            listener = FakeListener([payload, 'title:2 чужое'])
+            with pytest.raises(psycopg2.OperationalError):
+                broker.receive(listener)
+            await asyncio.sleep(0)
+            subscription.close()
+            return [subscription.queue.get_nowait()
+                    for _ in range(subscription.queue.qsize())]
+
+        assert run(listen()) == [message], (
+            'Проверьте, что слушатель раздаёт подписчикам канала '
+            'сообщение из NOTIFY без изменений'
+        )
+
+
+def load_gunicorn_conf():
+    spec = spec_from_file_location(
+        'gunicorn_conf', join(root_dir, 'api_yamdb', 'gunicorn.conf.py')
+    )
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestGunicornBrokerCheck:
+
+    @pytest.mark.parametrize('broker, workers, fails', [
+        ('api.events.LocalBroker', 3, True),
+        ('api.events.LocalBroker', 1, False),
+        ('api.events.PostgresBroker', 3, False),
+    ])
+    def test_local_broker_single_worker(self, settings, broker, workers,
+                                        fails):
+        settings.EVENTS_BROKER = broker
+        conf = load_gunicorn_conf()
+        server = SimpleNamespace(cfg=SimpleNamespace(
+            worker_class_str=conf.ASGI_WORKERS[0], workers=workers
+        ))
+        if fails:
+            with pytest.raises(RuntimeError):
+                conf.on_starting(server)
+        else:
+            conf.on_starting(server)
+
+
+class TestFormatEvent:
+
+    def test_format(self):
+        assert format_event('review', {'id': 1}) == (
+            b'event: review\ndata: {"id":1}\n\n'
+        ), 'Проверьте формат text/event-stream'
@@ -0,0 +1,109 @@
+from collections import Counter
+
+import pytest
+from api.facets import facets_version
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from reviews.models import Category, Genre, Title
+
+URL = '/api/v1/titles/facets/'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def catalog():
+    books = Category.objects.create(name='Книги', slug='books')
+    films = Category.objects.create(name='Фильмы', slug='films')
+    novel = Genre.objects.create(name='Роман', slug='novel')
+    satire = Genre.objects.create(name='Сатира', slug='satire')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    for name, year, category, genres in (
+        ('Мастер и Маргарита', 1967, books, (novel, satire)),
+        ('Собачье сердце', 1925, books, (satire,)),
+        ('Собачье сердце', 1988, films, (satire, drama)),
+        ('Идиот', 1869, books, (novel, drama)),
+        ('Сталкер', 1979, films, ()),
+    ):
+        Title.objects.create(
+            name=name, year=year, category=category
+        ).genre.set(genres)
+
+
+def expected_facets(titles):
+    """Фасеты, посчитанные по объектам в Python."""
+    categories = Counter((t.category.name, t.category.slug) for t in titles)
+    genres = Counter(
+        (genre.name, genre.slug) for t in titles for genre in t.genre.all()
+    )
+    years = Counter(t.year for t in titles)
+    return {
+        'count': len(titles),
+        'category': [
+            {'name': name, 'slug': slug, 'count': count}
+            for (name, slug), count in sorted(categories.items())
+        ],
+        'genre': [
+            {'name': name, 'slug': slug, 'count': count}
+            for (name, slug), count in sorted(genres.items())
+        ],
+        'year': [
+            {'year': year, 'count': count}
+            for year, count in sorted(years.items())
+        ],
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFacets:
+
+    @pytest.mark.parametrize('query, titles', [
+        ('', Title.objects.all()),
+        ('genre=satire', Title.objects.filter(genre__slug='satire')),
+        ('category=films', Title.objects.filter(category__slug='films')),
+        ('year=1925', Title.objects.filter(year=1925)),
+        ('name=Собачье&genre=drama',
+         Title.objects.filter(name__contains='Собачье', genre__slug='drama')),
+    ])
+    def test_counts_match_queryset(self, catalog, query, titles):
+        response = APIClient().get(f'{URL}?{query}')
+        assert response.status_code == 200
+        assert response.json() == expected_facets(list(titles.distinct())), (
+            'Проверьте, что фасеты совпадают с отфильтрованными '
+            'произведениями'
+        )
+
+    @pytest.mark.parametrize('change', [
+        lambda: Title.objects.create(
+            name='Бег', year=1970, category=Category.objects.first()
+        ),
+        lambda: Title.objects.filter(year=1925).get().save(),
+        lambda: Title.objects.filter(year=1979).get().delete(),
+        lambda: Genre.objects.create(name='Фантастика', slug='sf'),
+        lambda: Genre.objects.get(slug='drama').delete(),
+        lambda: Category.objects.get(slug='books').save(),
+        lambda: Category.objects.create(name='Музыка', slug='music'),
+        lambda: Genre.objects.get(slug='novel').titles.clear(),
+        lambda: Title.objects.filter(year=1979).get().genre.add(
+            Genre.objects.get(slug='novel')
+        ),
+    ])
+    def test_write_bumps_version(self, catalog, change):
+        version = facets_version()
+        change()
+        assert facets_version() != version, (
+            'Проверьте, что изменение каталога сбрасывает кеш фасетов'
+        )
+
+    def test_cached_facets_invalidated(self, catalog):
+        client = APIClient()
+        assert client.get(URL).json()['count'] == 5
+        Title.objects.create(
+            name='Бег', year=1970, category=Category.objects.first()
+        )
+        assert client.get(URL).json()['count'] == 6, (
+            'Проверьте, что после изменения каталога фасеты пересчитываются'
+        )
@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+
+import pytest
+from api.fast_serializers import get_fast_serializer
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleListSerializer)
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+
+def _row(instance, columns):
+    row = {}
+    for column in columns:
+        value = instance
+        for attr in column.split('__'):
+            value = getattr(value, attr)
+        row[column] = value
+    return row
+
+
+class TestFastListSerializer:
+
+    def _assert_same_json(self, serializer_class, instance):
+        fast = get_fast_serializer(serializer_class)
+        renderer = JSONRenderer()
+        expected = renderer.render(serializer_class([instance], many=True).data)
+        actual = renderer.render(
+            fast.to_representation([_row(instance, fast.columns)])
+        )
+        assert actual == expected, (
+            f'Проверьте, что быстрый {serializer_class.__name__} '
+            'отдаёт тот же JSON, что и обычный'
+        )
+
+    def test_review(self):
+        review = Review(
+            id=3,
+            title=Title(id=1, name='Мастер и Маргарита'),
+            author=User(id=2, username='reader'),
+            text='Рукописи не горят',
+            score=10,
+            pub_date=datetime(2022, 12, 2, 8, 12, 1, 123456, timezone.utc),
+        )
+        self._assert_same_json(ReviewSerializer, review)
+
+    def test_comment(self):
+        comment = Comment(
+            id=5,
+            review=Review(id=3, text='Рукописи не горят'),
+            author=User(id=2, username='reader'),
+            text='Согласен',
+            pub_date=datetime(2022, 12, 2, 21, 0, tzinfo=timezone.utc),
+        )
+        self._assert_same_json(CommentSerializer, comment)
+
+    @pytest.mark.django_db
+    def test_title_list(self):
+        category = Category.objects.create(name='Книги', slug='books')
+        novel = Genre.objects.create(name='Роман', slug='novel')
+        satire = Genre.objects.create(name='Сатира', slug='satire')
+        master = Title.objects.create(
+            name='Мастер и Маргарита', year=1967, category=category,
+            description='Рукописи не горят',
+        )
+        master.genre.set([novel, satire])
+        # Без жанров и отзывов: пустой список и рейтинг null.
+        Title.objects.create(
+            name='Собачье сердце', year=1925, category=category
+        )
+        for username, score in (('first', 10), ('second', 7)):
+            Review.objects.create(
+                title=master, text='отзыв', score=score,
+                author=User.objects.create_user(
+                    username, f'{username}@example.com'
+                ),
+            )
+        queryset = Title.objects.with_rating().order_by('name')
+        fast = get_fast_serializer(TitleListSerializer)
+        renderer = JSONRenderer()
+        expected = renderer.render(
+            TitleListSerializer(queryset, many=True).data
+        )
+        actual = renderer.render(
+            fast.to_representation(fast.values(queryset))
+        )
+        assert actual == expected, (
+            'Проверьте, что быстрый TitleListSerializer отдаёт тот же JSON '
+            '(категория, жанры, рейтинг), что и обычный'
+        )
@@ -0,0 +1,116 @@
+import gzip
+import json
+
+import pytest
+from api.middleware import accepted_encodings, brotli
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from reviews.models import Category, Title, User
+
+URL = '/api/v1/titles/'
+
+
+def vary(response):
+    return {
+        header.strip().lower()
+        for header in response.get('Vary', '').split(',') if header.strip()
+    }
+
+
+def cache_control(response):
+    return {
+        directive.strip()
+        for directive in response.get('Cache-Control', '').split(',')
+    }
+
+
+@pytest.fixture
+def titles():
+    category = Category.objects.create(name='Книги', slug='books')
+    for year in range(1900, 1920):
+        Title.objects.create(
+            name=f'Произведение {year}', year=year, category=category
+        )
+
+
+class TestAcceptedEncodings:
+
+    def test_accepted_encodings(self):
+        assert accepted_encodings('gzip, deflate, br;q=0.5') == {
+            'gzip', 'deflate', 'br'
+        }
+        assert accepted_encodings('GZip;q=0, br') == {'br'}, (
+            'Проверьте, что кодировки с q=0 не считаются принятыми'
+        )
+        assert accepted_encodings('') == set()
+
+
+@pytest.mark.django_db
+class TestCompression:
+
+    def test_gzip(self, titles):
+        response = APIClient().get(URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что большой ответ сжимается gzip'
+        )
+        assert 'accept-encoding' in vary(response)
+        assert int(response['Content-Length']) == len(response.content)
+        body = json.loads(gzip.decompress(response.content))
+        assert body['count'] == 20
+
+    def test_preferred_encoding(self, titles):
+        response = APIClient().get(URL, HTTP_ACCEPT_ENCODING='gzip, br')
+        assert response['Content-Encoding'] == (
+            'br' if brotli is not None else 'gzip'
+        ), 'Проверьте, что brotli выбирается, когда он установлен'
+
+    @pytest.mark.parametrize('accept', ['', 'identity', 'gzip;q=0'])
+    def test_not_accepted(self, titles, accept):
+        response = APIClient().get(URL, HTTP_ACCEPT_ENCODING=accept)
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что ответ не сжимается без согласия клиента'
+        )
+        assert 'accept-encoding' in vary(response), (
+            'Проверьте, что Vary: Accept-Encoding ставится и на несжатый '
+            'ответ, иначе кеш отдаст его клиенту с gzip'
+        )
+
+    def test_small_response(self):
+        response = APIClient().get(URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что ответы меньше COMPRESSION_MIN_SIZE не сжимаются'
+        )
+
+
+@pytest.mark.django_db
+class TestCacheControl:
+
+    def test_anonymous_public(self, titles):
+        response = APIClient().get(URL)
+        assert {'public', 'max-age=60'} <= cache_control(response), (
+            'Проверьте, что анонимный список произведений кешируется '
+            'публично'
+        )
+        assert 'authorization' in vary(response)
+
+    def test_authorization_private(self, titles):
+        client = APIClient()
+        user = User.objects.create_user('reader', 'reader@example.com')
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+        )
+        response = client.get(URL)
+        assert response.status_code == 200
+        assert {'private', 'no-cache'} <= cache_control(response), (
+            'Проверьте, что ответ на запрос с Authorization не попадает '
+            'в общий кеш'
+        )
+        assert 'public' not in cache_control(response)
+        assert 'authorization' in vary(response)
+
+    def test_errors_not_cached(self):
+        response = APIClient().get(f'{URL}1/')
+        assert response.status_code == 404
+        assert not response.has_header('Cache-Control'), (
+            'Проверьте, что Cache-Control ставится только ответам 200'
+        )
@@ -0,0 +1,23 @@
+from api.loadtest import frontier, percentile
+
+
+class TestLoadtest:
+
+    def test_percentile(self):
+        values = [i / 100 for i in range(100, 0, -1)]
+        assert percentile(values, 0.5) == 0.51
+        assert percentile(values, 0.99) == 1.0, (
+            'Проверьте, что перцентиль считается по отсортированным значениям'
+        )
+        assert percentile([], 0.9) == 0.0
+
+    def test_frontier(self):
+        results = [
+            {'name': 'fast', 'rps': 500, 'p99': 0.05},
+            {'name': 'steady', 'rps': 300, 'p99': 0.01},
+            {'name': 'worse', 'rps': 300, 'p99': 0.06},
+        ]
+        assert [r['name'] for r in frontier(results)] == ['fast', 'steady'], (
+            'Проверьте, что в границу Парето не попадают варианты, '
+            'которые хуже другого и по rps, и по p99'
+        )
@@ -0,0 +1,160 @@
+import pytest
+from django.conf import settings
+from rest_framework.test import APIClient
+from reviews.models import (ADMIN, DELETE, MODERATOR, UPDATE, USER, Category,
+                            Change, Comment, Review, Title, User)
+from reviews.moderation import HIDE, RESTORE, set_hidden
+
+ACTIONS = '/api/v1/moderation/actions/'
+QUEUE = '/api/v1/moderation/queue/'
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def content():
+    """Произведение, два отзыва и два комментария к первому."""
+    category = Category.objects.create(name='Книги', slug='books')
+    title = Title.objects.create(
+        name='Мастер и Маргарита', year=1967, category=category
+    )
+    first, second = (
+        User.objects.create_user(name, f'{name}@example.com')
+        for name in ('first', 'second')
+    )
+    reviews = [
+        Review.objects.create(title=title, author=author, text='да', score=8)
+        for author in (first, second)
+    ]
+    comments = [
+        Comment.objects.create(review=reviews[0], author=author, text='да')
+        for author in (first, second)
+    ]
+    return title, reviews, comments
+
+
+@pytest.fixture
+def moderator():
+    return client_for(User.objects.create_user(
+        'moderator', 'moderator@example.com', role=MODERATOR
+    ))
+
+
+def counts(title, review):
+    title.refresh_from_db()
+    review.refresh_from_db()
+    return title.review_count, review.comment_count
+
+
+@pytest.mark.django_db
+class TestModeration:
+
+    @pytest.mark.parametrize('role, is_superuser, status', [
+        (USER, False, 403),
+        (MODERATOR, False, 200),
+        (ADMIN, False, 200),
+        (USER, True, 200),
+    ])
+    def test_is_moderator(self, role, is_superuser, status):
+        user = User.objects.create_user(
+            'reader', 'reader@example.com', role=role,
+            is_superuser=is_superuser,
+        )
+        assert client_for(user).get(QUEUE).status_code == status, (
+            'Проверьте, что очередь модерации доступна модераторам, '
+            'администраторам и суперпользователям'
+        )
+
+    def test_anonymous(self):
+        assert APIClient().get(QUEUE).status_code == 401
+        assert APIClient().post(
+            ACTIONS, {'action': HIDE}, format='json'
+        ).status_code == 401
+
+    def test_set_hidden(self, content):
+        _, reviews, comments = content
+        querysets = {
+            'reviews': Review.objects.filter(pk=reviews[0].pk),
+            'comments': Comment.objects.filter(pk=comments[0].pk),
+        }
+        assert set_hidden(querysets, True) == {'reviews': 1, 'comments': 1}
+        assert set_hidden(querysets, True) == {'reviews': 0, 'comments': 0}, (
+            'Проверьте, что уже скрытые строки не изменяются повторно'
+        )
+        assert sorted(Change.objects.filter(action=UPDATE).values_list(
+            'model', 'object_id'
+        )) == [('comment', comments[0].pk), ('review', reviews[0].pk)], (
+            'Проверьте, что set_hidden пишет журнал изменений'
+        )
+
+    def test_hide_and_restore(self, content, moderator):
+        title, reviews, comments = content
+        parent, review = reviews
+        response = moderator.post(ACTIONS, {
+            'action': HIDE,
+            'reviews': [review.pk],
+            'comments': [comments[0].pk],
+        }, format='json')
+        assert response.status_code == 200
+        assert response.json() == {'reviews': 1, 'comments': 1}
+        assert counts(title, parent) == (1, 1), (
+            'Проверьте, что скрытие пересчитывает review_count '
+            'и comment_count'
+        )
+        reviews_url = f'/api/v1/titles/{title.pk}/reviews/'
+        assert moderator.get(
+            f'{reviews_url}{review.pk}/'
+        ).status_code == 404, 'Проверьте, что скрытый отзыв не виден'
+        assert [row['id'] for row in moderator.get(
+            f'{reviews_url}{parent.pk}/comments/'
+        ).json()['results']] == [comments[1].pk]
+        assert {
+            (row['type'], row['id'])
+            for row in moderator.get(f'{QUEUE}?hidden=true').json()['results']
+        } == {('review', review.pk), ('comment', comments[0].pk)}, (
+            'Проверьте, что ?hidden=true показывает только скрытое'
+        )
+
+        moderator.post(ACTIONS, {
+            'action': RESTORE,
+            'reviews': [review.pk],
+            'comments': [comments[0].pk],
+        }, format='json')
+        assert counts(title, parent) == (2, 2)
+        assert moderator.get(f'{reviews_url}{review.pk}/').status_code == 200
+        assert moderator.get(f'{QUEUE}?hidden=true').json()['results'] == []
+
+    def test_delete(self, content, moderator):
+        title, reviews, comments = content
+        response = moderator.post(ACTIONS, {
+            'action': DELETE,
+            'reviews': [reviews[1].pk],
+            'comments': [comments[1].pk],
+        }, format='json')
+        assert response.json() == {'reviews': 1, 'comments': 1}
+        assert counts(title, reviews[0]) == (1, 1)
+        assert not Review.objects.filter(pk=reviews[1].pk).exists()
+        assert Review.all_objects.filter(pk=reviews[1].pk).exists(), (
+            'Проверьте, что удаление модератором только помечает строки'
+        )
+        assert {
+            (row['type'], row['id'])
+            for row in moderator.get(QUEUE).json()['results']
+        } == {('review', reviews[0].pk), ('comment', comments[0].pk)}
+
+    def test_invalid_action(self, content, moderator):
+        _, reviews, _ = content
+        assert moderator.post(ACTIONS, {
+            'action': 'publish', 'reviews': [reviews[0].pk],
+        }, format='json').status_code == 400
+        assert moderator.post(ACTIONS, {
+            'action': HIDE,
+            'reviews': list(range(settings.MODERATION_BATCH_LIMIT + 1)),
+        }, format='json').status_code == 400, (
+            'Проверьте, что за раз можно модерировать не больше '
+            'MODERATION_BATCH_LIMIT строк'
+        )
@@ -0,0 +1,84 @@
+import numpy as np
+from api.management.commands.bench_similarity import (naive_similar_titles,
+                                                      synthetic_ratings)
+from reviews.recommendations import center, recommend, similar_titles
+
+
+def build(authors, titles, scores, limit, block_size, chunk_size=100000):
+    return {
+        title: similar
+        for block in similar_titles(
+            authors, titles, scores, limit, block_size, chunk_size
+        )
+        for title, similar in block
+    }
+
+
+class TestSimilarTitles:
+
+    def test_center(self):
+        users = np.array([0, 0, 1])
+        assert list(center(users, np.array([4.0, 8.0, 5.0]))) == [-2, 2, 0], (
+            'Проверьте, что оценки центрируются по средней оценке читателя'
+        )
+
+    def test_same_as_naive(self):
+        authors, titles, scores = synthetic_ratings(600, 50, 30)
+        expected = naive_similar_titles(authors, titles, scores, 5)
+        for block_size, chunk_size in ((64, 100000), (7, 50)):
+            got = build(authors, titles, scores, 5, block_size, chunk_size)
+            assert got.keys() == expected.keys(), (
+                'Проверьте, что похожие считаются для всех произведений'
+            )
+            for title, similar in expected.items():
+                assert np.allclose(
+                    [score for _, score in got[title]],
+                    [score for _, score in similar],
+                    atol=1e-4,
+                ), (
+                    'Проверьте, что блочный расчёт совпадает с расчётом '
+                    'на словарях при любых размерах блоков'
+                )
+
+    def test_opposite_tastes_not_similar(self):
+        authors = np.array([1, 1, 2, 2])
+        titles = np.array([10, 20, 10, 20])
+        scores = np.array([10, 1, 10, 1])
+        assert build(authors, titles, scores, 5, 64) == {10: [], 20: []}, (
+            'Проверьте, что в похожие не попадают произведения '
+            'с противоположными оценками'
+        )
+
+    def test_empty(self):
+        empty = np.zeros(0, dtype=np.int64)
+        assert build(empty, empty, empty, 5, 64) == {}, (
+            'Проверьте, что без отзывов расчёт ничего не возвращает'
+        )
+
+
+class TestRecommend:
+    neighbors = (
+        np.array([1, 1, 2, 2]),
+        np.array([2, 3, 3, 4]),
+        np.array([0.9, 0.5, 0.5, 1.0]),
+    )
+
+    def test_recommend(self):
+        authors = np.array([100, 100, 200])
+        titles = np.array([1, 2, 3])
+        scores = np.array([10, 4, 6])
+        assert recommend(authors, titles, scores, self.neighbors, 5) == {
+            100: [(3, 7.0), (4, 5.5)],
+            200: [],
+        }, (
+            'Проверьте, что рекомендуются только непрочитанные соседи '
+            'прочитанных произведений по убыванию ожидаемой оценки'
+        )
+
+    def test_limit(self):
+        authors = np.array([100, 100])
+        titles = np.array([1, 2])
+        scores = np.array([10, 4])
+        assert recommend(authors, titles, scores, self.neighbors, 1) == {
+            100: [(3, 7.0)],
+        }, 'Проверьте, что рекомендаций не больше limit'
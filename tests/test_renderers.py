@@ -0,0 +1,80 @@
+import io
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+PAYLOAD = {
+    'count': 1,
+    'results': [{
+        'id': 1,
+        'name': 'Мастер и Маргарита',
+        'text': 'строка с \u2028 и \u2029',
+        'score': Decimal('7.50'),
+        'rating': None,
+        'pub_date': datetime(2022, 12, 2, 8, 12, 1, 123456, timezone.utc),
+        'moscow': datetime(
+            2022, 12, 2, 11, 12, tzinfo=timezone(timedelta(hours=3))
+        ),
+        'naive': datetime(2022, 12, 2, 8, 12),
+        'year': date(1967, 1, 1),
+        'lifetime': timedelta(days=1),
+        'uuid': uuid.UUID(int=1),
+        'genres': ('роман', 'мистика'),
+    }],
+}
+
+
+class TestFastJSON:
+
+    def test_render_same_as_stdlib(self):
+        assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD), (
+            'Проверьте, что FastJSONRenderer отдаёт тот же JSON, что и JSONRenderer'
+        )
+
+    def test_render_indent(self):
+        media_type = 'application/json; indent=4'
+        assert (
+            FastJSONRenderer().render(PAYLOAD, media_type)
+            == JSONRenderer().render(PAYLOAD, media_type)
+        ), 'Проверьте, что FastJSONRenderer поддерживает indent'
+
+    def test_render_big_int(self):
+        data = {'id': 2 ** 70}
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data), (
+            'Проверьте, что FastJSONRenderer рендерит большие числа'
+        )
+
+    def test_render_floats(self):
+        data = {'scores': [0.5, 1e16, 0.000053, -2.5e-300]}
+        assert json.loads(FastJSONRenderer().render(data)) == json.loads(
+            JSONRenderer().render(data)
+        ), 'Проверьте, что FastJSONRenderer сохраняет значения float'
+
+    @pytest.mark.parametrize('value', [
+        float('nan'), float('inf'), float('-inf')
+    ])
+    def test_render_non_finite(self, value):
+        data = {'results': [{'score': value, 'rating': None}]}
+        with pytest.raises(ValueError):
+            JSONRenderer().render(data)
+        with pytest.raises(ValueError):
+            FastJSONRenderer().render(data)
+
+    def test_parse(self):
+        body = JSONRenderer().render({'username': 'читатель', 'score': 10})
+        assert (
+            FastJSONParser().parse(io.BytesIO(body))
+            == JSONParser().parse(io.BytesIO(body))
+        ), 'Проверьте, что FastJSONParser разбирает JSON как JSONParser'
+
+    def test_parse_error(self):
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"score": NaN}'))
@@ -9,3 +9,17 @@ class TestSettings:
         assert settings.DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql', (
             'Проверьте, что используете базу данных postgresql'
         )
+
+    def test_prod_profile(self):
+        from api_yamdb.settings import prod
+
+        assert not any(
+            'Session' in middleware or 'Csrf' in middleware
+            for middleware in prod.MIDDLEWARE
+        ), 'Проверьте, что в профиле prod нет сессий и CSRF'
+        assert 'django.contrib.admin' not in prod.INSTALLED_APPS, (
+            'Проверьте, что в профиле prod нет админки'
+        )
+        assert prod.DATABASES['default']['CONN_MAX_AGE'] > 0, (
+            'Проверьте, что в профиле prod соединения с БД переиспользуются'
+        )
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.admin.sites import site
+from django.db.models.signals import post_delete
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.test import APIClient
+from reviews.archive import archive
+from reviews.models import (ADMIN, ArchivedReview, Category, Comment, Review,
+                            Title, User)
+from reviews.signals import already_deleted
+from reviews.softdelete import soft_deleted
+
+
+class TestSoftDelete:
+
+    def test_default_managers(self):
+        for model in (Review, Comment):
+            assert model._default_manager.name == 'objects', (
+                f'Проверьте, что {model.__name__} по умолчанию не видит '
+                'удалённые строки'
+            )
+        assert User._default_manager.name == 'all_objects', (
+            'Проверьте, что проверки уникальности видят удалённых '
+            'пользователей'
+        )
+
+    def test_deleted_user_inactive(self):
+        assert User(username='reader').is_active
+        user = User(username='reader', deleted_at=timezone.now())
+        assert not user.is_active, (
+            'Проверьте, что удалённый пользователь не проходит аутентификацию'
+        )
+
+    def test_purge_not_counted_twice(self):
+        review = Review(pk=1, deleted_at=timezone.now())
+        assert not already_deleted(review, soft_deleted), (
+            'Проверьте, что пометка об удалении обновляет счётчики'
+        )
+        assert already_deleted(review, post_delete), (
+            'Проверьте, что физическое удаление помеченной строки '
+            'не обновляет счётчики повторно'
+        )
+        assert not already_deleted(Review(pk=2), post_delete)
+
+    def test_admin_counts_tombstones(self):
+        request = RequestFactory().get('/admin/')
+        for model in (Review, Comment, User):
+            queryset = site._registry[model].get_queryset(request)
+            assert not queryset.query.where, (
+                f'Проверьте, что админка {model.__name__} не фильтрует '
+                'удалённые строки: иначе приблизительный счётчик '
+                'не применяется'
+            )
+
+    @pytest.mark.django_db
+    def test_deleted_user_gets_no_token(self):
+        user = User.objects.create_user('reader', 'reader@example.com')
+        code = user.generate_confirm_code()
+        user.soft_delete()
+        response = APIClient().post('/api/v1/auth/token/', {
+            'username': 'reader', 'confirmation_code': code,
+        })
+        assert response.status_code == 404, (
+            'Проверьте, что удалённый пользователь не получает токен'
+        )
+
+    @pytest.mark.django_db
+    def test_deleted_user_content_hidden(self):
+        category = Category.objects.create(name='Книги', slug='books')
+        title, other = (
+            Title.objects.create(name=name, year=1967, category=category)
+            for name in ('Мастер и Маргарита', 'Собачье сердце')
+        )
+        kept, deleted = (
+            User.objects.create_user(name, f'{name}@example.com')
+            for name in ('kept', 'deleted')
+        )
+        admin = User.objects.create_user(
+            'admin', 'admin@example.com', role=ADMIN
+        )
+        Review.objects.create(title=other, author=deleted, text='да', score=2)
+        archive(timezone.now() + timedelta(days=1), 100)
+        review = Review.objects.create(
+            title=title, author=kept, text='да', score=8
+        )
+        Review.objects.create(title=title, author=deleted, text='нет', score=4)
+        Comment.objects.create(review=review, author=deleted, text='нет')
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.delete(f'/api/v1/users/{deleted.username}/')
+        assert response.status_code == 204
+
+        for item, count in ((title, 1), (other, 0)):
+            item.refresh_from_db()
+            assert item.review_count == count, (
+                'Проверьте, что отзывы удалённого пользователя сразу '
+                'перестают учитываться в review_count'
+            )
+        assert Title.objects.with_rating().get(
+            pk=title.pk
+        ).reviews__score__avg == 8, 'Проверьте рейтинг без удалённого отзыва'
+        review.refresh_from_db()
+        assert review.comment_count == 0
+        response = client.get(f'/api/v1/titles/{title.pk}/reviews/')
+        assert [row['id'] for row in response.json()['results']] == [
+            review.pk
+        ], 'Проверьте, что отзывы удалённого пользователя не видны'
+        response = client.get(
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+        )
+        assert response.json()['results'] == []
+        assert not ArchivedReview.objects.filter(author=deleted).exists()
@@ -0,0 +1,57 @@
+import pytest
+from rest_framework.test import APIClient
+from reviews.models import Category, Genre, Title
+
+URL = '/api/v1/titles/'
+
+
+@pytest.fixture
+def titles():
+    category = Category.objects.create(name='Книги', slug='books')
+    genre = Genre.objects.create(name='Роман', slug='novel')
+    created = [
+        Title.objects.create(name=name, year=year, category=category)
+        for name, year in (('Мастер и Маргарита', 1967),
+                           ('Собачье сердце', 1925))
+    ]
+    for title in created:
+        title.genre.add(genre)
+    return created
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+
+    def test_fields(self, titles):
+        response = APIClient().get(f'{URL}?fields=id,name')
+        assert response.status_code == 200
+        assert [
+            set(row) for row in response.json()['results']
+        ] == [{'id', 'name'}] * 2, (
+            'Проверьте, что ?fields= оставляет только запрошенные поля'
+        )
+
+    def test_expand(self, titles):
+        first, _ = titles
+        response = APIClient().get(
+            f'{URL}{first.pk}/?fields=id&expand=genre,category'
+        )
+        assert response.json() == {
+            'id': first.pk,
+            'genre': [{'name': 'Роман', 'slug': 'novel'}],
+            'category': {'name': 'Книги', 'slug': 'books'},
+        }, 'Проверьте, что ?expand= добавляет связанные объекты'
+
+    @pytest.mark.parametrize('query', [
+        'fields=', 'fields=,', 'fields=&expand=genre', 'fields=id,unknown',
+    ])
+    def test_invalid_fields(self, query):
+        response = APIClient().get(f'{URL}?{query}')
+        assert response.status_code == 400, (
+            'Проверьте, что пустой ?fields= и неизвестные поля отклоняются'
+        )
+
+    def test_fields_on_retrieve(self, titles):
+        first, _ = titles
+        response = APIClient().get(f'{URL}{first.pk}/?fields=name')
+        assert response.json() == {'name': first.name}
@@ -0,0 +1,29 @@
+from api.startup import by_package, parse_importtime
+
+IMPORTTIME = '''import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     django.utils.version
+import time:       300 |        420 |   django.utils
+import time:        80 |        500 | django
+import time:      1000 |       1000 | numpy
+'''
+
+
+class TestStartup:
+
+    def test_parse_importtime(self):
+        modules = parse_importtime(IMPORTTIME + 'Traceback: прочий вывод\n')
+        assert modules[0] == ('django.utils.version', 0.00012, 0.00012), (
+            'Проверьте разбор строки -X importtime'
+        )
+        assert len(modules) == 4, (
+            'Проверьте, что заголовок и посторонние строки пропускаются'
+        )
+
+    def test_by_package(self):
+        packages = by_package(parse_importtime(IMPORTTIME))
+        assert [name for name, _ in packages] == ['numpy', 'django'], (
+            'Проверьте сортировку пакетов по времени импорта'
+        )
+        assert abs(packages[1][1] - 0.0005) < 1e-9, (
+            'Проверьте, что время подмодулей суммируется в пакет'
+        )
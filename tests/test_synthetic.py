@@ -0,0 +1,55 @@
+import numpy as np
+from reviews.synthetic import format_times, generate
+
+PARAMS = dict(
+    users=300, titles=50, reviews=2000, comments=5000, categories=4,
+    genres=6, exponent=1.1, start=0, end=10 ** 12,
+)
+
+
+class TestSynthetic:
+
+    def test_deterministic(self):
+        first, second = generate(1, **PARAMS), generate(1, **PARAMS)
+        for name, values in first.items():
+            assert np.array_equal(values, second[name]), (
+                f'Проверьте, что {name} зависит только от зерна'
+            )
+        assert not np.array_equal(
+            generate(2, **PARAMS)['review_title'], first['review_title']
+        )
+
+    def test_reviews(self):
+        data = generate(0, **PARAMS)
+        pairs = data['review_title'] * PARAMS['users'] + data['review_author']
+        assert len(np.unique(pairs)) == PARAMS['reviews'], (
+            'Проверьте, что у автора не больше одного отзыва на произведение'
+        )
+        assert np.all(np.diff(data['review_time']) >= 0)
+        assert np.array_equal(
+            data['review_count'],
+            np.bincount(data['review_title'], minlength=PARAMS['titles'])
+        ), 'Проверьте, что review_count совпадает с числом отзывов'
+        assert data['review_score'].min() >= 1
+        assert data['review_score'].max() <= 10
+
+    def test_comments(self):
+        data = generate(0, **PARAMS)
+        assert len(data['comment_review']) == PARAMS['comments']
+        assert np.all(
+            data['comment_time']
+            >= data['review_time'][data['comment_review']]
+        ), 'Проверьте, что комментарий не раньше отзыва'
+        assert np.all(data['comment_time'] < PARAMS['end'])
+        assert data['comment_count'].sum() == PARAMS['comments']
+
+    def test_genres(self):
+        data = generate(0, **PARAMS)
+        assert np.array_equal(
+            np.unique(data['title_genre']), np.arange(PARAMS['titles'])
+        ), 'Проверьте, что у каждого произведения есть жанр'
+        pairs = data['title_genre'] * PARAMS['genres'] + data['genre']
+        assert len(np.unique(pairs)) == len(pairs)
+
+    def test_format_times(self):
+        assert format_times([1500000]) == ['1970-01-01 00:00:01.500000']
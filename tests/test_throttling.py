@@ -0,0 +1,105 @@
+import pytest
+from api.throttling import IPThrottle
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+# Начало интервала: окно 60 секунд с номером 10
+START = 600
+
+
+class MinuteThrottle(IPThrottle):
+    scope = 'test'
+    rate = '4/min'
+    cache = LocMemCache('test-throttling', {})
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    MinuteThrottle.cache.clear()
+
+
+def attempt(now):
+    """Запрос в момент now; возвращает (разрешён ли, throttle)."""
+    throttle = MinuteThrottle()
+    throttle.timer = lambda: now
+    request = Request(RequestFactory().post('/', REMOTE_ADDR='10.0.0.1'))
+    return throttle.allow_request(request, None), throttle
+
+
+def cache_key(forwarded_for):
+    """Ключ throttle для запроса через nginx с X-Forwarded-For."""
+    request = Request(RequestFactory().post(
+        '/', REMOTE_ADDR='172.18.0.2', HTTP_X_FORWARDED_FOR=forwarded_for
+    ))
+    return MinuteThrottle().get_cache_key(request, None)
+
+
+def attempts(now, count):
+    return [attempt(now)[0] for _ in range(count)]
+
+
+class TestSlidingWindowThrottle:
+
+    def test_allows_up_to_limit(self):
+        assert attempts(START, 5) == [True] * 4 + [False], (
+            'Проверьте, что после num_requests запросов за интервал '
+            'следующий отклоняется'
+        )
+        assert attempts(START + 59, 1) == [False]
+
+    def test_other_client_not_limited(self):
+        attempts(START, 4)
+        throttle = MinuteThrottle()
+        throttle.timer = lambda: START
+        request = Request(RequestFactory().post('/', REMOTE_ADDR='10.0.0.2'))
+        assert throttle.allow_request(request, None), (
+            'Проверьте, что счётчики разных клиентов не пересекаются'
+        )
+
+    def test_previous_window_weighted(self):
+        attempts(START, 4)
+        # Половина предыдущего интервала в окне: 4 * 0.5 = 2 запроса.
+        assert attempts(START + 90, 3) == [True, True, False], (
+            'Проверьте, что запросы предыдущего интервала учитываются '
+            'с весом его доли в окне'
+        )
+        # Предыдущий интервал целиком вышел из окна.
+        assert attempts(START + 180, 5) == [True] * 4 + [False]
+
+    def test_wait_for_next_window(self):
+        attempts(START, 4)
+        allowed, throttle = attempt(START)
+        assert not allowed
+        # Текущий счётчик исчерпан: ждём следующего интервала.
+        assert throttle.wait() == pytest.approx(72)
+        assert attempt(START + throttle.wait())[0], (
+            'Проверьте, что после wait() секунд запрос разрешается'
+        )
+
+    def test_wait_for_previous_window(self):
+        attempts(START, 4)
+        now = START + 66
+        assert attempts(now, 2) == [True, False]
+        allowed, throttle = attempt(now)
+        assert not allowed
+        # 4 * (1 - 0.1) + 1 >= 4; ниже лимита оценка станет при доле 0.25.
+        assert throttle.wait() == pytest.approx(9)
+        assert not attempt(now + throttle.wait() - 1)[0]
+        assert attempt(now + throttle.wait() + 1)[0], (
+            'Проверьте, что wait() — время, когда доля предыдущего '
+            'интервала опустит оценку ниже лимита'
+        )
+
+    def test_spoofed_forwarded_for(self):
+        # nginx дописывает адрес клиента в конец X-Forwarded-For.
+        assert cache_key('1.2.3.4, 10.0.0.1') == cache_key(
+            '5.6.7.8, 10.0.0.1'
+        ) == cache_key('10.0.0.1'), (
+            'Проверьте, что подставленное клиентом начало X-Forwarded-For '
+            'не меняет ключ ограничения (NUM_PROXIES = 1)'
+        )
+        assert cache_key('10.0.0.1') != cache_key('10.0.0.2'), (
+            'Проверьте, что клиенты за одним nginx ограничиваются по '
+            'отдельности'
+        )
@@ -0,0 +1,35 @@
+from reviews.models import User
+from reviews.tokens import access_token_issuer
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+
+class TestAccessTokenIssuer:
+
+    def test_same_claims_as_simplejwt(self):
+        user = User(pk=7, username='reader')
+        token = AccessToken(access_token_issuer().for_user(user))
+        reference = AccessToken.for_user(user)
+        assert token.payload.keys() == reference.payload.keys(), (
+            'Проверьте, что токен содержит те же claims, что и AccessToken'
+        )
+        assert token['user_id'] == 7 and token['token_type'] == 'access', (
+            'Проверьте user_id и token_type в выпущенном токене'
+        )
+        assert token['exp'] - token['iat'] == int(
+            reference.lifetime.total_seconds()
+        ), 'Проверьте срок жизни выпущенного токена'
+
+    def test_same_header_as_simplejwt(self):
+        user = User(pk=7, username='reader')
+        header = access_token_issuer().for_user(user).split('.')[0]
+        reference = str(RefreshToken.for_user(user).access_token)
+        assert header == reference.split('.')[0], (
+            'Проверьте, что заголовок JWT совпадает с simplejwt'
+        )
+
+    def test_unique_jti(self):
+        user = User(pk=7, username='reader')
+        assert len({
+            AccessToken(access_token_issuer().for_user(user))['jti']
+            for _ in range(10)
+        }) == 10, 'Проверьте, что у каждого токена свой jti'